@@ -9,10 +9,12 @@ import redis
 from rq import Queue
 import os
 from app.security import security_headers
+from app.services.db_engine import engine_options, patch_for_gevent
+from app.services.read_replica import RoutingSession, init_replica
 from flask_wtf.csrf import generate_csrf
 from datetime import datetime, timezone, timedelta
 
-db = SQLAlchemy(session_options={"expire_on_commit": False})
+db = SQLAlchemy(session_options={"expire_on_commit": False, "class_": RoutingSession})
 migrate = Migrate()
 login_manager = LoginManager()
 csrf = CSRFProtect()
@@ -25,6 +27,8 @@ limiter = Limiter(
 def create_app(config_name=None):
     """Crea y configura la app Flask, inicializa extensiones y registra blueprints."""
     app = Flask(__name__)
+    # Bajo workers gevent psycopg2 debe ceder el control mientras espera a libpq
+    patch_for_gevent(app.logger)
 
     # Configuration
     if config_name:
@@ -53,8 +57,31 @@ def create_app(config_name=None):
     # Hold configuration
     app.config['HOLD_MINUTES'] = int(os.environ.get('HOLD_MINUTES', '15'))
 
+    # Search result cache (seconds; 0 disables)
+    app.config.setdefault('SEARCH_CACHE_TTL', int(os.environ.get('SEARCH_CACHE_TTL', '300')))
+    # Public availability cache (seconds; 0 disables)
+    app.config.setdefault('AVAILABILITY_CACHE_TTL', int(os.environ.get('AVAILABILITY_CACHE_TTL', '120')))
+    # Per-user admin permission sets (seconds; 0 disables)
+    app.config.setdefault('PERMISSION_CACHE_TTL', int(os.environ.get('PERMISSION_CACHE_TTL', '300')))
+    # Session user principal reuse window (seconds; 0 loads the user row every request)
+    app.config.setdefault('PRINCIPAL_MAX_AGE', int(os.environ.get('PRINCIPAL_MAX_AGE', '300')))
+    # Days ahead that recurring schedules are materialized into timeslots
+    app.config.setdefault('SCHEDULE_HORIZON_DAYS', int(os.environ.get('SCHEDULE_HORIZON_DAYS', '60')))
+    # Timeslots that started more than this many days ago are moved to timeslots_archive
+    app.config.setdefault('TIMESLOT_ARCHIVE_DAYS', int(os.environ.get('TIMESLOT_ARCHIVE_DAYS', '90')))
+    # Days counted in the landing page free-slot counters (landing_stats)
+    app.config.setdefault('LANDING_STATS_DAYS', int(os.environ.get('LANDING_STATS_DAYS', '7')))
+    # Optional read replica for @read_only views/services (empty disables)
+    app.config.setdefault('SQLALCHEMY_REPLICA_URI', os.environ.get('DATABASE_REPLICA_URL', ''))
+    # Seconds after a visitor's write during which their reads stay on the primary
+    app.config.setdefault('REPLICA_LAG_SECONDS', float(os.environ.get('REPLICA_LAG_SECONDS', '5')))
+
+    # Pool de conexiones (DB_POOL_*, DB_PGBOUNCER); sin efecto fuera de PostgreSQL
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config.get('SQLALCHEMY_DATABASE_URI', '')))
+
     # Initialize extensions
     db.init_app(app)
+    init_replica(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
     csrf.init_app(app)
@@ -104,6 +131,17 @@ def create_app(config_name=None):
             return jsonify({'error': 'Forbidden'}), 403
         return render_template('errors/403.html'), 403
 
+    # Alcance de administración memorizado en g: se descarta al iniciar cada request
+    from app.services.access_scope import reset_scope
+    app.before_request(reset_scope)
+
+    # Ruteo a réplica: cada request empieza sin escrituras propias
+    from app.services.read_replica import reset_request_state
+    app.before_request(reset_request_state)
+
+    # Mantenimiento del resumen diario de disponibilidad (listeners de sesión)
+    from app.services import availability_daily  # noqa: F401
+
     # Register blueprints
     from app.main import bp as main_bp
     app.register_blueprint(main_bp)
@@ -129,6 +167,6 @@ def create_app(config_name=None):
 
 @login_manager.user_loader
 def load_user(user_id):
-    """Carga un usuario por ID para sesiones de Flask-Login."""
-    from app.models import AppUser
-    return AppUser.query.get(int(user_id))
+    """Carga el usuario de la sesión de Flask-Login (principal liviano, ver session_user)."""
+    from app.services.session_user import load_principal
+    return load_principal(int(user_id))
@@ -2,13 +2,25 @@ from flask import render_template, redirect, url_for, flash, request, current_ap
 from flask_login import login_user, logout_user, login_required, current_user
 from app.admin import bp
 from app.admin.forms import LoginForm, RegistrationForm, ProfessionalForm, BeautyCenterForm, SportsComplexForm
-from app.models import AppUser, Complex, Category, Service, Field, Timeslot, TimeslotStatus, UserComplex, user_professionals, user_beauty_centers
+from app.models import AppUser, Complex, Category, Service, Field, Schedule, Timeslot, TimeslotStatus, UserComplex, user_professionals, user_beauty_centers
 from app.models_catalog import Professional, BeautyCenter, SportsComplex, professional_services, beauty_center_services
 from app import db
+from app.services.schedules import SCHEDULE_MODES, save_schedule
 from app.services.timeslot_generation import generate_timeslots_for_field, generate_timeslots_for_professional
 from app.security import superadmin_required
+from app.services.access_scope import (
+    accessible_beauty_centers,
+    accessible_complexes,
+    accessible_fields,
+    accessible_professionals,
+    can_manage,
+    current_scope,
+    invalidate_user_scope,
+)
+from app.services.admin_tables import OPTION_MODELS, admin_page, entity_options
+from app.services.my_services import beauty_services_for, professional_services_for
+from app.services.session_user import forget_principal
 from app.utils import (
-    user_can_manage_complex,
     validate_date_format,
     validate_span,
     validate_category,
@@ -75,6 +87,7 @@ def register():
 def logout():
     """Cierra la sesión del usuario actual."""
     logout_user()
+    forget_principal()
     flash('Sesión cerrada correctamente.', 'info')
     return redirect(url_for('main.index'))
 
@@ -91,14 +104,7 @@ def professional_settings():
     if not (current_user.is_superadmin or (getattr(current_user, 'category', None) and getattr(current_user.category, 'slug', None) == 'profesionales')):
         return jsonify({'error': 'Unauthorized'}), 403
 
-    if current_user.is_superadmin:
-        professionals = Professional.query.order_by(Professional.name).all()
-    else:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        professionals = Professional.query.filter(Professional.id.in_(ids)).order_by(Professional.name).all() if ids else []
+    professionals = accessible_professionals()
 
     return render_template('admin/partials/_professional_settings.html', professionals=professionals)
 
@@ -116,15 +122,8 @@ def professional_update_settings():
 
     prof = Professional.query.get_or_404(prof_id)
     # Scope: user must be linked unless superadmin
-    if not current_user.is_superadmin:
-        link = db.session.execute(
-            db.select(user_professionals).where(
-                user_professionals.c.user_id == current_user.id,
-                user_professionals.c.professional_id == prof.id,
-            )
-        ).first()
-        if not link:
-            return jsonify({'error': 'Unauthorized'}), 403
+    if not can_manage('professional', prof.id):
+        return jsonify({'error': 'Unauthorized'}), 403
 
     if mode not in ('classic', 'per_day'):
         mode = 'classic'
@@ -142,14 +141,7 @@ def professional_update_settings():
     db.session.commit()
 
     # Rerender settings table
-    if current_user.is_superadmin:
-        professionals = Professional.query.order_by(Professional.name).all()
-    else:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        professionals = Professional.query.filter(Professional.id.in_(ids)).order_by(Professional.name).all() if ids else []
+    professionals = accessible_professionals()
     return render_template('admin/partials/_professional_settings.html', professionals=professionals, message_text='Guardado', message_category='success')
 
 @bp.route('/pro_timeslots/bulk_form')
@@ -158,14 +150,7 @@ def pro_timeslots_bulk_form():
     """HTMX partial to generate timeslots in bulk for professionals."""
     if not (current_user.is_superadmin or (getattr(current_user, 'category', None) and getattr(current_user.category, 'slug', None) == 'profesionales')):
         return jsonify({'error': 'Unauthorized'}), 403
-    if current_user.is_superadmin:
-        professionals = Professional.query.order_by(Professional.name).all()
-    else:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        professionals = Professional.query.filter(Professional.id.in_(ids)).order_by(Professional.name).all() if ids else []
+    professionals = accessible_professionals()
     return render_template('admin/partials/_pro_timeslot_bulk_form.html', professionals=professionals)
 
 @bp.route('/pro_timeslots/bulk_create', methods=['POST'])
@@ -185,6 +170,9 @@ def pro_timeslots_bulk_create():
     weekdays = request.form.getlist('weekdays')
     price_raw = (request.form.get('price') or '').strip()
     currency = (request.form.get('currency') or 'ARS').strip()[:3]
+    # Plantilla semanal: se guarda y se materializa de a poco (fecha hasta opcional)
+    schedule_mode = request.form.get('schedule_mode') if request.form.get('schedule_mode') in SCHEDULE_MODES else 'materialized'
+    recurring = bool(request.form.get('recurring')) or schedule_mode == 'virtual'
 
     msg = ''
     cat = 'success'
@@ -197,13 +185,7 @@ def pro_timeslots_bulk_create():
 
     # Scope
     if cat == 'success' and not current_user.is_superadmin:
-        link = db.session.execute(
-            db.select(user_professionals).where(
-                user_professionals.c.user_id == current_user.id,
-                user_professionals.c.professional_id == prof.id,
-            )
-        ).first()
-        if not link:
+        if not can_manage('professional', prof.id):
             return jsonify({'error': 'Unauthorized'}), 403
         if srv not in prof.linked_services:
             msg, cat = 'El servicio no está vinculado al profesional', 'error'
@@ -213,7 +195,7 @@ def pro_timeslots_bulk_create():
         try:
             from datetime import datetime as _dt, time as _time
             sd = _dt.strptime(start_date, '%Y-%m-%d').date()
-            ed = _dt.strptime(end_date, '%Y-%m-%d').date()
+            ed = _dt.strptime(end_date, '%Y-%m-%d').date() if (end_date or not recurring) else None
             st = _dt.strptime(start_time, '%H:%M').time()
             et = _dt.strptime(end_time, '%H:%M').time()
         except Exception:
@@ -243,6 +225,28 @@ def pro_timeslots_bulk_create():
         except Exception:
             wds = [0,1,2,3,4]
 
+    if cat == 'success' and recurring:
+        schedule = Schedule(
+            professional_id=prof.id,
+            service_id=srv.id,
+            weekdays=','.join(str(w) for w in sorted(set(wds))),
+            start_time=st,
+            end_time=et,
+            duration_min=dur,
+            interval_min=step,
+            price=price,
+            currency=currency or 'ARS',
+            valid_from=sd,
+            valid_until=ed,
+            mode=schedule_mode,
+        )
+        created, skipped = save_schedule(schedule)
+        db.session.commit()
+        if schedule_mode == 'virtual':
+            msg = 'Plantilla virtual guardada. Los turnos libres se calculan al consultar.'
+        else:
+            msg = f'Plantilla guardada. Turnos creados: {created}, omitidos: {skipped}'
+    elif cat == 'success':
         created, skipped = generate_timeslots_for_professional(
             professional=prof,
             service_id=srv.id,
@@ -259,14 +263,7 @@ def pro_timeslots_bulk_create():
         msg = f'Turnos creados: {created}, omitidos: {skipped}'
 
     # Rerender form
-    if current_user.is_superadmin:
-        professionals = Professional.query.order_by(Professional.name).all()
-    else:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        professionals = Professional.query.filter(Professional.id.in_(ids)).order_by(Professional.name).all() if ids else []
+    professionals = accessible_professionals()
     return render_template('admin/partials/_pro_timeslot_bulk_form.html', professionals=professionals, message_text=msg, message_category=cat)
 
 @bp.route('/super')
@@ -327,7 +324,7 @@ def complex_photos():
     cpx = Complex.query.get_or_404(complex_id)
 
     # Authorization: superadmin or linked to complex
-    if not (current_user.is_superadmin or user_can_manage_complex(current_user, cpx.id)):
+    if not can_manage('complex', cpx.id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     photos = cpx.photos
@@ -342,7 +339,7 @@ def complex_photos_upload():
         return jsonify({'error': 'complex_id requerido'}), 400
     cpx = Complex.query.get_or_404(complex_id)
 
-    if not (current_user.is_superadmin or user_can_manage_complex(current_user, cpx.id)):
+    if not can_manage('complex', cpx.id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     message_text = None
@@ -396,7 +393,7 @@ def complex_photos_delete():
     photo = ComplexPhoto.query.get_or_404(photo_id)
     cpx = Complex.query.get_or_404(photo.complex_id)
 
-    if not (current_user.is_superadmin or user_can_manage_complex(current_user, cpx.id)):
+    if not can_manage('complex', cpx.id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     # Remove file best-effort
@@ -423,19 +420,8 @@ def beauty_photos():
         return jsonify({'error': 'center_id requerido'}), 400
     center = BeautyCenter.query.get_or_404(center_id)
 
-    # Authorization: superadmin or user linked to center via user_beauty_centers
-    allowed = False
-    if current_user.is_superadmin:
-        allowed = True
-    else:
-        link = db.session.execute(
-            db.select(user_beauty_centers).where(
-                user_beauty_centers.c.user_id == current_user.id,
-                user_beauty_centers.c.beauty_center_id == center.id,
-            )
-        ).first()
-        allowed = bool(link)
-    if not allowed:
+    # Authorization: superadmin or user linked to center
+    if not can_manage('beauty_center', center.id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     return render_template('admin/partials/_beauty_photos.html', center=center, photos=center.photos)
@@ -449,18 +435,7 @@ def beauty_photos_upload():
         return jsonify({'error': 'center_id requerido'}), 400
     center = BeautyCenter.query.get_or_404(center_id)
 
-    allowed = False
-    if current_user.is_superadmin:
-        allowed = True
-    else:
-        link = db.session.execute(
-            db.select(user_beauty_centers).where(
-                user_beauty_centers.c.user_id == current_user.id,
-                user_beauty_centers.c.beauty_center_id == center.id,
-            )
-        ).first()
-        allowed = bool(link)
-    if not allowed:
+    if not can_manage('beauty_center', center.id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     message_text = None
@@ -513,18 +488,7 @@ def beauty_photos_delete():
     photo = BeautyCenterPhoto.query.get_or_404(photo_id)
     center = BeautyCenter.query.get_or_404(photo.beauty_center_id)
 
-    allowed = False
-    if current_user.is_superadmin:
-        allowed = True
-    else:
-        link = db.session.execute(
-            db.select(user_beauty_centers).where(
-                user_beauty_centers.c.user_id == current_user.id,
-                user_beauty_centers.c.beauty_center_id == center.id,
-            )
-        ).first()
-        allowed = bool(link)
-    if not allowed:
+    if not can_manage('beauty_center', center.id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     try:
@@ -550,16 +514,7 @@ def professional_media():
         return redirect(url_for('admin.panel'))
     prof = Professional.query.get_or_404(professional_id)
     # Scope: superadmin or linked professional
-    allowed = current_user.is_superadmin
-    if not allowed:
-        link = db.session.execute(
-            db.select(user_professionals).where(
-                user_professionals.c.user_id == current_user.id,
-                user_professionals.c.professional_id == prof.id,
-            )
-        ).first()
-        allowed = bool(link)
-    if not allowed:
+    if not can_manage('professional', prof.id):
         return redirect(url_for('admin.panel'))
     return render_template('admin/professional_media.html', professional=prof)
 
@@ -573,16 +528,7 @@ def professional_media_upload():
         return jsonify({'error': 'Datos invalidos'}), 400
     prof = Professional.query.get_or_404(professional_id)
 
-    allowed = current_user.is_superadmin
-    if not allowed:
-        link = db.session.execute(
-            db.select(user_professionals).where(
-                user_professionals.c.user_id == current_user.id,
-                user_professionals.c.professional_id == prof.id,
-            )
-        ).first()
-        allowed = bool(link)
-    if not allowed:
+    if not can_manage('professional', prof.id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     file = request.files.get('photo')
@@ -617,14 +563,7 @@ def beauty_settings():
     if not (current_user.is_superadmin or (getattr(current_user, 'category', None) and getattr(current_user.category, 'slug', None) == 'estetica')):
         return jsonify({'error': 'Unauthorized'}), 403
 
-    if current_user.is_superadmin:
-        centers = BeautyCenter.query.order_by(BeautyCenter.name).all()
-    else:
-        rows = db.session.execute(
-            db.select(user_beauty_centers.c.beauty_center_id).where(user_beauty_centers.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        centers = BeautyCenter.query.filter(BeautyCenter.id.in_(ids)).order_by(BeautyCenter.name).all() if ids else []
+    centers = accessible_beauty_centers()
 
     return render_template('admin/partials/_beauty_settings.html', centers=centers)
 
@@ -642,16 +581,9 @@ def beauty_update_settings():
 
     center = BeautyCenter.query.get_or_404(center_id)
     # Scope
-    if not current_user.is_superadmin:
-        link = db.session.execute(
-            db.select(user_beauty_centers).where(
-                user_beauty_centers.c.user_id == current_user.id,
-                user_beauty_centers.c.beauty_center_id == center.id,
-            )
-        ).first()
-        if not link:
-            centers = []
-            return render_template('admin/partials/_beauty_settings.html', centers=centers, message_text='Sin permisos para ese centro', message_category='error')
+    if not can_manage('beauty_center', center.id):
+        centers = []
+        return render_template('admin/partials/_beauty_settings.html', centers=centers, message_text='Sin permisos para ese centro', message_category='error')
 
 
     center.show_public_booking = show_public_booking
@@ -684,14 +616,7 @@ def beauty_update_settings():
     db.session.commit()
 
     # Rerender
-    if current_user.is_superadmin:
-        centers = BeautyCenter.query.order_by(BeautyCenter.name).all()
-    else:
-        rows = db.session.execute(
-            db.select(user_beauty_centers.c.beauty_center_id).where(user_beauty_centers.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        centers = BeautyCenter.query.filter(BeautyCenter.id.in_(ids)).order_by(BeautyCenter.name).all() if ids else []
+    centers = accessible_beauty_centers()
     return render_template('admin/partials/_beauty_settings.html', centers=centers, message_text='Guardado', message_category='success')
 
 
@@ -702,16 +627,7 @@ def complex_settings():
     if not (current_user.is_superadmin or (getattr(current_user, 'category', None) and getattr(current_user.category, 'slug', None) == 'deportes')):
         return jsonify({'error': 'Unauthorized'}), 403
 
-    if current_user.is_superadmin:
-        complexes = Complex.query.order_by(Complex.name).all()
-    else:
-        # complexes linked to user via UserComplex
-        complexes = (
-            Complex.query.join(UserComplex, UserComplex.complex_id == Complex.id)
-            .filter(UserComplex.user_id == current_user.id)
-            .order_by(Complex.name)
-            .all()
-        )
+    complexes = accessible_complexes()
 
     return render_template('admin/partials/_complex_settings.html', complexes=complexes)
 
@@ -727,24 +643,14 @@ def complex_update_settings():
 
     cpx = Complex.query.get_or_404(complex_id)
     # Scope
-    if not current_user.is_superadmin:
-        allowed = user_can_manage_complex(current_user, cpx.id)
-        if not allowed:
-            return jsonify({'error': 'Unauthorized'}), 403
+    if not can_manage('complex', cpx.id):
+        return jsonify({'error': 'Unauthorized'}), 403
 
     cpx.show_public_booking = show_public_booking
     db.session.commit()
 
     # Rerender
-    if current_user.is_superadmin:
-        complexes = Complex.query.order_by(Complex.name).all()
-    else:
-        complexes = (
-            Complex.query.join(UserComplex, UserComplex.complex_id == Complex.id)
-            .filter(UserComplex.user_id == current_user.id)
-            .order_by(Complex.name)
-            .all()
-        )
+    complexes = accessible_complexes()
     return render_template('admin/partials/_complex_settings.html', complexes=complexes, message_text='Guardado', message_category='success')
 
 
@@ -756,15 +662,7 @@ def field_settings():
         return jsonify({'error': 'Unauthorized'}), 403
 
     # Load complexes in scope
-    if current_user.is_superadmin:
-        complexes = Complex.query.order_by(Complex.name).all()
-    else:
-        complexes = (
-            Complex.query.join(UserComplex, UserComplex.complex_id == Complex.id)
-            .filter(UserComplex.user_id == current_user.id)
-            .order_by(Complex.name)
-            .all()
-        )
+    complexes = accessible_complexes()
 
     return render_template('admin/partials/_field_settings.html', complexes=complexes)
 
@@ -780,24 +678,14 @@ def field_update_settings():
 
     f = Field.query.get_or_404(field_id)
     # Scope
-    if not current_user.is_superadmin:
-        allowed = user_can_manage_complex(current_user, f.complex_id)
-        if not allowed:
-            return jsonify({'error': 'Unauthorized'}), 403
+    if not can_manage('complex', f.complex_id):
+        return jsonify({'error': 'Unauthorized'}), 403
 
     f.show_public_booking = show_public_booking
     db.session.commit()
 
     # Re-render
-    if current_user.is_superadmin:
-        complexes = Complex.query.order_by(Complex.name).all()
-    else:
-        complexes = (
-            Complex.query.join(UserComplex, UserComplex.complex_id == Complex.id)
-            .filter(UserComplex.user_id == current_user.id)
-            .order_by(Complex.name)
-            .all()
-        )
+    complexes = accessible_complexes()
     return render_template('admin/partials/_field_settings.html', complexes=complexes, message_text='Guardado', message_category='success')
 
 @bp.route('/catalog_forms')
@@ -988,25 +876,19 @@ def turnos_table():
         query = Timeslot.query
     else:
         user_category = getattr(getattr(current_user, 'category', None), 'slug', None)
+        scope = current_scope()
         if user_category == 'deportes':
-            user_complexes = db.session.query(UserComplex.complex_id).filter_by(user_id=current_user.id).subquery()
-            query = Timeslot.query.join(Field).filter(Field.complex_id.in_(user_complexes))
+            query = Timeslot.query.join(Field).filter(Field.complex_id.in_(scope.complex_ids))
         elif user_category == 'profesionales':
             # services linked to the user's professionals
-            prof_ids_sq = db.select(user_professionals.c.professional_id).where(
-                user_professionals.c.user_id == current_user.id
-            ).subquery()
             service_ids_sq = db.select(professional_services.c.service_id).where(
-                professional_services.c.professional_id.in_(db.select(prof_ids_sq))
+                professional_services.c.professional_id.in_(scope.professional_ids)
             )
             query = Timeslot.query.filter(Timeslot.service_id.in_(service_ids_sq))
         elif user_category == 'estetica':
             # services linked to the user's beauty centers
-            bc_ids_sq = db.select(user_beauty_centers.c.beauty_center_id).where(
-                user_beauty_centers.c.user_id == current_user.id
-            ).subquery()
             service_ids_sq = db.select(beauty_center_services.c.service_id).where(
-                beauty_center_services.c.beauty_center_id.in_(db.select(bc_ids_sq))
+                beauty_center_services.c.beauty_center_id.in_(scope.beauty_center_ids)
             )
             query = Timeslot.query.filter(Timeslot.service_id.in_(service_ids_sq))
         else:
@@ -1112,29 +994,34 @@ def turnos_table():
                           notice_category=notice_category)
 
 # Super Admin Routes
+def _render_admin_table(kind, template, rows_name, endpoint, **extra):
+    """Renderiza una tabla de administración paginada por cursor (?q=&cursor=&per_page=)."""
+    q = (request.args.get('q') or '').strip()
+    cursor = request.args.get('cursor') or None
+    rows, next_cursor = admin_page(kind, q, cursor, request.args.get('per_page', type=int))
+    return render_template(template, q=q, cursor=cursor, next_cursor=next_cursor,
+                           table_url=url_for(endpoint), **{rows_name: rows}, **extra)
+
 @bp.route('/categories_table')
 @login_required
 @superadmin_required
 def categories_table():
     """HTMX partial for categories management"""
-    categories = Category.query.all()
-    return render_template('admin/partials/_categories_table.html', categories=categories)
+    return _render_admin_table('categories', 'admin/partials/_categories_table.html', 'categories', 'admin.categories_table')
 
 @bp.route('/services_table')
 @login_required
 @superadmin_required
 def services_table():
     """HTMX partial for services management"""
-    services = Service.query.join(Category).all()
-    return render_template('admin/partials/_services_table.html', services=services)
+    return _render_admin_table('services', 'admin/partials/_services_table.html', 'services', 'admin.services_table')
 
 @bp.route('/complexes_table')
 @login_required
 @superadmin_required
 def complexes_table():
     """HTMX partial for complexes management"""
-    complexes = Complex.query.all()
-    return render_template('admin/partials/_complexes_table.html', complexes=complexes)
+    return _render_admin_table('complexes', 'admin/partials/_complexes_table.html', 'complexes', 'admin.complexes_table')
 
 
 # Estética: creación de servicios por administradores
@@ -1267,15 +1154,7 @@ def timeslots_service_create_form():
         return jsonify({'error': 'Unauthorized'}), 403
 
     # Profesionales disponibles para el usuario
-    if current_user.is_superadmin:
-        professionals = Professional.query.order_by(Professional.name).all()
-    else:
-        # IDs vinculados al usuario vía tabla puente
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        professionals = Professional.query.filter(Professional.id.in_(ids)).order_by(Professional.name).all() if ids else []
+    professionals = accessible_professionals()
 
     return render_template('admin/partials/_timeslot_service_create_form.html', professionals=professionals)
 
@@ -1291,15 +1170,8 @@ def timeslot_services_options():
     prof = Professional.query.get_or_404(prof_id)
 
     # Autorización: superadmin o vinculado
-    if not current_user.is_superadmin:
-        link = db.session.execute(
-            db.select(user_professionals).where(
-                user_professionals.c.user_id == current_user.id,
-                user_professionals.c.professional_id == prof.id,
-            )
-        ).first()
-        if not link:
-            return jsonify({'error': 'Unauthorized'}), 403
+    if not can_manage('professional', prof.id):
+        return jsonify({'error': 'Unauthorized'}), 403
 
     # Solo servicios de categoría 'profesionales' vinculados al profesional
     services = [s for s in prof.linked_services if s.category and s.category.slug == 'profesionales' and s.is_active]
@@ -1337,15 +1209,8 @@ def timeslots_create_for_service():
 
     # Autorización y vínculo profesional-servicio
     if message_category == 'success':
-        if not current_user.is_superadmin:
-            link = db.session.execute(
-                db.select(user_professionals).where(
-                    user_professionals.c.user_id == current_user.id,
-                    user_professionals.c.professional_id == prof.id,
-                )
-            ).first()
-            if not link:
-                return jsonify({'error': 'Unauthorized'}), 403
+        if not can_manage('professional', prof.id):
+            return jsonify({'error': 'Unauthorized'}), 403
         if srv not in prof.linked_services or not (srv.category and srv.category.slug == 'profesionales'):
             message_text = 'El servicio no está vinculado al profesional'
             message_category = 'error'
@@ -1420,14 +1285,7 @@ def timeslots_create_for_service():
 
     # Re-render parcial
     # Reusar el form original con lista de profesionales disponible
-    if current_user.is_superadmin:
-        professionals = Professional.query.order_by(Professional.name).all()
-    else:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        professionals = Professional.query.filter(Professional.id.in_(ids)).order_by(Professional.name).all() if ids else []
+    professionals = accessible_professionals()
 
     return render_template(
         'admin/partials/_timeslot_service_create_form.html',
@@ -1445,29 +1303,8 @@ def my_services_table():
     if not (current_user.is_superadmin or (getattr(current_user, 'category', None) and getattr(current_user.category, 'slug', None) == 'profesionales')):
         return jsonify({'error': 'Unauthorized'}), 403
 
-    # Obtener profesionales vinculados
-    if current_user.is_superadmin:
-        professionals = Professional.query.order_by(Professional.name).all()
-    else:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        professionals = Professional.query.filter(Professional.id.in_(ids)).order_by(Professional.name).all() if ids else []
-
-    # Agregar servicios únicos (solo categoría profesionales)
-    services = []
-    seen = set()
-    for p in professionals:
-        for s in p.linked_services:
-            if not s.is_active or not s.category or s.category.slug != 'profesionales':
-                continue
-            if s.id in seen:
-                continue
-            seen.add(s.id)
-            services.append(s)
-
-    services = sorted(services, key=lambda s: (s.name or '').lower())
+    # Servicios únicos (solo categoría profesionales) de los profesionales vinculados
+    services = professional_services_for(current_scope())
     return render_template('admin/partials/_my_services_table.html', services=services)
 
 
@@ -1486,10 +1323,7 @@ def my_services_toggle():
     if current_user.is_superadmin:
         in_scope = True
     else:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
+        ids = list(current_scope().professional_ids)
         if ids:
             # ¿Algún profesional del usuario tiene este servicio?
             linked = db.session.execute(
@@ -1529,10 +1363,7 @@ def timeslots_quick_form():
             .all()
         )
     else:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
+        ids = list(current_scope().professional_ids)
         professionals = (
             Professional.query
             .join(professional_services, professional_services.c.professional_id == Professional.id)
@@ -1571,13 +1402,7 @@ def timeslots_create_for_service_quick():
 
     # Alcance usuario
     if message_category == 'success' and not current_user.is_superadmin:
-        link = db.session.execute(
-            db.select(user_professionals).where(
-                user_professionals.c.user_id == current_user.id,
-                user_professionals.c.professional_id == prof.id,
-            )
-        ).first()
-        if not link:
+        if not can_manage('professional', prof.id):
             return jsonify({'error': 'Unauthorized'}), 403
         if srv not in prof.linked_services:
             message_text = 'El servicio no está vinculado al profesional'
@@ -1648,27 +1473,7 @@ def timeslots_create_for_service_quick():
         message_text = 'Turno creado correctamente'
 
     # Re-render tabla con mensaje (si aplicara, se puede pasar via flash o contexto)
-    # Reconstruir servicios como en my_services_table
-    if current_user.is_superadmin:
-        professionals = Professional.query.order_by(Professional.name).all()
-    else:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        professionals = Professional.query.filter(Professional.id.in_(ids)).order_by(Professional.name).all() if ids else []
-
-    services = []
-    seen = set()
-    for p in professionals:
-        for s in p.linked_services:
-            if not s.category or s.category.slug != 'profesionales':
-                continue
-            if s.id in seen:
-                continue
-            seen.add(s.id)
-            services.append(s)
-    services = sorted(services, key=lambda s: (s.name or '').lower())
+    services = professional_services_for(current_scope(), active_only=False)
 
     return render_template('admin/partials/_my_services_table.html', services=services, message_text=message_text, message_category=message_category)
 
@@ -1681,38 +1486,8 @@ def my_beauty_services_table():
     if not (current_user.is_superadmin or (getattr(current_user, 'category', None) and getattr(current_user.category, 'slug', None) == 'estetica')):
         return jsonify({'error': 'Unauthorized'}), 403
 
-    # Centros vinculados
-    if current_user.is_superadmin:
-        centers = BeautyCenter.query.order_by(BeautyCenter.name).all()
-    else:
-        rows = db.session.execute(
-            db.select(user_beauty_centers.c.beauty_center_id).where(user_beauty_centers.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        centers = BeautyCenter.query.filter(BeautyCenter.id.in_(ids)).order_by(BeautyCenter.name).all() if ids else []
-
-    services = []
-    seen: set[int] = set()
-    allowed_service_ids: set[int] = set()
-    for c in centers:
-        # Calcular servicios permitidos según modo del centro
-        if getattr(c, 'booking_mode', 'flexible') == 'fixed' and getattr(c, 'fixed_service_id', None):
-            allowed_service_ids.add(int(c.fixed_service_id))  # type: ignore[arg-type]
-        else:
-            for s in c.linked_services:
-                if s.category and s.category.slug == 'estetica':
-                    allowed_service_ids.add(s.id)
-        # Armar listado de servicios visibles (solo los permitidos si hay restricción)
-        for s in c.linked_services:
-            if not s.category or s.category.slug != 'estetica':
-                continue
-            if allowed_service_ids and s.id not in allowed_service_ids:
-                continue
-            if s.id in seen:
-                continue
-            seen.add(s.id)
-            services.append(s)
-    services = sorted(services, key=lambda s: (s.name or '').lower())
+    # Servicios de estética de los centros vinculados (respetando centros en modo fijo)
+    services, allowed_service_ids = beauty_services_for(current_scope())
     return render_template('admin/partials/_my_services_beauty_table.html', services=services, allowed_service_ids=allowed_service_ids)
 
 
@@ -1732,10 +1507,7 @@ def my_services_edit_form():
     if current_user.is_superadmin:
         in_scope = True
     else:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
+        ids = list(current_scope().professional_ids)
         if ids and srv.category and srv.category.slug == 'profesionales':
             linked = db.session.execute(
                 db.select(professional_services).where(
@@ -1780,10 +1552,7 @@ def my_services_update():
 
     # Alcance
     if message_category == 'success' and not current_user.is_superadmin:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
+        ids = list(current_scope().professional_ids)
         linked = None
         if ids:
             linked = db.session.execute(
@@ -1820,28 +1589,7 @@ def my_services_update():
         message_text = 'Servicio actualizado'
 
     # Refrescar tabla
-    # Reusar my_services_table pero inyectando mensajes
-    # reconstrucción como en my_services_table
-    if current_user.is_superadmin:
-        professionals = Professional.query.order_by(Professional.name).all()
-    else:
-        rows = db.session.execute(
-            db.select(user_professionals.c.professional_id).where(user_professionals.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
-        professionals = Professional.query.filter(Professional.id.in_(ids)).order_by(Professional.name).all() if ids else []
-
-    services = []
-    seen = set()
-    for p in professionals:
-        for s in p.linked_services:
-            if not s.is_active or not s.category or s.category.slug != 'profesionales':
-                continue
-            if s.id in seen:
-                continue
-            seen.add(s.id)
-            services.append(s)
-    services = sorted(services, key=lambda s: (s.name or '').lower())
+    services = professional_services_for(current_scope())
     return render_template('admin/partials/_my_services_table.html', services=services, message_text=message_text, message_category=message_category)
 
 
@@ -1859,10 +1607,7 @@ def my_beauty_services_edit_form():
     if current_user.is_superadmin:
         in_scope = True
     else:
-        rows = db.session.execute(
-            db.select(user_beauty_centers.c.beauty_center_id).where(user_beauty_centers.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
+        ids = list(current_scope().beauty_center_ids)
         if ids and srv.category and srv.category.slug == 'estetica':
             linked = db.session.execute(
                 db.select(beauty_center_services).where(
@@ -1897,10 +1642,7 @@ def my_beauty_services_update():
         message_category = 'error'
 
     if message_category == 'success' and not current_user.is_superadmin:
-        rows = db.session.execute(
-            db.select(user_beauty_centers.c.beauty_center_id).where(user_beauty_centers.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
+        ids = list(current_scope().beauty_center_ids)
         linked = None
         if ids:
             linked = db.session.execute(
@@ -1952,10 +1694,7 @@ def my_beauty_services_toggle():
     if current_user.is_superadmin:
         in_scope = True
     else:
-        rows = db.session.execute(
-            db.select(user_beauty_centers.c.beauty_center_id).where(user_beauty_centers.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
+        ids = list(current_scope().beauty_center_ids)
         if ids:
             linked = db.session.execute(
                 db.select(beauty_center_services).where(
@@ -1984,10 +1723,7 @@ def timeslots_quick_form_beauty():
 
     # Verificar que el servicio esté en alcance (algún centro del usuario)
     if not current_user.is_superadmin:
-        rows = db.session.execute(
-            db.select(user_beauty_centers.c.beauty_center_id).where(user_beauty_centers.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
+        ids = list(current_scope().beauty_center_ids)
         if ids:
             linked = db.session.execute(
                 db.select(beauty_center_services).where(
@@ -2010,10 +1746,7 @@ def timeslots_quick_form_beauty():
             .all()
         )
     else:
-        rows = db.session.execute(
-            db.select(user_beauty_centers.c.beauty_center_id).where(user_beauty_centers.c.user_id == current_user.id)
-        ).all()
-        ids = [r[0] for r in rows]
+        ids = list(current_scope().beauty_center_ids)
         centers = (
             BeautyCenter.query
             .join(beauty_center_services, beauty_center_services.c.beauty_center_id == BeautyCenter.id)
@@ -2071,12 +1804,7 @@ def timeslots_create_for_service_quick_beauty():
                 message_text = 'El servicio no está vinculado al centro'
                 message_category = 'error'
         else:
-            link_user = db.session.execute(
-                db.select(user_beauty_centers).where(
-                    user_beauty_centers.c.user_id == current_user.id,
-                    user_beauty_centers.c.beauty_center_id == center.id,
-                )
-            ).first()
+            link_user = can_manage('beauty_center', center.id)
             link_srv = db.session.execute(
                 db.select(beauty_center_services).where(
                     beauty_center_services.c.beauty_center_id == center.id,
@@ -2215,12 +1943,10 @@ def complexes_create():
                     db.session.commit()
                     message_text = 'Complejo creado correctamente'
 
-    complexes = Complex.query.all()
     # If HTMX, return partial updated; otherwise redirect back
     if request.headers.get('HX-Request'):
-        return render_template(
-            'admin/partials/_complexes_table.html',
-            complexes=complexes,
+        return _render_admin_table(
+            'complexes', 'admin/partials/_complexes_table.html', 'complexes', 'admin.complexes_table',
             message_text=message_text,
             message_category=message_category,
         )
@@ -2244,7 +1970,7 @@ def fields_table():
         return jsonify({'success': False, 'message': 'complex_id requerido'}), 400
 
     # Autorización: superadmin o vínculo con complejo
-    if not user_can_manage_complex(getattr(current_user, 'id', None), complex_id):
+    if not can_manage('complex', complex_id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     complex_obj = Complex.query.get_or_404(complex_id)
@@ -2267,7 +1993,7 @@ def fields_create():
         return jsonify({'success': False, 'message': 'complex_id requerido'}), 400
 
     # Autorización
-    if not user_can_manage_complex(getattr(current_user, 'id', None), complex_id):
+    if not can_manage('complex', complex_id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     name = clean_text(request.form.get('name', ''), 200)
@@ -2326,16 +2052,7 @@ def timeslots_create_form():
     # Restringir a categoría 'deportes' (o superadmin)
     if not (current_user.is_superadmin or (getattr(current_user, 'category', None) and getattr(current_user.category, 'slug', None) == 'deportes')):
         return jsonify({'error': 'Unauthorized'}), 403
-    if current_user.is_superadmin:
-        available_fields = Field.query.order_by(Field.name).all()
-    else:
-        user_complexes = db.session.query(UserComplex.complex_id).filter_by(user_id=current_user.id).subquery()
-        available_fields = (
-            Field.query
-            .filter(Field.complex_id.in_(user_complexes))
-            .order_by(Field.name)
-            .all()
-        )
+    available_fields = accessible_fields()
     return render_template('admin/partials/_timeslot_create_form.html', available_fields=available_fields)
 
 
@@ -2347,16 +2064,7 @@ def timeslots_bulk_form():
     if not (current_user.is_superadmin or (getattr(current_user, 'category', None) and getattr(current_user.category, 'slug', None) == 'deportes')):
         return jsonify({'error': 'Unauthorized'}), 403
 
-    if current_user.is_superadmin:
-        available_fields = Field.query.order_by(Field.name).all()
-    else:
-        user_complexes = db.session.query(UserComplex.complex_id).filter_by(user_id=current_user.id).subquery()
-        available_fields = (
-            Field.query
-            .filter(Field.complex_id.in_(user_complexes))
-            .order_by(Field.name)
-            .all()
-        )
+    available_fields = accessible_fields()
 
     return render_template('admin/partials/_timeslot_bulk_form.html', available_fields=available_fields)
 
@@ -2383,18 +2091,12 @@ def timeslots_bulk_create():
     price_raw = (request.form.get('price') or '').strip()
     currency = (request.form.get('currency') or 'ARS').strip() or 'ARS'
     weekdays_vals = request.form.getlist('weekdays')
+    # Plantilla semanal: se guarda y se materializa de a poco (fecha hasta opcional)
+    schedule_mode = request.form.get('schedule_mode') if request.form.get('schedule_mode') in SCHEDULE_MODES else 'materialized'
+    recurring = bool(request.form.get('recurring')) or schedule_mode == 'virtual'
 
     # Re-fetch available fields for re-rendering the form
-    if current_user.is_superadmin:
-        available_fields = Field.query.order_by(Field.name).all()
-    else:
-        user_complexes = db.session.query(UserComplex.complex_id).filter_by(user_id=current_user.id).subquery()
-        available_fields = (
-            Field.query
-            .filter(Field.complex_id.in_(user_complexes))
-            .order_by(Field.name)
-            .all()
-        )
+    available_fields = accessible_fields()
 
     message_text = ''
     message_category = 'success'
@@ -2403,7 +2105,7 @@ def timeslots_bulk_create():
     if not field:
         message_text = 'Cancha inválida'
         message_category = 'error'
-    elif not current_user.is_superadmin and not user_can_manage_complex(getattr(current_user, 'id', None), field.complex_id):
+    elif not can_manage('complex', field.complex_id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     # Parse dates and times
@@ -2412,7 +2114,8 @@ def timeslots_bulk_create():
     if message_category == 'success':
         try:
             start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+            if end_date_str or not recurring:
+                end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
         except Exception:
             message_text = 'Rango de fechas inválido'
             message_category = 'error'
@@ -2435,12 +2138,12 @@ def timeslots_bulk_create():
             interval_min = duration_min
 
     if message_category == 'success':
-        if end_date < start_date:
+        if end_date and end_date < start_date:
             message_text = 'La fecha fin debe ser posterior a inicio'
             message_category = 'error'
 
-    # Limit guard rails (avoid massive explosions)
-    if message_category == 'success':
+    # Limit guard rails (avoid massive explosions); las plantillas se materializan por horizonte
+    if message_category == 'success' and not recurring:
         max_days = 120
         days = (end_date - start_date).days + 1
         if days > max_days:
@@ -2469,7 +2172,28 @@ def timeslots_bulk_create():
             message_category = 'error'
 
     created = skipped = 0
-    if message_category == 'success':
+    if message_category == 'success' and recurring:
+        schedule = Schedule(
+            field_id=field.id,
+            weekdays=','.join(str(w) for w in sorted(set(weekdays))),
+            start_time=start_time,
+            end_time=end_time,
+            duration_min=duration_min,
+            interval_min=interval_min,
+            price=price,
+            currency=currency,
+            valid_from=start_date,
+            valid_until=end_date,
+            mode=schedule_mode,
+        )
+        created, skipped = save_schedule(schedule)
+        db.session.commit()
+        if schedule_mode == 'virtual':
+            message_text = 'Plantilla virtual guardada. Los turnos libres se calculan al consultar.'
+        else:
+            message_text = (f'Plantilla guardada. Turnos creados hasta {schedule.materialized_until or start_date:%d/%m/%Y}: '
+                            f'{created}. Omitidos por solape: {skipped}.')
+    elif message_category == 'success':
         created, skipped = generate_timeslots_for_field(
             field=field,
             start_date=start_date,
@@ -2511,16 +2235,7 @@ def timeslots_create():
     price_raw = (request.form.get('price') or '').strip()
 
     # Recolectar campos disponibles para re-render del formulario
-    if current_user.is_superadmin:
-        available_fields = Field.query.order_by(Field.name).all()
-    else:
-        user_complexes = db.session.query(UserComplex.complex_id).filter_by(user_id=current_user.id).subquery()
-        available_fields = (
-            Field.query
-            .filter(Field.complex_id.in_(user_complexes))
-            .order_by(Field.name)
-            .all()
-        )
+    available_fields = accessible_fields()
 
     message_text = ''
     message_category = 'success'
@@ -2530,7 +2245,7 @@ def timeslots_create():
     if not field:
         message_text = 'Cancha inválida'
         message_category = 'error'
-    elif not user_can_manage_complex(getattr(current_user, 'id', None), field.complex_id):
+    elif not can_manage('complex', field.complex_id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     # Parseo fecha/hora local (datetime-local => YYYY-MM-DDTHH:MM)
@@ -2617,10 +2332,14 @@ def timeslots_create():
 @superadmin_required
 def users_table():
     """HTMX partial for users management"""
-    users = AppUser.query.all()
+    return _users_table()
+
+
+def _users_table(**extra):
+    """Tabla de usuarios (página actual según ?q=&cursor=) con las categorías para los selects."""
     categories = Category.query.order_by(Category.title).all()
-    # Para selects dependientes según categoría seleccionada por usuario via HTMX
-    return render_template('admin/partials/_users_table.html', users=users, categories=categories)
+    return _render_admin_table('users', 'admin/partials/_users_table.html', 'users', 'admin.users_table',
+                               categories=categories, **extra)
 
 @bp.route('/users/create', methods=['POST'])
 @login_required
@@ -2634,20 +2353,14 @@ def users_create():
 
     if not email or not password:
         if request.headers.get('HX-Request'):
-            users = AppUser.query.all()
-            categories = Category.query.order_by(Category.title).all()
-            return render_template('admin/partials/_users_table.html', users=users, categories=categories,
-                                   message_text='Email y contraseña son requeridos', message_category='error')
+            return _users_table(message_text='Email y contraseña son requeridos', message_category='error')
         flash('Email y contraseña son requeridos', 'error')
         return redirect(url_for('admin.users_table'))
 
     existing = AppUser.query.filter_by(email=email).first()
     if existing:
         if request.headers.get('HX-Request'):
-            users = AppUser.query.all()
-            categories = Category.query.order_by(Category.title).all()
-            return render_template('admin/partials/_users_table.html', users=users, categories=categories,
-                                   message_text='El email ya existe', message_category='error')
+            return _users_table(message_text='El email ya existe', message_category='error')
         flash('El email ya existe', 'error')
         return redirect(url_for('admin.users_table'))
 
@@ -2660,20 +2373,14 @@ def users_create():
         if not category_slug or not entity_id:
             db.session.rollback()
             if request.headers.get('HX-Request'):
-                users = AppUser.query.all()
-                categories = Category.query.order_by(Category.title).all()
-                return render_template('admin/partials/_users_table.html', users=users, categories=categories,
-                                       message_text='Selecciona categoría y entidad para usuarios Admin.', message_category='error')
+                return _users_table(message_text='Selecciona categoría y entidad para usuarios Admin.', message_category='error')
             flash('Selecciona categoría y entidad para usuarios Admin.', 'error')
             return redirect(url_for('admin.users_table'))
         cat = Category.query.filter_by(slug=category_slug).first()
         if not cat:
             db.session.rollback()
             if request.headers.get('HX-Request'):
-                users = AppUser.query.all()
-                categories = Category.query.order_by(Category.title).all()
-                return render_template('admin/partials/_users_table.html', users=users, categories=categories,
-                                       message_text='Categoría inválida', message_category='error')
+                return _users_table(message_text='Categoría inválida', message_category='error')
             flash('Categoría inválida', 'error')
             return redirect(url_for('admin.users_table'))
         user.category_id = cat.id
@@ -2689,10 +2396,7 @@ def users_create():
 
     # Si viene de HTMX, devolver el parcial actualizado para mantener al usuario en el panel
     if request.headers.get('HX-Request'):
-        users = AppUser.query.all()
-        categories = Category.query.order_by(Category.title).all()
-        return render_template('admin/partials/_users_table.html', users=users, categories=categories,
-                               message_text='Usuario creado correctamente', message_category='success')
+        return _users_table(message_text='Usuario creado correctamente', message_category='success')
 
     # Fallback navegación completa
     return redirect(url_for('admin.super_admin'))
@@ -2705,20 +2409,25 @@ def users_edit():
     user_id = request.args.get('user_id', type=int)
     user = AppUser.query.get_or_404(user_id)
     categories = Category.query.order_by(Category.title).all()
-    # Preload items for current category
+    # Preload first options for current category (plus the linked entity)
     items = []
     kind = None
+    selected_id = None
     if user.category:
         if user.category.slug == 'deportes':
-            items = Complex.query.order_by(Complex.name).all()
             kind = 'complex'
+            selected_id = user.complexes[0].id if user.complexes else None
         elif user.category.slug == 'estetica':
-            items = BeautyCenter.query.order_by(BeautyCenter.name).all()
             kind = 'beauty'
+            current = user.beauty_centers.first()
+            selected_id = current.id if current else None
         else:
-            items = Professional.query.order_by(Professional.name).all()
             kind = 'professional'
-    return render_template('admin/partials/_user_edit_form.html', user=user, categories=categories, items=items, kind=kind)
+            current = user.professionals.first()
+            selected_id = current.id if current else None
+        items = entity_options(kind, selected_id=selected_id)
+    return render_template('admin/partials/_user_edit_form.html', user=user, categories=categories, items=items,
+                           kind=kind, selected_id=selected_id)
 
 
 @bp.post('/users/update')
@@ -2766,10 +2475,8 @@ def users_update():
         user.category_id = None
 
     db.session.commit()
-    users = AppUser.query.all()
-    categories = Category.query.order_by(Category.title).all()
-    return render_template('admin/partials/_users_table.html', users=users, categories=categories,
-                           message_text='Usuario actualizado', message_category='success')
+    invalidate_user_scope(user.id)
+    return _users_table(message_text='Usuario actualizado', message_category='success')
 
 
 @bp.route('/users/set_category', methods=['POST'])
@@ -2784,11 +2491,10 @@ def users_set_category():
         return jsonify({'success': False, 'message': 'Categoría inválida'}), 400
     user.category_id = category.id
     db.session.commit()
+    invalidate_user_scope(user.id)
 
     if request.headers.get('HX-Request'):
-        users = AppUser.query.all()
-        categories = Category.query.order_by(Category.title).all()
-        return render_template('admin/partials/_users_table.html', users=users, categories=categories)
+        return _users_table()
     return redirect(url_for('admin.super_admin'))
 
 
@@ -2818,11 +2524,10 @@ def users_link():
         return jsonify({'success': False, 'message': 'Tipo inválido'}), 400
 
     db.session.commit()
+    invalidate_user_scope(user.id)
 
     if request.headers.get('HX-Request'):
-        users = AppUser.query.all()
-        categories = Category.query.order_by(Category.title).all()
-        return render_template('admin/partials/_users_table.html', users=users, categories=categories)
+        return _users_table()
     return redirect(url_for('admin.super_admin'))
 
 
@@ -2845,11 +2550,9 @@ def users_unlink():
         return jsonify({'success': False, 'message': 'Tipo inválido'}), 400
 
     db.session.commit()
+    invalidate_user_scope(user.id)
     if request.headers.get('HX-Request'):
-        users = AppUser.query.all()
-        categories = Category.query.order_by(Category.title).all()
-        return render_template('admin/partials/_users_table.html', users=users, categories=categories,
-                               message_text='Vínculo eliminado', message_category='success')
+        return _users_table(message_text='Vínculo eliminado', message_category='success')
     return redirect(url_for('admin.super_admin'))
 
 
@@ -2861,46 +2564,43 @@ def users_entities_options():
     user = AppUser.query.get_or_404(user_id)
     if not user.category:
         return jsonify({'success': False, 'message': 'Usuario sin categoría'}), 400
-    if user.category.slug == 'deportes':
-        items = Complex.query.order_by(Complex.name).all()
-        return render_template('admin/partials/_user_entities_options.html', kind='complex', items=items)
-    elif user.category.slug == 'estetica':
-        items = BeautyCenter.query.order_by(BeautyCenter.name).all()
-        return render_template('admin/partials/_user_entities_options.html', kind='beauty', items=items)
-    else:
-        items = Professional.query.order_by(Professional.name).all()
-        return render_template('admin/partials/_user_entities_options.html', kind='professional', items=items)
+    kind = {'deportes': 'complex', 'estetica': 'beauty'}.get(user.category.slug, 'professional')
+    return render_template('admin/partials/_user_entities_options.html', kind=kind, items=entity_options(kind))
+
+
+@bp.route('/users/entity_search')
+@login_required
+@superadmin_required
+def users_entity_search():
+    """<option> de entidades que coinciden con ?q= (búsqueda remota del select de vínculo)."""
+    kind = request.args.get('kind', '')
+    if kind not in OPTION_MODELS:
+        return jsonify({'success': False, 'message': 'Tipo inválido'}), 400
+    q = request.args.get('q') or request.args.get('entity_q', '')
+    items = entity_options(kind, q, request.args.get('selected_id', type=int))
+    return render_template('admin/partials/_options.html', options=[(it.id, f"#{it.id} — {it.name}") for it in items])
 
 @bp.route('/professionals_table')
 @login_required
 @superadmin_required
 def professionals_table():
-    pros = Professional.query.order_by(Professional.name).all()
-    return render_template('admin/partials/_professionals_table.html', professionals=pros)
+    return _render_admin_table('professionals', 'admin/partials/_professionals_table.html', 'professionals', 'admin.professionals_table')
 
 @bp.route('/beauty_centers_table')
 @login_required
 @superadmin_required
 def beauty_centers_table():
-    centers = BeautyCenter.query.order_by(BeautyCenter.name).all()
-    return render_template('admin/partials/_beauty_centers_table.html', centers=centers)
+    return _render_admin_table('beauty_centers', 'admin/partials/_beauty_centers_table.html', 'centers', 'admin.beauty_centers_table')
 
 @bp.route('/users/entity_options_by_category')
 @login_required
 @superadmin_required
 def users_entity_options_by_category():
     slug = request.args.get('category', '').strip()
-    if slug == 'deportes':
-        items = Complex.query.order_by(Complex.name).all()
-        return render_template('admin/partials/_user_entities_options.html', kind='complex', items=items)
-    elif slug == 'estetica':
-        items = BeautyCenter.query.order_by(BeautyCenter.name).all()
-        return render_template('admin/partials/_user_entities_options.html', kind='beauty', items=items)
-    elif slug == 'profesionales':
-        items = Professional.query.order_by(Professional.name).all()
-        return render_template('admin/partials/_user_entities_options.html', kind='professional', items=items)
-    else:
+    kind = {'deportes': 'complex', 'estetica': 'beauty', 'profesionales': 'professional'}.get(slug)
+    if not kind:
         return render_template('admin/partials/_user_entities_options.html', kind='professional', items=[])
+    return render_template('admin/partials/_user_entities_options.html', kind=kind, items=entity_options(kind))
 
 
 # HTMX endpoint to create catalog entities with partial refresh
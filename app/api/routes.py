@@ -4,6 +4,18 @@ from app.api import bp
 from app.models import Timeslot, TimeslotStatus, Complex, Category, Service, Field, Subscription, SubscriptionStatus
 from app.utils import user_can_manage_complex, validate_email, clean_text
 from app.services.notification_service import NotificationService
+from app.services.access_scope import current_scope
+from app.services.timeslot_bulk import (
+    SOURCE_STATUSES,
+    BulkSelectionError,
+    apply_bulk,
+    clear_holds,
+    out_of_scope_ids,
+    parse_selection,
+)
+from app.services.virtual_slots import materialize_virtual, parse_virtual_id
+from app.services.landing_stats import landing_stats
+from app.services.read_replica import read_only
 from app.security import (
     validate_email as security_validate_email,
     validate_phone,
@@ -31,6 +43,26 @@ def health():
     return jsonify({"status": "ok"}), 200
 
 
+@bp.get("/landing-stats/<category>")
+@read_only
+def landing_stats_api(category):
+    """Turnos libres por día de una categoría desde el resumen de landings.
+
+    Parámetros opcionales: city, entity_type + entity_id (complex, beauty_center,
+    professional o service) y days (hasta LANDING_STATS_DAYS).
+    """
+    category = clean_text(category, 50)
+    if not Category.query.filter_by(slug=category, is_active=True).first():
+        return jsonify({"error": "Categoría no válida"}), 404
+    city = clean_text(request.args.get("city", ""), 100) or None
+    entity_type = request.args.get("entity_type") or None
+    if entity_type not in (None, "complex", "beauty_center", "professional", "service"):
+        return jsonify({"error": "entity_type inválido"}), 400
+    entity_id = request.args.get("entity_id", type=int)
+    days = request.args.get("days", 7, type=int)
+    return jsonify(landing_stats(category, city, entity_type, entity_id, days))
+
+
 @bp.route("/hold", methods=["POST"])
 @limiter.limit("10 per minute")
 def hold_timeslot():
@@ -41,11 +73,18 @@ def hold_timeslot():
       * Deportes: usa Complex.contact_phone
       * Profesionales/Estética: intenta Professional.phone o BeautyCenter.phone del servicio
     """
-    timeslot_id = request.form.get("timeslot_id", type=int)
-    if not timeslot_id:
-        return jsonify({"success": False, "message": "ID de turno requerido."}), 400
-
-    ts = Timeslot.query.get_or_404(timeslot_id)
+    raw_id = (request.form.get("timeslot_id") or "").strip()
+    if parse_virtual_id(raw_id):
+        # Slot de plantilla virtual: la fila se escribe recién ahora
+        ts = materialize_virtual(raw_id)
+        if ts is None:
+            db.session.rollback()
+            return jsonify({"success": False, "message": "El turno no está disponible."}), 400
+    else:
+        timeslot_id = request.form.get("timeslot_id", type=int)
+        if not timeslot_id:
+            return jsonify({"success": False, "message": "ID de turno requerido."}), 400
+        ts = Timeslot.query.get_or_404(timeslot_id)
     if ts.status != TimeslotStatus.AVAILABLE:
         return jsonify({"success": False, "message": "El turno no está disponible."}), 400
 
@@ -134,6 +173,7 @@ def hold_timeslot():
         {
             "success": True,
             "message": "Turno en espera.",
+            "timeslot_id": ts.id,
             "whatsapp_url": wa_url,
             "admin_url": admin_url,
         }
@@ -282,6 +322,50 @@ def release_turno(timeslot_id):
     return jsonify({"success": True, "message": "Turno liberado correctamente"})
 
 
+@bp.route("/admin/turnos/bulk/<action>", methods=["POST"])
+@login_required
+def bulk_turnos(action):
+    """Confirma, libera, bloquea o borra varios turnos (por ids o por filtro) en una operación.
+
+    Payload (JSON o form): ids y/o complex_id, field_id, service_id,
+    professional_id, beauty_center_id, start_from, start_to (ISO).
+    """
+    if action not in SOURCE_STATUSES:
+        return jsonify({"success": False, "message": "Acción inválida"}), 404
+
+    data = request.get_json(silent=True) or request.form
+    try:
+        selection = parse_selection(data, request.form.getlist("ids") if not request.is_json else None)
+    except BulkSelectionError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    scope = current_scope()
+    if selection.complex_id is not None and not scope.can_manage("complex", selection.complex_id):
+        return jsonify({"success": False, "message": "Sin permisos para este complejo"}), 403
+    if out_of_scope_ids(selection, scope):
+        return jsonify({"success": False, "message": "Sin permisos para algunos turnos"}), 403
+
+    result = apply_bulk(action, selection, scope)
+    db.session.commit()
+    clear_holds(result.hold_ids)
+
+    if result.freed_ids:
+        try:
+            NotificationService.notify_timeslots_available(result.freed_ids)
+        except Exception as e:
+            current_app.logger.error(f"Error triggering notifications: {str(e)}")
+
+    return jsonify(
+        {
+            "success": True,
+            "action": action,
+            "count": len(result.ids),
+            "ids": result.ids,
+            "skipped": sorted(set(selection.ids) - set(result.ids)),
+        }
+    )
+
+
 @bp.route("/admin/categories", methods=["POST"])
 @login_required
 def create_category():
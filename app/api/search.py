@@ -1,37 +1,54 @@
 from flask import Blueprint, request, jsonify
-from app.services.search_service import (
-    search_professionals, search_beauty_centers, search_sports_complexes
-)
+from app.services.search_cache import cached_search_page, cache_stats
+from app.services.read_replica import read_only
+from app.services.search_service import InvalidCursor, parse_near
 
 api_search = Blueprint("api_search", __name__, url_prefix="/api/v1/search")
 
-@api_search.get("/professionals")
-def api_professionals():
-    """Devuelve resultados JSON de profesionales según parámetros de búsqueda."""
+
+@read_only
+def _search_response(kind: str):
+    """Lee parámetros comunes y devuelve el sobre JSON paginado por cursor.
+
+    Parámetros: q, city, per_page, cursor (next_cursor de la página previa),
+    with_total=1 para incluir un total (exacto hasta un tope, luego estimado) y
+    near=lat,lng con radius_km opcional para ordenar por distancia.
+    El parámetro `page` de la paginación por offset ya no existe: se ignora
+    (sin cursor siempre se devuelve la primera página).
+    """
     q = request.args.get("q", "", type=str)
     city = request.args.get("city", type=str)
-    page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 20, type=int)
-    items = search_professionals(q, city, page, per_page)
-    return jsonify([{ "id": r.id, "name": r.name, "slug": r.slug, "city": r.city, "specialties": r.specialties } for r in items])
+    cursor = request.args.get("cursor", type=str)
+    with_total = request.args.get("with_total", "") in ("1", "true", "yes")
+    try:
+        near = parse_near(request.args.get("near", type=str), request.args.get("radius_km", type=str))
+    except ValueError:
+        return jsonify({"error": "Parámetros near/radius_km inválidos"}), 400
+    try:
+        return jsonify(cached_search_page(kind, q, city, per_page, cursor, with_total, near))
+    except InvalidCursor:
+        return jsonify({"error": "Cursor inválido"}), 400
+
+@api_search.get("/professionals")
+def api_professionals():
+    """Devuelve resultados JSON de profesionales según parámetros de búsqueda."""
+    return _search_response("professionals")
 
 @api_search.get("/beauty-centers")
 def api_beauty_centers():
     """Devuelve resultados JSON de centros de estética según parámetros."""
-    q = request.args.get("q", "", type=str)
-    city = request.args.get("city", type=str)
-    page = request.args.get("page", 1, type=int)
-    per_page = request.args.get("per_page", 20, type=int)
-    items = search_beauty_centers(q, city, page, per_page)
-    return jsonify([{ "id": r.id, "name": r.name, "slug": r.slug, "city": r.city, "services": r.services } for r in items])
+    return _search_response("beauty_centers")
 
 @api_search.get("/sports-complexes")
 def api_sports_complexes():
     """Devuelve resultados JSON de complejos deportivos según parámetros."""
-    q = request.args.get("q", "", type=str)
-    city = request.args.get("city", type=str)
-    page = request.args.get("page", 1, type=int)
-    per_page = request.args.get("per_page", 20, type=int)
-    items = search_sports_complexes(q, city, page, per_page)
-    return jsonify([{ "id": r.id, "name": r.name, "slug": r.slug, "city": r.city, "sports": r.sports } for r in items])
+    return _search_response("sports_complexes")
 
+@api_search.get("/cache-stats")
+def api_cache_stats():
+    """Devuelve contadores de aciertos/fallos de la caché de búsqueda."""
+    try:
+        return jsonify(cache_stats())
+    except Exception:
+        return jsonify({"error": "Cache no disponible"}), 503
@@ -3,17 +3,21 @@ from app.main import bp
 from app.models import Category, Complex, Timeslot, Field, Service
 from app.models_catalog import BeautyCenter, Professional
 from app.utils import validate_category, clean_text
+from app.services.landing_stats import category_counts
+from app.services.read_replica import read_only
 from app import db
 from datetime import datetime, timedelta
 import re
 
 @bp.route('/')
+@read_only
 def index():
     """Homepage with three category cards"""
     categories = Category.query.filter_by(is_active=True).all()
-    return render_template('main/index.html', categories=categories)
+    return render_template('main/index.html', categories=categories, free_today=category_counts())
 
 @bp.route('/<category>')
+@read_only
 def category_page(category):
     """Category landing pages with allow-list validation"""
     if not validate_category(category):
@@ -25,7 +29,8 @@ def category_page(category):
         flash('Categoría no encontrada.', 'error')
         return redirect(url_for('main.index'))
     
-    return render_template('main/category.html', category=category_obj)
+    free_today = category_counts().get(category_obj.slug, 0)
+    return render_template('main/category.html', category=category_obj, free_today=free_today)
 
 @bp.route('/complejos/<slug>')
 def complex_detail(slug):
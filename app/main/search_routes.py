@@ -1,37 +1,56 @@
 from flask import Blueprint, request, render_template
-from app.services.search_service import (
-    search_professionals, search_beauty_centers, search_sports_complexes
-)
+from app.services.search_cache import cached_search
+from app.services.read_replica import read_only
+from app.services.search_service import parse_near
 
 search_bp = Blueprint("search", __name__, url_prefix="/buscar")
 
+
+def _near_args():
+    """Lee near=lat,lng y radius_km; valores inválidos se ignoran (búsqueda normal)."""
+    near_raw = request.args.get("near", "", type=str)
+    radius_raw = request.args.get("radius_km", "", type=str)
+    try:
+        return parse_near(near_raw, radius_raw), near_raw, radius_raw
+    except ValueError:
+        return None, "", ""
+
 @search_bp.get("/profesionales")
+@read_only
 def profesionales():
     """Lee parámetros, busca profesionales y renderiza resultados HTML."""
     q = request.args.get("q", "", type=str)
     city = request.args.get("city", type=str)
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 20, type=int)
-    results = search_professionals(q, city, page, per_page)
-    return render_template("search/profesionales.html", results=results, q=q, city=city, page=page)
+    near, near_raw, radius_raw = _near_args()
+    results = cached_search("professionals", q, city, page, per_page, near)
+    return render_template("search/profesionales.html", results=results, q=q, city=city, page=page,
+                           near=near_raw, radius_km=radius_raw)
 
 @search_bp.get("/centros-estetica")
+@read_only
 def centros():
     """Lee parámetros, busca centros de estética y renderiza resultados HTML."""
     q = request.args.get("q", "", type=str)
     city = request.args.get("city", type=str)
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 20, type=int)
-    results = search_beauty_centers(q, city, page, per_page)
-    return render_template("search/centros.html", results=results, q=q, city=city, page=page)
+    near, near_raw, radius_raw = _near_args()
+    results = cached_search("beauty_centers", q, city, page, per_page, near)
+    return render_template("search/centros.html", results=results, q=q, city=city, page=page,
+                           near=near_raw, radius_km=radius_raw)
 
 @search_bp.get("/complejos-deportivos")
+@read_only
 def complejos():
     """Lee parámetros, busca complejos deportivos y renderiza resultados HTML."""
     q = request.args.get("q", "", type=str)
     city = request.args.get("city", type=str)
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 20, type=int)
-    results = search_sports_complexes(q, city, page, per_page)
-    return render_template("search/complejos.html", results=results, q=q, city=city, page=page)
+    near, near_raw, radius_raw = _near_args()
+    results = cached_search("sports_complexes", q, city, page, per_page, near)
+    return render_template("search/complejos.html", results=results, q=q, city=city, page=page,
+                           near=near_raw, radius_km=radius_raw)
 
@@ -1,5 +1,5 @@
 from app import db
-from app.models_catalog import Professional, BeautyCenter
+from app.models_catalog import Professional, BeautyCenter, earth_index
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timezone
@@ -88,6 +88,9 @@ class Complex(db.Model):
     slug = db.Column(db.String(200), unique=True, nullable=False, index=True)
     city = db.Column(db.String(100), nullable=False, default='')
     address = db.Column(db.Text)
+    # Ubicación opcional (grados WGS84) para búsquedas por cercanía
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
     contact_email = db.Column(db.String(120))
     contact_phone = db.Column(db.String(50))
     email = db.synonym('contact_email')
@@ -113,6 +116,9 @@ def complex_set_default_slug(mapper, connection, target: 'Complex') -> None:
         target.slug = slugify(target.name)
 
 
+earth_index('ix_complexes_earth', Complex)
+
+
 class ComplexPhoto(db.Model):
     __tablename__ = 'complex_photos'
 
@@ -256,6 +262,9 @@ class Timeslot(db.Model):
     beauty_center = db.relationship('BeautyCenter')
     professional = db.relationship('Professional')
     subscriptions = db.relationship('Subscription', back_populates='timeslot')
+
+    # Los slots calculados de plantillas virtuales (services.virtual_slots) lo ponen en True
+    is_virtual = False
     
     # Indexes
     __table_args__ = (
@@ -264,11 +273,150 @@ class Timeslot(db.Model):
         Index('ix_timeslot_service_id', 'service_id'),
         Index('ix_timeslot_beauty_center_id', 'beauty_center_id'),
         Index('ix_timeslot_professional_id', 'professional_id'),
+        # Listados públicos de turnos libres (status = available, start > now, ORDER BY start):
+        # índices parciales solo con los disponibles, por entidad y con las columnas que muestra la fila.
+        # Solo PostgreSQL (INCLUDE); en otros motores alcanzan los índices de arriba.
+        Index('ix_timeslot_available_start', 'start',
+              postgresql_where=(status == TimeslotStatus.AVAILABLE),
+              postgresql_include=['end', 'price']).ddl_if(dialect='postgresql'),
+        Index('ix_timeslot_available_field_start', 'field_id', 'start',
+              postgresql_where=(status == TimeslotStatus.AVAILABLE),
+              postgresql_include=['end', 'price']).ddl_if(dialect='postgresql'),
+        Index('ix_timeslot_available_service_start', 'service_id', 'start',
+              postgresql_where=(status == TimeslotStatus.AVAILABLE),
+              postgresql_include=['end', 'price']).ddl_if(dialect='postgresql'),
+        Index('ix_timeslot_available_professional_start', 'professional_id', 'start',
+              postgresql_where=(status == TimeslotStatus.AVAILABLE),
+              postgresql_include=['end', 'service_id']).ddl_if(dialect='postgresql'),
+        Index('ix_timeslot_available_center_start', 'beauty_center_id', 'start',
+              postgresql_where=(status == TimeslotStatus.AVAILABLE),
+              postgresql_include=['end', 'professional_id', 'service_id']).ddl_if(dialect='postgresql'),
     )
     
     def __repr__(self):
         return f'<Timeslot {self.start} - {self.status.value}>'
 
+class AvailabilityDaily(db.Model):
+    """Resumen diario (UTC) de slots por entidad dueña, mantenido desde services.availability_daily.
+
+    Cada slot cuenta una sola vez, en su dueño: la cancha; si no, el centro (el
+    staff que atiende en un centro suma al centro); si no, el profesional; si
+    no, el servicio suelto. Es la misma regla que usan las landings.
+    """
+    __tablename__ = 'availability_daily'
+
+    entity_type = db.Column(db.String(20), primary_key=True)  # field | beauty_center | professional | service
+    entity_id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    available_count = db.Column(db.Integer, nullable=False, default=0)
+    holding_count = db.Column(db.Integer, nullable=False, default=0)
+    reserved_count = db.Column(db.Integer, nullable=False, default=0)
+    first_free_start = db.Column(db.DateTime(timezone=True), nullable=True)
+    last_free_start = db.Column(db.DateTime(timezone=True), nullable=True)
+    updated_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index('ix_availability_daily_date_type', 'date', 'entity_type'),
+    )
+
+    def __repr__(self):
+        return f'<AvailabilityDaily {self.entity_type}:{self.entity_id} {self.date}>'
+
+class LandingStat(db.Model):
+    """Turnos libres futuros por categoría, entidad y día UTC para las landings (ver services.landing_stats).
+
+    Tabla resumen reconstruida por un job cada minuto; no se mantiene en línea.
+    """
+    __tablename__ = 'landing_stats'
+
+    date = db.Column(db.Date, primary_key=True)
+    category_slug = db.Column(db.String(50), primary_key=True)
+    entity_type = db.Column(db.String(20), primary_key=True)  # complex | beauty_center | professional | service
+    entity_id = db.Column(db.Integer, primary_key=True)
+    city = db.Column(db.String(100), nullable=False, default='')
+    available_count = db.Column(db.Integer, nullable=False, default=0)
+    first_free_start = db.Column(db.DateTime(timezone=True), nullable=True)
+    updated_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index('ix_landing_stats_category_city_date', 'category_slug', 'city', 'date'),
+    )
+
+    def __repr__(self):
+        return f'<LandingStat {self.category_slug} {self.entity_type}:{self.entity_id} {self.date}>'
+
+class TimeslotArchive(db.Model):
+    """Turnos pasados movidos fuera de `timeslots` (ver services.timeslot_archive).
+
+    En PostgreSQL la tabla está particionada por mes sobre `start`; la clave
+    primaria incluye `start` porque toda restricción única de una tabla
+    particionada debe contener la clave de partición. Sin claves foráneas: el
+    histórico no bloquea bajas de canchas o servicios.
+    """
+    __tablename__ = 'timeslots_archive'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    start = db.Column(db.DateTime(timezone=True), primary_key=True)
+    end = db.Column(db.DateTime(timezone=True), nullable=False)
+    field_id = db.Column(db.Integer, nullable=True)
+    service_id = db.Column(db.Integer, nullable=True)
+    beauty_center_id = db.Column(db.Integer, nullable=True)
+    professional_id = db.Column(db.Integer, nullable=True)
+    price = db.Column(db.Numeric(10, 2))
+    currency = db.Column(db.String(3))
+    status = db.Column(db.Enum(TimeslotStatus), nullable=False)
+    reservation_code = db.Column(db.String(50))
+    created_at = db.Column(db.DateTime(timezone=True))
+    archived_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index('ix_timeslots_archive_field_start', 'field_id', 'start'),
+        {'postgresql_partition_by': 'RANGE (start)'},
+    )
+
+    def __repr__(self):
+        return f'<TimeslotArchive {self.id} {self.start}>'
+
+class Schedule(db.Model):
+    """Plantilla semanal de turnos de una cancha, profesional o centro (ver services.schedules).
+
+    Los horarios se interpretan en UTC, como en la generación masiva.
+    """
+    __tablename__ = 'schedules'
+
+    id = db.Column(db.Integer, primary_key=True)
+    field_id = db.Column(db.Integer, db.ForeignKey('fields.id'), nullable=True, index=True)
+    professional_id = db.Column(db.Integer, db.ForeignKey('professionals.id'), nullable=True, index=True)
+    beauty_center_id = db.Column(db.Integer, db.ForeignKey('beauty_centers.id'), nullable=True, index=True)
+    service_id = db.Column(db.Integer, db.ForeignKey('services.id'), nullable=True)
+    weekdays = db.Column(db.String(20), nullable=False, default='0,1,2,3,4')  # 0=lunes, separados por coma
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
+    duration_min = db.Column(db.Integer, nullable=False)
+    interval_min = db.Column(db.Integer, nullable=True)  # None = igual a la duración
+    price = db.Column(db.Numeric(10, 2))
+    currency = db.Column(db.String(3), default='ARS')
+    valid_from = db.Column(db.Date, nullable=False)
+    valid_until = db.Column(db.Date, nullable=True)  # None = sin fin
+    # materialized: el materializador escribe los turnos libres; virtual: se calculan al vuelo
+    mode = db.Column(db.String(20), nullable=False, default='materialized', server_default='materialized')
+    # Último día ya volcado a timeslots por el materializador
+    materialized_until = db.Column(db.Date, nullable=True)
+    is_active = db.Column(db.Boolean, nullable=False, default=True)
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    field = db.relationship('Field')
+    professional = db.relationship('Professional')
+    beauty_center = db.relationship('BeautyCenter')
+    service = db.relationship('Service')
+
+    @property
+    def weekday_set(self) -> set[int]:
+        return {int(w) for w in (self.weekdays or '').split(',') if w.strip()}
+
+    def __repr__(self):
+        return f'<Schedule {self.id} {self.weekdays} {self.start_time}-{self.end_time}>'
+
 class Subscription(db.Model):
     __tablename__ = 'subscriptions'
     
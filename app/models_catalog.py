@@ -1,6 +1,6 @@
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import TSVECTOR
-from sqlalchemy import text
+from sqlalchemy import text, func, event, DDL
 from sqlalchemy.types import TypeDecorator, TEXT
 from app import db
 
@@ -27,6 +27,9 @@ class _CatalogBase:
     phone = db.Column(db.String(60))
     website = db.Column(db.String(200))
     is_active = db.Column(db.Boolean, nullable=False, default=True)
+    # Ubicación opcional para búsquedas "cerca de mí" (grados WGS84)
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime,
@@ -38,6 +41,20 @@ class _CatalogBase:
     search_vector = db.Column(TSVectorCompat())
 
 
+# Búsqueda geográfica (PostgreSQL): cube + earthdistance. El índice GiST sobre
+# ll_to_earth(lat, lng) habilita earth_box() y el orden KNN con el operador <->.
+event.listen(
+    db.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS cube; CREATE EXTENSION IF NOT EXISTS earthdistance").execute_if(dialect="postgresql"),
+)
+
+
+def earth_index(name: str, model):
+    """Índice GiST sobre ll_to_earth(latitude, longitude), solo en PostgreSQL."""
+    return db.Index(name, func.ll_to_earth(model.latitude, model.longitude), postgresql_using="gist").ddl_if(dialect="postgresql")
+
+
 professional_services = db.Table(
     "professional_services",
     db.Column("professional_id", db.Integer, db.ForeignKey("professionals.id"), primary_key=True),
@@ -78,6 +95,7 @@ class Professional(db.Model, _CatalogBase):
 # Índices
 db.Index("ix_professionals_search_vector", Professional.search_vector, postgresql_using="gin")
 db.Index("ix_professionals_name_ci", text("lower(name)"))
+earth_index("ix_professionals_earth", Professional)
 
 
 class BeautyCenter(db.Model, _CatalogBase):
@@ -96,6 +114,7 @@ class BeautyCenter(db.Model, _CatalogBase):
 
 db.Index("ix_beauty_centers_search_vector", BeautyCenter.search_vector, postgresql_using="gin")
 db.Index("ix_beauty_centers_name_ci", text("lower(name)"))
+earth_index("ix_beauty_centers_earth", BeautyCenter)
 
 
 # Relaciones adicionales declarativas entre Professional y BeautyCenter
@@ -125,6 +144,7 @@ class SportsComplex(db.Model, _CatalogBase):
 
 db.Index("ix_sports_complexes_search_vector", SportsComplex.search_vector, postgresql_using="gin")
 db.Index("ix_sports_complexes_name_ci", text("lower(name)"))
+earth_index("ix_sports_complexes_earth", SportsComplex)
 
 
 class DailyAvailability(db.Model):
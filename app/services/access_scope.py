@@ -0,0 +1,240 @@
+"""Alcance de administración del usuario actual (entidades que puede gestionar).
+
+Un admin no superadmin gestiona los complejos (user_complexes), profesionales
+(user_professionals) y centros de estética (user_beauty_centers) a los que
+está vinculado. Los ids se resuelven con una sola consulta (UNION ALL de las
+tres tablas de vínculo) y se guardan por usuario en Redis junto con el flag de
+superadmin (PERMISSION_CACHE_TTL, 0 desactiva); las vistas de gestión de
+usuarios invalidan la entrada al cambiar vínculos, categoría o rol. Si Redis
+no responde se consulta la base.
+
+Dentro de la request el alcance se memoriza en `g`; las listas de entidades
+también se cargan una sola vez por request. `create_app` descarta lo
+memorizado al comenzar cada request (`g` puede sobrevivir entre requests si
+el contexto de aplicación ya estaba activo, p. ej. en tests).
+
+Las vistas que cambian vínculos o crean entidades dentro de la misma request
+deben llamar a `reset_scope()` antes de volver a consultarlo.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+
+from flask import current_app, g
+from flask_login import current_user
+from sqlalchemy import literal, select, union_all
+
+from app import db
+from app.models import AppUser, Complex, Field, UserComplex, user_beauty_centers, user_professionals
+from app.models_catalog import BeautyCenter, Professional
+
+# kind -> modelo de la entidad
+SCOPE_MODELS = {
+    "complex": Complex,
+    "professional": Professional,
+    "beauty_center": BeautyCenter,
+}
+
+PERMISSION_PREFIX = "perm:user"
+# Versión de permisos por usuario: se incrementa en cada invalidación y la usan
+# los principals de sesión (ver session_user) para saber cuándo recargarse.
+VERSION_PREFIX = "perm:ver"
+VERSION_TTL = 24 * 3600
+# Datos de identidad del principal de sesión (email, nombre, categoría, rol)
+PRINCIPAL_PREFIX = "perm:principal"
+
+_G_SCOPE = "_access_scope"
+_G_ENTITIES = "_access_scope_entities"
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    user_id: int | None
+    is_superadmin: bool
+    complex_ids: frozenset[int] = frozenset()
+    professional_ids: frozenset[int] = frozenset()
+    beauty_center_ids: frozenset[int] = frozenset()
+
+    def ids(self, kind: str) -> frozenset[int]:
+        return getattr(self, f"{kind}_ids")
+
+    def can_manage(self, kind: str, entity_id: int | None) -> bool:
+        if not entity_id:
+            return False
+        return self.is_superadmin or entity_id in self.ids(kind)
+
+
+def _links_stmt(user_id: int):
+    """(kind, entity_id) de todos los vínculos del usuario en una consulta."""
+    return union_all(
+        select(literal("complex").label("kind"), UserComplex.complex_id.label("entity_id"))
+        .where(UserComplex.user_id == user_id),
+        select(literal("professional"), user_professionals.c.professional_id)
+        .where(user_professionals.c.user_id == user_id),
+        select(literal("beauty_center"), user_beauty_centers.c.beauty_center_id)
+        .where(user_beauty_centers.c.user_id == user_id),
+    )
+
+
+def load_scope(user_id: int | None, is_superadmin: bool = False) -> AccessScope:
+    """Consulta el alcance de un usuario en la base (sin caché)."""
+    if not user_id:
+        return AccessScope(user_id=None, is_superadmin=False)
+    if is_superadmin:
+        return AccessScope(user_id=user_id, is_superadmin=True)
+    ids: dict[str, set[int]] = {kind: set() for kind in SCOPE_MODELS}
+    for kind, entity_id in db.session.execute(_links_stmt(user_id)):
+        ids[kind].add(entity_id)
+    return AccessScope(
+        user_id=user_id,
+        is_superadmin=False,
+        complex_ids=frozenset(ids["complex"]),
+        professional_ids=frozenset(ids["professional"]),
+        beauty_center_ids=frozenset(ids["beauty_center"]),
+    )
+
+
+def permission_key(user_id: int) -> str:
+    return f"{PERMISSION_PREFIX}:{user_id}"
+
+
+def version_key(user_id: int) -> str:
+    return f"{VERSION_PREFIX}:{user_id}"
+
+
+def principal_key(user_id: int) -> str:
+    return f"{PRINCIPAL_PREFIX}:{user_id}"
+
+
+def scope_payload(scope: AccessScope) -> dict:
+    """Representación serializable (JSON) del alcance."""
+    return {
+        "superadmin": scope.is_superadmin,
+        **{kind: sorted(scope.ids(kind)) for kind in SCOPE_MODELS},
+    }
+
+
+def scope_from_payload(user_id: int, data: dict) -> AccessScope:
+    return AccessScope(
+        user_id=user_id,
+        is_superadmin=bool(data["superadmin"]),
+        complex_ids=frozenset(data["complex"]),
+        professional_ids=frozenset(data["professional"]),
+        beauty_center_ids=frozenset(data["beauty_center"]),
+    )
+
+
+def user_scope(user_id: int | None, is_superadmin: bool | None = None) -> AccessScope:
+    """Alcance de un usuario desde Redis o, si no está, desde la base (y lo guarda).
+
+    `is_superadmin` evita consultar AppUser cuando el llamador ya lo conoce.
+    """
+    if not user_id:
+        return AccessScope(user_id=None, is_superadmin=False)
+    ttl = int(current_app.config.get("PERMISSION_CACHE_TTL", 0) or 0)
+    key = permission_key(user_id)
+    if ttl > 0:
+        try:
+            cached = current_app.redis.get(key)
+            if cached is not None:
+                return scope_from_payload(user_id, json.loads(cached))
+        except Exception as _e:
+            current_app.logger.warning(f"Permission cache read failed: {_e}")
+            ttl = 0
+
+    if is_superadmin is None:
+        flag = db.session.execute(select(AppUser.is_superadmin).where(AppUser.id == user_id)).scalar()
+        if flag is None:
+            return AccessScope(user_id=None, is_superadmin=False)
+        is_superadmin = bool(flag)
+    scope = load_scope(user_id, is_superadmin)
+    if ttl > 0:
+        try:
+            current_app.redis.setex(key, ttl, json.dumps(scope_payload(scope)))
+        except Exception as _e:
+            current_app.logger.warning(f"Permission cache write failed: {_e}")
+    return scope
+
+
+def invalidate_user_scope(user_id: int | None) -> None:
+    """Descarta el alcance cacheado de un usuario (tras cambiar vínculos, categoría o rol).
+
+    También incrementa su versión de permisos, forzando a sus sesiones a recargarse.
+    """
+    if not user_id:
+        return
+    try:
+        pipe = current_app.redis.pipeline()
+        pipe.delete(permission_key(user_id), principal_key(user_id))
+        pipe.incr(version_key(user_id))
+        pipe.expire(version_key(user_id), VERSION_TTL)
+        pipe.execute()
+    except Exception as _e:
+        current_app.logger.warning(f"Permission cache invalidation failed: {_e}")
+    scope = g.get(_G_SCOPE)
+    if scope is not None and scope.user_id == user_id:
+        reset_scope()
+
+
+def current_scope() -> AccessScope:
+    """Alcance de `current_user`, resuelto una vez por request."""
+    scope = g.get(_G_SCOPE)
+    user_id = getattr(current_user, "id", None)
+    if scope is None or scope.user_id != user_id:
+        # El principal de sesión ya resolvió su alcance en esta request
+        scope = getattr(current_user, "scope", None)
+        if not isinstance(scope, AccessScope) or scope.user_id != user_id:
+            scope = user_scope(user_id, bool(getattr(current_user, "is_superadmin", False)))
+        setattr(g, _G_SCOPE, scope)
+        setattr(g, _G_ENTITIES, {})
+    return scope
+
+
+def reset_scope() -> None:
+    """Descarta el alcance memorizado en la request (tras cambiar vínculos)."""
+    g.pop(_G_SCOPE, None)
+    g.pop(_G_ENTITIES, None)
+
+
+def can_manage(kind: str, entity_id: int | None) -> bool:
+    """True si el usuario actual puede gestionar la entidad (superadmin: todas)."""
+    return current_scope().can_manage(kind, entity_id)
+
+
+def accessible(kind: str) -> list:
+    """Entidades de `kind` que gestiona el usuario actual, ordenadas por nombre."""
+    scope = current_scope()
+    cache = g.get(_G_ENTITIES)
+    if kind not in cache:
+        model = SCOPE_MODELS[kind]
+        query = model.query.order_by(model.name)
+        if not scope.is_superadmin:
+            ids = scope.ids(kind)
+            query = query.filter(model.id.in_(ids)) if ids else None
+        cache[kind] = query.all() if query is not None else []
+    return cache[kind]
+
+
+def accessible_complexes() -> list[Complex]:
+    return accessible("complex")
+
+
+def accessible_professionals() -> list[Professional]:
+    return accessible("professional")
+
+
+def accessible_beauty_centers() -> list[BeautyCenter]:
+    return accessible("beauty_center")
+
+
+def accessible_fields() -> list[Field]:
+    """Canchas de los complejos que gestiona el usuario actual, ordenadas por nombre."""
+    scope = current_scope()
+    cache = g.get(_G_ENTITIES)
+    if "field" not in cache:
+        query = Field.query.order_by(Field.name)
+        if not scope.is_superadmin:
+            query = query.filter(Field.complex_id.in_(scope.complex_ids)) if scope.complex_ids else None
+        cache["field"] = query.all() if query is not None else []
+    return cache["field"]
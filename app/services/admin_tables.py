@@ -0,0 +1,115 @@
+"""Listados de administración paginados por cursor (keyset) y con búsqueda.
+
+Cada tabla ordena por una columna de texto no nula más el id, filtra con
+LIKE sin distinguir mayúsculas sobre sus columnas de búsqueda y precarga las
+relaciones que muestra su parcial (sin N+1 al renderizar). Los cursores usan
+el mismo formato opaco que la búsqueda pública (search_service).
+
+`entity_options` alimenta los selects con búsqueda remota: devuelve como
+máximo OPTIONS_LIMIT entidades por consulta, más la seleccionada si no está.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import joinedload, selectinload
+
+from app import db
+from app.models import AppUser, Category, Complex, Service
+from app.models_catalog import BeautyCenter, Professional
+from app.services.search_service import InvalidCursor, decode_cursor, encode_cursor
+
+ADMIN_PAGE_SIZE_DEFAULT = 25
+ADMIN_PAGE_SIZE_MAX = 100
+OPTIONS_LIMIT = 20
+
+
+@dataclass(frozen=True)
+class AdminTable:
+    model: type
+    sort: str
+    search: tuple[str, ...]
+    eager: tuple = field(default=())
+
+
+ADMIN_TABLES = {
+    "professionals": AdminTable(
+        Professional, "name", ("name", "city", "slug"),
+        (joinedload(Professional.category), selectinload(Professional.linked_services)),
+    ),
+    "beauty_centers": AdminTable(
+        BeautyCenter, "name", ("name", "city", "slug"),
+        (joinedload(BeautyCenter.category), selectinload(BeautyCenter.linked_services)),
+    ),
+    "complexes": AdminTable(
+        Complex, "name", ("name", "city", "slug"),
+        (selectinload(Complex.categories), selectinload(Complex.fields), selectinload(Complex.users)),
+    ),
+    "users": AdminTable(
+        AppUser, "email", ("email", "name"),
+        (joinedload(AppUser.category), selectinload(AppUser.complexes)),
+    ),
+    "categories": AdminTable(Category, "title", ("title", "slug"), (selectinload(Category.services),)),
+    "services": AdminTable(Service, "name", ("name",), (joinedload(Service.category),)),
+}
+
+# kind de los selects de vínculo usuario-entidad -> modelo
+OPTION_MODELS = {
+    "complex": Complex,
+    "beauty": BeautyCenter,
+    "professional": Professional,
+}
+
+
+def clamp_page_size(per_page: int | None) -> int:
+    return min(max(int(per_page or ADMIN_PAGE_SIZE_DEFAULT), 1), ADMIN_PAGE_SIZE_MAX)
+
+
+def _search_filter(model, columns, q: str):
+    pattern = f"%{q.lower()}%"
+    return or_(*(func.lower(getattr(model, c)).like(pattern) for c in columns))
+
+
+def admin_page(kind: str, q: str = "", cursor: str | None = None, per_page: int | None = None):
+    """Una página de la tabla `kind`: (filas, next_cursor); next_cursor=None en la última.
+
+    Un cursor inválido reinicia en la primera página.
+    """
+    table = ADMIN_TABLES[kind]
+    model = table.model
+    sort_col = getattr(model, table.sort)
+    per_page = clamp_page_size(per_page)
+
+    stmt = select(model).options(*table.eager).order_by(sort_col, model.id)
+    q = (q or "").strip()
+    if q:
+        stmt = stmt.where(_search_filter(model, table.search, q))
+    if cursor:
+        try:
+            last_value, last_id = decode_cursor(cursor, 2)
+            stmt = stmt.where(or_(sort_col > last_value, and_(sort_col == last_value, model.id > last_id)))
+        except InvalidCursor:
+            pass
+
+    rows = db.session.execute(stmt.limit(per_page + 1)).unique().scalars().all()
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor([getattr(rows[-1], table.sort), rows[-1].id])
+    return rows, next_cursor
+
+
+def entity_options(kind: str, q: str = "", selected_id: int | None = None, limit: int = OPTIONS_LIMIT) -> list:
+    """Entidades para un select de vínculo (por nombre), filtradas por `q`."""
+    model = OPTION_MODELS[kind]
+    stmt = select(model).order_by(model.name, model.id).limit(limit)
+    q = (q or "").strip()
+    if q:
+        stmt = stmt.where(_search_filter(model, ("name", "slug", "city"), q))
+    items = list(db.session.execute(stmt).scalars())
+    if selected_id and all(it.id != selected_id for it in items):
+        selected = db.session.get(model, selected_id)
+        if selected is not None:
+            items.insert(0, selected)
+    return items
@@ -0,0 +1,158 @@
+"""Álgebra de intervalos para cálculo de disponibilidad.
+
+Los intervalos son semiabiertos [inicio, fin) en minutos enteros desde el epoch
+UTC, lo que permite operar horizontes largos sin objetos datetime.
+Operaciones: merge, subtract (regla de una plantilla menos los slots
+guardados, ver services.schedules) y fit_starts (inicios donde entra una
+duración D avanzando de a S minutos). Con NumPy instalado se usan versiones
+vectorizadas; sin NumPy, implementaciones puras equivalentes.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from functools import reduce
+from math import gcd
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+Interval = tuple[int, int]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+# --- Conversión datetime <-> minutos ---------------------------------------------
+
+def to_minutes(dt: datetime) -> int:
+    """Minutos desde el epoch UTC (datetimes naive se asumen UTC)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int((dt - _EPOCH).total_seconds() // 60)
+
+
+def from_minutes(minutes: int) -> datetime:
+    """Inverso de `to_minutes`: datetime aware en UTC."""
+    return _EPOCH + timedelta(minutes=int(minutes))
+
+
+def slot_intervals(slots) -> list[Interval]:
+    """Convierte filas con `.start`/`.end` en intervalos de minutos."""
+    return [(to_minutes(s.start), to_minutes(s.end)) for s in slots]
+
+
+def infer_step(intervals: Iterable[Interval]) -> int:
+    """Paso de la grilla: MCD de las duraciones (1 si no hay intervalos)."""
+    lengths = [end - start for start, end in intervals if end > start]
+    return reduce(gcd, lengths) if lengths else 1
+
+
+# --- Operaciones --------------------------------------------------------------------
+
+def merge(intervals: Iterable[Interval]) -> list[Interval]:
+    """Ordena y une intervalos solapados o contiguos; descarta los vacíos."""
+    pairs = [(int(s), int(e)) for s, e in intervals if e > s]
+    if not pairs:
+        return []
+    if np is not None:
+        return _merge_np(pairs)
+    pairs.sort()
+    merged = [pairs[0]]
+    for start, end in pairs[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end:
+            if end > last_end:
+                merged[-1] = (last_start, end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract(base: Iterable[Interval], minus: Iterable[Interval]) -> list[Interval]:
+    """Tramos de `base` no cubiertos por `minus` (p. ej. horario - reservas)."""
+    a, b = merge(base), merge(minus)
+    if not a or not b:
+        return a
+    if np is not None:
+        # Peso 1 para `base` y len(a)+1 para `minus`: cobertura 1 = solo base
+        return _sweep_np([(a, 1), (b, len(a) + 1)], lambda cov: cov == 1)
+    result: list[Interval] = []
+    j = 0
+    for start, end in a:
+        cursor = start
+        while j < len(b) and b[j][1] <= cursor:
+            j += 1
+        k = j
+        while k < len(b) and b[k][0] < end:
+            if b[k][0] > cursor:
+                result.append((cursor, b[k][0]))
+            cursor = max(cursor, b[k][1])
+            k += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def fit_starts(intervals: Iterable[Interval], duration: int, step: int) -> list[int]:
+    """Inicios s = inicio + k*step de cada ventana unida tal que s + duration <= fin."""
+    if duration <= 0 or step <= 0:
+        return []
+    windows = merge(intervals)
+    if np is not None and windows:
+        arr = np.asarray(windows, dtype=np.int64)
+        counts = (arr[:, 1] - arr[:, 0] - duration) // step + 1
+        counts = np.maximum(counts, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return []
+        firsts = np.repeat(arr[:, 0], counts)
+        offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        return (firsts + offsets * step).tolist()
+    starts: list[int] = []
+    for start, end in windows:
+        starts.extend(range(start, end - duration + 1, step))
+    return starts
+
+
+def available_starts(slots, duration_min: int, step_min: int | None = None) -> list[datetime]:
+    """Inicios (datetime UTC) donde entra `duration_min` sobre los slots libres dados.
+
+    Sin `step_min` el paso se infiere de la grilla de los slots.
+    """
+    intervals = slot_intervals(slots)
+    step = step_min or infer_step(intervals)
+    return [from_minutes(m) for m in fit_starts(intervals, duration_min, step)]
+
+
+# --- Implementaciones internas ------------------------------------------------------
+
+def _merge_np(pairs: list[Interval]) -> list[Interval]:
+    arr = np.asarray(pairs, dtype=np.int64)
+    arr = arr[np.lexsort((arr[:, 1], arr[:, 0]))]
+    reach = np.maximum.accumulate(arr[:, 1])
+    # Nueva ventana cuando el inicio supera todo lo cubierto hasta la fila anterior
+    new_group = np.empty(len(arr), dtype=bool)
+    new_group[0] = True
+    new_group[1:] = arr[1:, 0] > reach[:-1]
+    first = np.flatnonzero(new_group)
+    last = np.append(first[1:] - 1, len(arr) - 1)
+    return list(zip(arr[first, 0].tolist(), reach[last].tolist()))
+
+
+def _sweep_np(weighted: list[tuple[list[Interval], int]], keep) -> list[Interval]:
+    """Barrido por eventos: conserva los tramos cuya cobertura ponderada cumple `keep`."""
+    points, deltas = [], []
+    for intervals, weight in weighted:
+        arr = np.asarray(intervals, dtype=np.int64)
+        points.extend((arr[:, 0], arr[:, 1]))
+        deltas.extend((np.full(len(arr), weight), np.full(len(arr), -weight)))
+    points = np.concatenate(points)
+    deltas = np.concatenate(deltas)
+    order = np.lexsort((deltas, points))
+    points, cover = points[order], np.cumsum(deltas[order])
+    mask = keep(cover[:-1]) & (points[1:] > points[:-1])
+    if not mask.any():
+        return []
+    return merge(zip(points[:-1][mask].tolist(), points[1:][mask].tolist()))
@@ -0,0 +1,151 @@
+"""Caché de disponibilidad pública en Redis.
+
+- Las entradas se guardan bajo generaciones por (entidad, día) y por entidad;
+  la clave de cada entrada incluye las generaciones de los días que cubre.
+- Al confirmar cambios sobre Timeslot (hold, confirm, release, altas, bajas) o
+  DailyAvailability se incrementan solo las generaciones de las entidades y
+  días afectados, invalidando sus entradas sin tocar el resto.
+- Las entradas además expiran por TTL (AVAILABILITY_CACHE_TTL, 0 desactiva).
+- Si Redis no responde se consulta la base directamente.
+
+Los cambios de configuración (staff de un centro, servicios vinculados) no
+invalidan: se reflejan al vencer el TTL.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import date, datetime, timezone
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models_catalog import DailyAvailability
+from app.services.timeslot_keys import Key, flushed_timeslot_keys
+from app.services.read_replica import primary
+
+GENERATION_PREFIX = "avail:gen"
+# Las generaciones deben durar más que cualquier entrada (TTL) para no reutilizar valores
+GENERATION_TTL = 14 * 24 * 3600
+
+_PENDING_KEYS = "availability_cache_keys"
+
+
+def generation_key(entity_type: str, entity_id: int, day: date | None = None) -> str:
+    """Clave Redis de la generación de una entidad (o de uno de sus días)."""
+    if day is None:
+        return f"{GENERATION_PREFIX}:{entity_type}:{entity_id}"
+    return f"{GENERATION_PREFIX}:{entity_type}:{entity_id}:{day.isoformat()}"
+
+
+def _generation_keys(entity_type: str, entity_id: int, days: list[date] | None) -> list[str]:
+    if days is None:
+        return [generation_key(entity_type, entity_id)]
+    return [generation_key(entity_type, entity_id, d) for d in days]
+
+
+def cached_availability(entity_type: str, entity_id: int, days: list[date] | None, params: tuple, loader):
+    """Devuelve `loader()` (serializable a JSON) desde la caché o lo calcula y guarda.
+
+    `days` son los días que cubre la respuesta; None para consultas sin fecha
+    (se invalidan ante cualquier cambio de la entidad).
+    """
+    ttl = int(current_app.config.get("AVAILABILITY_CACHE_TTL", 0) or 0)
+    if ttl <= 0:
+        return loader()
+
+    conn = current_app.redis
+    key = None
+    try:
+        generations = [int(g or 0) for g in conn.mget(_generation_keys(entity_type, entity_id, days))]
+        raw = json.dumps([list(params), generations, [d.isoformat() for d in days or []]], default=str)
+        key = f"avail:{entity_type}:{entity_id}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+        cached = conn.get(key)
+        if cached is not None:
+            return json.loads(cached)
+    except Exception as _e:
+        current_app.logger.warning(f"Availability cache read failed: {_e}")
+        key = None
+
+    if not key:
+        return loader()
+    # El resultado se comparte con todos: se calcula en el primario, nunca en la réplica atrasada
+    with primary():
+        result = loader()
+    try:
+        conn.setex(key, ttl, json.dumps(result, ensure_ascii=False))
+    except Exception as _e:
+        current_app.logger.warning(f"Availability cache write failed: {_e}")
+    return result
+
+
+def dump_starts(starts: list[datetime]) -> list[str]:
+    return [dt.isoformat() for dt in starts]
+
+
+def load_starts(values: list[str]) -> list[datetime]:
+    """Inverso de `dump_starts`; los valores sin zona horaria se asumen UTC."""
+    starts = [datetime.fromisoformat(v) for v in values]
+    return [dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc) for dt in starts]
+
+
+def invalidate(keys: set[Key]) -> None:
+    """Incrementa las generaciones de los (entidad, día) dados y de sus entidades."""
+    if not keys:
+        return
+    try:
+        pipe = current_app.redis.pipeline()
+        entities = set()
+        for entity_type, entity_id, day in keys:
+            entities.add((entity_type, entity_id))
+            gen_key = generation_key(entity_type, entity_id, day)
+            pipe.incr(gen_key)
+            pipe.expire(gen_key, GENERATION_TTL)
+        for entity_type, entity_id in entities:
+            gen_key = generation_key(entity_type, entity_id)
+            pipe.incr(gen_key)
+            pipe.expire(gen_key, GENERATION_TTL)
+        pipe.execute()
+    except Exception as _e:
+        current_app.logger.warning(f"Availability cache invalidation failed: {_e}")
+
+
+def mark_changed(session, keys: set[Key]) -> None:
+    """Registra cambios hechos fuera del ORM (SQL directo) para invalidar al confirmar."""
+    session.info.setdefault(_PENDING_KEYS, set()).update(keys)
+
+
+def pending_keys(session) -> set[Key]:
+    """Claves registradas en la transacción en curso (se invalidan al confirmar)."""
+    return set(session.info.get(_PENDING_KEYS, ()))
+
+
+def _daily_availability_keys(session) -> set[Key]:
+    keys: set[Key] = set()
+    for obj in session.new | session.dirty | session.deleted:
+        if isinstance(obj, DailyAvailability):
+            keys.add(("professional", obj.professional_id, obj.date))
+            previous = inspect(obj).attrs.date.history.deleted
+            keys.update(("professional", obj.professional_id, d) for d in previous or ())
+    return keys
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_on_flush(session, flush_context) -> None:
+    """Acumula las claves afectadas; se invalidan recién al confirmar."""
+    keys = flushed_timeslot_keys(session) | _daily_availability_keys(session)
+    if keys:
+        mark_changed(session, keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session) -> None:
+    keys = session.info.pop(_PENDING_KEYS, None)
+    if keys and has_app_context():
+        invalidate(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session) -> None:
+    session.info.pop(_PENDING_KEYS, None)
@@ -0,0 +1,190 @@
+"""Resumen diario de disponibilidad (`availability_daily`).
+
+Una fila por (entity_type, entity_id, date) con la cantidad de slots
+disponibles, en hold y reservados, y el primer/último inicio libre del día
+(UTC). Cada slot cuenta en su entidad dueña, con la precedencia de
+ENTITY_COLUMNS: cancha, centro (el staff que atiende en un centro suma al
+centro), profesional y servicio suelto, igual que las landings.
+
+Se mantiene con las mismas claves que invalida la caché de disponibilidad:
+las de los flush del ORM y las que registran con `mark_changed` las acciones
+masivas y el materializador. Antes de cada commit se recalculan solo esas
+claves, dentro de la misma transacción. Para lo que escribe SQL sin
+registrar claves, `rebuild_availability_daily` reconstruye una ventana.
+
+Lo leen las landings (días siguientes a hoy) y las vistas por rango, que
+consultan los slots solo en los días que el resumen marca con turnos libres.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import and_, delete, event, or_, select
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import AvailabilityDaily, Timeslot, TimeslotStatus
+from app.services.availability_cache import pending_keys
+from app.services.timeslot_keys import ENTITY_COLUMNS, Key
+
+_STATUS_COUNTS = {
+    TimeslotStatus.AVAILABLE: "available_count",
+    TimeslotStatus.HOLDING: "holding_count",
+    TimeslotStatus.RESERVED: "reserved_count",
+}
+
+
+def _utc_date(dt: datetime) -> date:
+    return (dt.astimezone(timezone.utc) if dt.tzinfo else dt).date()
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min).replace(tzinfo=timezone.utc)
+
+
+def owner_criteria(entity_type: str) -> list:
+    """Condiciones de Timeslot para que `entity_type` sea el dueño del slot (columnas previas vacías)."""
+    criteria = []
+    for other, column_name in ENTITY_COLUMNS.items():
+        if other == entity_type:
+            return criteria
+        criteria.append(getattr(Timeslot, column_name).is_(None))
+    raise ValueError(f"Tipo de entidad desconocido: {entity_type}")
+
+
+def _summaries(connection, keys: set[Key]) -> dict[Key, dict]:
+    """Agrega los slots de las claves pedidas (una consulta por tipo de entidad)."""
+    result: dict[Key, dict] = {}
+    for entity_type, column_name in ENTITY_COLUMNS.items():
+        wanted = {(eid, day) for etype, eid, day in keys if etype == entity_type}
+        if not wanted:
+            continue
+        column = getattr(Timeslot, column_name)
+        days = [day for _, day in wanted]
+        rows = connection.execute(
+            select(column, Timeslot.start, Timeslot.status).where(
+                column.in_({eid for eid, _ in wanted}),
+                *owner_criteria(entity_type),
+                Timeslot.start >= _day_start(min(days)),
+                Timeslot.start < _day_start(max(days) + timedelta(days=1)),
+            )
+        )
+        for entity_id, start, status in rows:
+            day = _utc_date(start)
+            if (entity_id, day) not in wanted:
+                continue
+            summary = result.setdefault((entity_type, entity_id, day), {
+                "available_count": 0, "holding_count": 0, "reserved_count": 0,
+                "first_free_start": None, "last_free_start": None,
+            })
+            counter = _STATUS_COUNTS.get(status)
+            if counter:
+                summary[counter] += 1
+            if status == TimeslotStatus.AVAILABLE:
+                if summary["first_free_start"] is None or start < summary["first_free_start"]:
+                    summary["first_free_start"] = start
+                if summary["last_free_start"] is None or start > summary["last_free_start"]:
+                    summary["last_free_start"] = start
+    return result
+
+
+def _upsert(connection, rows: list[dict]) -> None:
+    table = AvailabilityDaily.__table__
+    pk = ["entity_type", "entity_id", "date"]
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=pk,
+            set_={c: stmt.excluded[c] for c in rows[0] if c not in pk},
+        )
+        connection.execute(stmt, rows)
+        return
+    connection.execute(delete(table).where(_key_filter(table, [(r["entity_type"], r["entity_id"], r["date"]) for r in rows])))
+    connection.execute(table.insert(), rows)
+
+
+def _key_filter(table, keys):
+    return or_(*(
+        and_(table.c.entity_type == etype, table.c.entity_id == eid, table.c.date == day)
+        for etype, eid, day in keys
+    ))
+
+
+def refresh_keys(connection, keys: set[Key]) -> None:
+    """Recalcula y guarda el resumen de las claves dadas (borra las que quedaron sin slots)."""
+    if not keys:
+        return
+    summaries = _summaries(connection, keys)
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"entity_type": etype, "entity_id": eid, "date": day, **summary, "updated_at": now}
+        for (etype, eid, day), summary in summaries.items()
+    ]
+    if rows:
+        _upsert(connection, rows)
+    empty = keys - summaries.keys()
+    if empty:
+        table = AvailabilityDaily.__table__
+        connection.execute(delete(table).where(_key_filter(table, sorted(empty))))
+
+
+def rebuild_availability_daily(start: date, end: date) -> int:
+    """Reconstruye el resumen para los días [start, end] a partir de Timeslot.
+
+    Devuelve la cantidad de claves recalculadas. No hace commit.
+    """
+    connection = db.session.connection()
+    keys: set[Key] = set()
+    for entity_type, column_name in ENTITY_COLUMNS.items():
+        column = getattr(Timeslot, column_name)
+        rows = connection.execute(
+            select(column, Timeslot.start).where(
+                column.isnot(None),
+                *owner_criteria(entity_type),
+                Timeslot.start >= _day_start(start),
+                Timeslot.start < _day_start(end + timedelta(days=1)),
+            )
+        )
+        keys.update((entity_type, entity_id, _utc_date(ts_start)) for entity_id, ts_start in rows)
+    table = AvailabilityDaily.__table__
+    connection.execute(delete(table).where(table.c.date >= start, table.c.date <= end))
+    refresh_keys(connection, keys)
+    return len(keys)
+
+
+def free_days(owners: list[tuple[str, int]], first_day: date, last_day: date) -> list[date]:
+    """Días de [first_day, last_day] en que alguno de los dueños tiene slots AVAILABLE."""
+    if not owners:
+        return []
+    rows = db.session.execute(
+        select(AvailabilityDaily.date).distinct().where(
+            or_(*(and_(AvailabilityDaily.entity_type == etype, AvailabilityDaily.entity_id == eid)
+                  for etype, eid in owners)),
+            AvailabilityDaily.date >= first_day,
+            AvailabilityDaily.date <= last_day,
+            AvailabilityDaily.available_count > 0,
+        ).order_by(AvailabilityDaily.date)
+    )
+    return list(rows.scalars())
+
+
+def free_window(owners: list[tuple[str, int]], start: datetime, end: datetime) -> tuple[datetime, datetime] | None:
+    """Acota [start, end) a los días con slots libres de los dueños; None si no hay ninguno."""
+    days = free_days(owners, _utc_date(start), _utc_date(end - timedelta(microseconds=1)))
+    if not days:
+        return None
+    return max(start, _day_start(days[0])), min(end, _day_start(days[-1] + timedelta(days=1)))
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_before_commit(session) -> None:
+    """Recalcula las claves pendientes de la transacción (ORM y `mark_changed`)."""
+    session.flush()
+    keys = pending_keys(session)
+    if keys:
+        refresh_keys(session.connection(), keys)
@@ -0,0 +1,206 @@
+"""Consultas de disponibilidad pública (centros de estética y profesionales).
+
+Carga los slots AVAILABLE de una ventana (uno o varios días) en una sola
+consulta y calcula inicios con el motor de intervalos de `availability`.
+Los días se cortan en UTC, igual que las vistas por fecha. A los slots
+guardados se suman los libres de plantillas virtuales (services.virtual_slots).
+
+Antes de consultar `timeslots` la ventana se acota con el resumen diario
+(services.availability_daily) a los días con slots libres; si no hay
+ninguno, no se consultan los slots guardados.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import or_, select
+
+from app import db
+from app.models import Timeslot, TimeslotStatus
+from app.models_catalog import Professional, beauty_center_professionals, professional_services
+from app.services.availability import available_starts
+from app.services.availability_daily import free_window
+from app.services.virtual_slots import VIRTUAL_WINDOW_DAYS, entity_virtual_slots
+
+RANGE_DAYS_DEFAULT = 14
+RANGE_DAYS_MAX = 62
+
+
+def _with_virtual(rows: list, virtual: list) -> list:
+    """Slots guardados y virtuales juntos, ordenados por inicio."""
+    if not virtual:
+        return rows
+    return sorted([*rows, *virtual], key=lambda r: r.start if r.start.tzinfo else r.start.replace(tzinfo=timezone.utc))
+
+
+def day_bounds(first_day: date, days: int = 1) -> tuple[datetime, datetime]:
+    """Inicio y fin (exclusivo) en UTC de `days` días a partir de `first_day`."""
+    start = datetime.combine(first_day, datetime.min.time()).replace(tzinfo=timezone.utc)
+    return start, start + timedelta(days=days)
+
+
+def clamp_days(days: int | None) -> int:
+    """Acota la cantidad de días pedida a [1, RANGE_DAYS_MAX]."""
+    return min(max(days or RANGE_DAYS_DEFAULT, 1), RANGE_DAYS_MAX)
+
+
+def capable_professionals(center_id: int, service_ids: list[int]) -> list[Professional]:
+    """Staff del centro que puede cubrir TODOS los servicios pedidos (una sola consulta).
+
+    El admin define qué staff puede hacer cada servicio (professional_services).
+    """
+    wanted = set(service_ids)
+    rows = (
+        db.session.query(Professional, professional_services.c.service_id)
+        .join(beauty_center_professionals, beauty_center_professionals.c.professional_id == Professional.id)
+        .outerjoin(
+            professional_services,
+            (professional_services.c.professional_id == Professional.id)
+            & professional_services.c.service_id.in_(service_ids),
+        )
+        .filter(beauty_center_professionals.c.beauty_center_id == center_id)
+        .order_by(Professional.id)
+        .all()
+    )
+    pros: dict[int, Professional] = {}
+    linked: dict[int, set[int]] = {}
+    for p, sid in rows:
+        pros.setdefault(p.id, p)
+        if sid is not None:
+            linked.setdefault(p.id, set()).add(sid)
+    return [p for pid, p in pros.items() if wanted.issubset(linked.get(pid, set()))]
+
+
+def staff_starts(center_id: int, professional_ids: list[int], service_ids: list[int], duration_min: int,
+                 start: datetime, end: datetime) -> dict[int, list[datetime]]:
+    """Inicios por profesional donde entra `duration_min`, con todos los slots en una consulta."""
+    rows = []
+    window = free_window([("beauty_center", center_id)], start, end)
+    if window:
+        rows = (
+            db.session.query(Timeslot.professional_id, Timeslot.start, Timeslot.end)
+            .filter(
+                Timeslot.start >= window[0],
+                Timeslot.start < window[1],
+                Timeslot.status == TimeslotStatus.AVAILABLE,
+                Timeslot.beauty_center_id == center_id,
+                Timeslot.professional_id.in_(professional_ids),
+                # Acotar por servicios cuando el slot traiga service_id
+                or_(Timeslot.service_id.is_(None), Timeslot.service_id.in_(service_ids)),
+            )
+            .order_by(Timeslot.professional_id, Timeslot.start)
+            .all()
+        )
+    virtual = [
+        slot for slot in entity_virtual_slots("beauty_center_id", center_id, start, end,
+                                              professional_id=professional_ids)
+        if slot.service_id is None or slot.service_id in service_ids
+    ]
+    by_pro: dict[int, list] = {}
+    for row in _with_virtual(rows, virtual):
+        by_pro.setdefault(row.professional_id, []).append(row)
+    return {pid: available_starts(by_pro.get(pid, []), duration_min) for pid in professional_ids}
+
+
+def center_starts(center_id: int, duration_min: int, start: datetime, end: datetime) -> list[datetime]:
+    """Inicios sobre todos los slots libres del centro (sin staff configurado)."""
+    rows = []
+    window = free_window([("beauty_center", center_id)], start, end)
+    if window:
+        rows = (
+            db.session.query(Timeslot.start, Timeslot.end)
+            .filter(
+                Timeslot.start >= window[0],
+                Timeslot.start < window[1],
+                Timeslot.status == TimeslotStatus.AVAILABLE,
+                Timeslot.beauty_center_id == center_id,
+            )
+            .order_by(Timeslot.start)
+            .all()
+        )
+    virtual = entity_virtual_slots("beauty_center_id", center_id, start, end)
+    return available_starts(_with_virtual(rows, virtual), duration_min)
+
+
+def professional_starts(prof: Professional, now: datetime, start: datetime | None = None,
+                        end: datetime | None = None) -> list[datetime]:
+    """Inicios futuros (posteriores a `now`) del profesional en modo clásico, acotados a [start, end).
+
+    Con slot_duration_min configurado se calculan sobre la grilla unida; si no,
+    cada slot libre es un inicio.
+    """
+    # Sin fin explícito, los virtuales se acotan a la ventana por defecto
+    window_start = max(start, now) if start is not None else now
+    window_end = end if end is not None else now + timedelta(days=VIRTUAL_WINDOW_DAYS)
+    rows = []
+    q = db.session.query(Timeslot.start, Timeslot.end).filter(
+        Timeslot.status == TimeslotStatus.AVAILABLE,
+        Timeslot.professional_id == prof.id,
+        Timeslot.start > now,
+    )
+    if start is not None:
+        q = q.filter(Timeslot.start >= start)
+    if end is None:
+        rows = q.order_by(Timeslot.start).all()
+    else:
+        # Los slots del profesional en un centro cuentan en el resumen del centro
+        center_ids = db.session.execute(
+            select(beauty_center_professionals.c.beauty_center_id)
+            .where(beauty_center_professionals.c.professional_id == prof.id)
+        ).scalars()
+        owners = [("professional", prof.id), *(("beauty_center", cid) for cid in center_ids)]
+        window = free_window(owners, window_start, end)
+        if window:
+            rows = q.filter(Timeslot.start >= window[0], Timeslot.start < window[1]).order_by(Timeslot.start).all()
+    rows = _with_virtual(rows, entity_virtual_slots("professional_id", prof.id, window_start, window_end))
+    duration = int(getattr(prof, 'slot_duration_min', 0) or 0)
+    return available_starts(rows, duration) if duration else [r.start for r in rows]
+
+
+def beauty_center_range(center_id: int, service_ids: list[int], duration_min: int,
+                        first_day: date, days: int) -> list[datetime]:
+    """Inicios del centro en la ventana: unión de los del staff capaz, o del centro sin staff."""
+    start, end = day_bounds(first_day, days)
+    pros = capable_professionals(center_id, service_ids)
+    if not pros:
+        return center_starts(center_id, duration_min, start, end)
+    per_pro = staff_starts(center_id, [p.id for p in pros], service_ids, duration_min, start, end)
+    return sorted({dt for starts in per_pro.values() for dt in starts})
+
+
+def beauty_center_day(center_id: int, service_ids: list[int], duration_min: int, day: date) -> dict:
+    """Disponibilidad del día para un centro, serializable a JSON (apta para caché).
+
+    Con staff capaz: {'professionals': [{id, name, specialties}], 'starts': {id: [iso]}};
+    sin staff: {'professionals': [], 'starts': [iso]} sobre los slots del centro.
+    """
+    start, end = day_bounds(day)
+    pros = capable_professionals(center_id, service_ids)
+    if not pros:
+        return {'professionals': [], 'starts': [dt.isoformat() for dt in center_starts(center_id, duration_min, start, end)]}
+    per_pro = staff_starts(center_id, [p.id for p in pros], service_ids, duration_min, start, end)
+    return {
+        'professionals': [{'id': p.id, 'name': p.name, 'specialties': p.specialties} for p in pros],
+        'starts': {str(pid): [dt.isoformat() for dt in starts] for pid, starts in per_pro.items()},
+    }
+
+
+def day_summaries(starts: list[datetime], first_day: date, days: int, include_starts: bool = True) -> list[dict]:
+    """Agrupa inicios por día UTC: [{date, count[, starts]}] para cada día de la ventana."""
+    by_day: dict[date, list[datetime]] = {}
+    for dt in starts:
+        day = (dt.astimezone(timezone.utc) if dt.tzinfo else dt).date()
+        by_day.setdefault(day, []).append(dt)
+    summaries = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        entry = {'date': day, 'count': len(by_day.get(day, []))}
+        if include_starts:
+            entry['starts'] = by_day.get(day, [])
+        summaries.append(entry)
+    return summaries
+
+
+def next_available(summaries: list[dict]) -> date | None:
+    """Primer día de la ventana con al menos un inicio disponible."""
+    return next((s['date'] for s in summaries if s['count'] > 0), None)
@@ -0,0 +1,139 @@
+"""Reserva de cupos por día (profesionales en modo per_day).
+
+La reserva es un único upsert condicional sobre daily_availabilities:
+
+    INSERT ... VALUES (..., reserved_count = 1)
+    ON CONFLICT (professional_id, date) DO UPDATE
+        SET reserved_count = reserved_count + 1
+        WHERE reserved_count < capacity
+    RETURNING reserved_count
+
+Sin fila devuelta no hay cupo. No toma locks explícitos ni compite por la
+restricción única en la primera reserva del día.
+
+En motores sin ON CONFLICT se usa SQL genérico: UPDATE condicional y, si el
+día todavía no existe, INSERT dentro de un savepoint (si otra transacción lo
+creó antes, se reintenta el UPDATE).
+
+Pre-chequeo opcional en Redis: al agotarse un día se guarda una marca bajo la
+generación vigente de ese día (ver availability_cache). Un script Lua lee la
+generación y la marca en un solo viaje; cualquier cambio del día (p. ej. el
+admin sube la capacidad) cambia la generación y deja la marca sin efecto.
+"""
+from __future__ import annotations
+
+from datetime import date
+
+from flask import current_app
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models_catalog import DailyAvailability, Professional
+from app.services.availability_cache import generation_key, mark_changed
+
+SOLD_OUT_PREFIX = "daybook:soldout"
+SOLD_OUT_TTL = 60
+
+# Dialectos con INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+_UPSERT_DIALECTS = ("postgresql", "sqlite")
+
+# KEYS[1]: generación del día; ARGV[1]: prefijo de la marca
+_IS_SOLD_OUT_LUA = """
+local gen = redis.call('GET', KEYS[1]) or '0'
+return redis.call('EXISTS', ARGV[1] .. ':' .. gen)
+"""
+# KEYS[1]: generación del día; ARGV[1]: prefijo de la marca; ARGV[2]: TTL
+_MARK_SOLD_OUT_LUA = """
+local gen = redis.call('GET', KEYS[1]) or '0'
+redis.call('SET', ARGV[1] .. ':' .. gen, '1', 'EX', tonumber(ARGV[2]))
+return 1
+"""
+
+
+def _sold_out_prefix(professional_id: int, day: date) -> str:
+    return f"{SOLD_OUT_PREFIX}:{professional_id}:{day.isoformat()}"
+
+
+def is_sold_out(professional_id: int, day: date) -> bool:
+    """Pre-chequeo en Redis; False si no hay marca o si Redis no responde."""
+    try:
+        gen_key = generation_key("professional", professional_id, day)
+        return bool(current_app.redis.eval(_IS_SOLD_OUT_LUA, 1, gen_key, _sold_out_prefix(professional_id, day)))
+    except Exception as _e:
+        current_app.logger.warning(f"Day booking pre-check failed: {_e}")
+        return False
+
+
+def _mark_sold_out(professional_id: int, day: date) -> None:
+    try:
+        gen_key = generation_key("professional", professional_id, day)
+        current_app.redis.eval(_MARK_SOLD_OUT_LUA, 1, gen_key, _sold_out_prefix(professional_id, day), SOLD_OUT_TTL)
+    except Exception as _e:
+        current_app.logger.warning(f"Day booking sold-out mark failed: {_e}")
+
+
+def _new_day(prof: Professional, day: date) -> dict:
+    return {
+        "professional_id": prof.id,
+        "date": day,
+        "capacity": int(getattr(prof, 'daily_quota', 1) or 1),
+        "reserved_count": 1,
+    }
+
+
+def _upsert_reserve(dialect: str, prof: Professional, day: date) -> bool:
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    table = DailyAvailability.__table__
+    stmt = dialect_insert(table).values(**_new_day(prof, day))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.professional_id, table.c.date],
+        set_={"reserved_count": table.c.reserved_count + 1},
+        where=table.c.reserved_count < table.c.capacity,
+    ).returning(table.c.reserved_count)
+    return db.session.execute(stmt).first() is not None
+
+
+def _portable_reserve(prof: Professional, day: date) -> bool:
+    table = DailyAvailability.__table__
+    same_day = (table.c.professional_id == prof.id, table.c.date == day)
+    take = (
+        update(table)
+        .where(*same_day, table.c.reserved_count < table.c.capacity)
+        .values(reserved_count=table.c.reserved_count + 1)
+    )
+    if db.session.execute(take).rowcount:
+        return True
+    if db.session.execute(select(table.c.capacity).where(*same_day)).first() is not None:
+        return False
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(table).values(**_new_day(prof, day)))
+        return True
+    except IntegrityError:
+        # Otra transacción creó el día entre el UPDATE y el INSERT
+        return bool(db.session.execute(take).rowcount)
+
+
+def reserve_day(prof: Professional, day: date) -> bool:
+    """Toma un cupo del día para el profesional en la transacción actual (sin commit).
+
+    Crea el registro con capacidad daily_quota si no existía. Devuelve False si
+    el día está agotado.
+    """
+    if is_sold_out(prof.id, day):
+        return False
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect in _UPSERT_DIALECTS:
+        reserved = _upsert_reserve(dialect, prof, day)
+    else:
+        reserved = _portable_reserve(prof, day)
+    if not reserved:
+        _mark_sold_out(prof.id, day)
+        return False
+    mark_changed(db.session, {("professional", prof.id, day)})
+    return True
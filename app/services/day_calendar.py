@@ -0,0 +1,89 @@
+"""Calendario de cupos por día (profesionales en modo per_day).
+
+Resuelve ventanas de cualquier largo para uno o varios profesionales en una
+consulta. En PostgreSQL genera los días con generate_series y hace LEFT JOIN
+contra daily_availabilities, agregando por profesional en arrays ordenados;
+los días sin registro toman la capacidad de daily_quota. Otros motores (tests
+con SQLite) cargan los registros de la ventana y completan en memoria.
+
+Resultado compacto: {professional_id: {'capacity': [...], 'reserved': [...]}},
+un elemento por día a partir de `first_day`.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from sqlalchemy import Date, and_, case, cast, func, literal_column, select, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from app import db
+from app.models_catalog import DailyAvailability, Professional
+
+CALENDAR_DAYS_DEFAULT = 14
+CALENDAR_DAYS_MAX = 366
+
+
+def clamp_calendar_days(days: int | None) -> int:
+    """Acota la cantidad de días pedida a [1, CALENDAR_DAYS_MAX]."""
+    return min(max(days or CALENDAR_DAYS_DEFAULT, 1), CALENDAR_DAYS_MAX)
+
+
+def _calendar_stmt(professional_ids: list[int], first_day: date, last_day: date):
+    """SELECT id, array_agg(capacidad), array_agg(reservados) por profesional (PostgreSQL)."""
+    pro = Professional.__table__
+    da = DailyAvailability.__table__
+    series = select(
+        cast(func.generate_series(cast(first_day, Date), cast(last_day, Date), literal_column("interval '1 day'")), Date).label("day")
+    ).subquery("d")
+    capacity = case(
+        (da.c.professional_id.is_(None), func.coalesce(func.nullif(pro.c.daily_quota, 0), 1)),
+        else_=func.coalesce(func.nullif(da.c.capacity, 0), 1),
+    )
+    reserved = func.coalesce(da.c.reserved_count, 0)
+    return (
+        select(
+            pro.c.id,
+            func.array_agg(aggregate_order_by(capacity, series.c.day)).label("capacity"),
+            func.array_agg(aggregate_order_by(reserved, series.c.day)).label("reserved"),
+        )
+        .select_from(
+            pro.join(series, true()).outerjoin(
+                da, and_(da.c.professional_id == pro.c.id, da.c.date == series.c.day)
+            )
+        )
+        .where(pro.c.id.in_(professional_ids))
+        .group_by(pro.c.id)
+    )
+
+
+def _calendar_fallback(professional_ids: list[int], first_day: date, days: int) -> dict[int, dict]:
+    quotas = dict(
+        db.session.query(Professional.id, Professional.daily_quota).filter(Professional.id.in_(professional_ids)).all()
+    )
+    records = {
+        (r.professional_id, r.date): r
+        for r in DailyAvailability.query.filter(
+            DailyAvailability.professional_id.in_(professional_ids),
+            DailyAvailability.date >= first_day,
+            DailyAvailability.date < first_day + timedelta(days=days),
+        )
+    }
+    result = {}
+    for pid, quota in quotas.items():
+        capacity, reserved = [], []
+        for offset in range(days):
+            rec = records.get((pid, first_day + timedelta(days=offset)))
+            capacity.append(int(rec.capacity or 1) if rec else int(quota or 1))
+            reserved.append(int(rec.reserved_count or 0) if rec else 0)
+        result[pid] = {'capacity': capacity, 'reserved': reserved}
+    return result
+
+
+def day_calendar(professional_ids: list[int], first_day: date, days: int) -> dict[int, dict]:
+    """Capacidad y reservas por día de cada profesional en [first_day, first_day + days)."""
+    if not professional_ids:
+        return {}
+    if db.session.get_bind().dialect.name != "postgresql":
+        return _calendar_fallback(professional_ids, first_day, days)
+    rows = db.session.execute(_calendar_stmt(professional_ids, first_day, first_day + timedelta(days=days - 1)))
+    return {row.id: {'capacity': list(row.capacity), 'reserved': list(row.reserved)} for row in rows}
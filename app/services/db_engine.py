@@ -0,0 +1,86 @@
+"""Opciones del engine de SQLAlchemy para los workers gevent de producción.
+
+gunicorn corre con `--worker-class gevent --worker-connections 1000`: cada
+worker atiende cientos de requests concurrentes como greenlets. Dos cosas
+hacen falta para que eso funcione contra PostgreSQL:
+
+- psycopg2 es una extensión en C y espera a libpq bloqueando el hilo; sin
+  psycogreen una consulta lenta congela el worker completo. `patch_for_gevent`
+  instala el callback de espera cooperativo cuando gevent ya parchó la stdlib.
+- El pool por defecto (5 + 10 overflow, espera de 30 s) no está pensado para
+  esa concurrencia. El tamaño, el overflow, la espera máxima, el reciclado y
+  el pre-ping salen de variables de entorno (DB_POOL_*). Con varios workers
+  hay que respetar `workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) < max_connections`.
+
+Con DB_PGBOUNCER=1 (PgBouncer en modo transaction delante de PostgreSQL) la
+app no mantiene pool propio (NullPool): PgBouncer ya reutiliza las conexiones
+al servidor y un pool local solo retendría conexiones del bouncer. En ese modo
+no se envían parámetros de arranque (`options`), que PgBouncer rechaza.
+
+Solo se aplican a PostgreSQL; SQLite (tests) conserva los defaults de
+Flask-SQLAlchemy.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from typing import Mapping
+
+from sqlalchemy.pool import NullPool
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT = 10
+DEFAULT_POOL_RECYCLE = 1800
+
+_TRUE = {"1", "true", "yes", "on"}
+
+
+def _flag(value: str | None, default: bool) -> bool:
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in _TRUE
+
+
+def engine_options(uri: str, environ: Mapping[str, str] | None = None) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS para `uri` según DB_POOL_* / DB_PGBOUNCER."""
+    if not uri.startswith("postgresql"):
+        return {}
+    env = os.environ if environ is None else environ
+    if _flag(env.get("DB_PGBOUNCER"), False):
+        return {"poolclass": NullPool}
+    options = {
+        "pool_size": int(env.get("DB_POOL_SIZE") or DEFAULT_POOL_SIZE),
+        "max_overflow": int(env.get("DB_MAX_OVERFLOW") or DEFAULT_MAX_OVERFLOW),
+        "pool_timeout": float(env.get("DB_POOL_TIMEOUT") or DEFAULT_POOL_TIMEOUT),
+        "pool_recycle": int(env.get("DB_POOL_RECYCLE") or DEFAULT_POOL_RECYCLE),
+        "pool_pre_ping": _flag(env.get("DB_POOL_PRE_PING"), True),
+    }
+    statement_timeout = env.get("DB_STATEMENT_TIMEOUT_MS")
+    if statement_timeout:
+        # Una consulta colgada no retiene indefinidamente una conexión del pool
+        options["connect_args"] = {"options": f"-c statement_timeout={int(statement_timeout)}"}
+    return options
+
+
+def gevent_active() -> bool:
+    """True si gevent ya parchó los sockets (worker gevent de gunicorn)."""
+    monkey = sys.modules.get("gevent.monkey")
+    return bool(monkey and monkey.is_module_patched("socket"))
+
+
+def patch_for_gevent(logger=None) -> bool:
+    """Hace cooperativas las esperas de psycopg2 bajo gevent. Idempotente.
+
+    Devuelve True si el parche quedó instalado.
+    """
+    if not gevent_active():
+        return False
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        if logger:
+            logger.warning("gevent activo sin psycogreen: psycopg2 bloquea el worker en cada consulta")
+        return False
+    patch_psycopg()
+    return True
@@ -0,0 +1,188 @@
+"""Contadores de turnos libres para las landings (`landing_stats`).
+
+Las páginas de inicio y de categoría muestran "N turnos libres hoy"; calcularlo
+en cada visita sería un agregado sobre `timeslots`. En su lugar un job
+(scripts/refresh_landing_stats.py, cada minuto) reconstruye una tabla resumen
+con los slots AVAILABLE futuros de los próximos LANDING_STATS_DAYS días,
+agrupados por categoría, entidad pública (complejo, centro, profesional o
+servicio suelto) y día UTC, con la ciudad de la entidad.
+
+La reconstrucción es un DELETE + INSERT ... SELECT en una sola transacción:
+mientras corre, los lectores siguen viendo la versión anterior completa (lo
+mismo que REFRESH MATERIALIZED VIEW CONCURRENTLY, pero portable a SQLite).
+Hoy se agrega desde `timeslots` (solo los slots posteriores a `now`), con los
+límites UTC del día como parámetros, así el día no depende de funciones de
+fecha ni de la zona horaria del motor. Los días siguientes salen del resumen
+diario (availability_daily), que ya agrupa por entidad dueña y día UTC con
+la misma precedencia. Los contadores pueden atrasar hasta un ciclo del job.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, literal, select
+
+from app import db
+from app.models import AvailabilityDaily, Category, Complex, Field, LandingStat, Service, Timeslot, TimeslotStatus
+from app.models_catalog import BeautyCenter, Professional
+
+_COLUMNS = ("category_slug", "entity_type", "entity_id", "city", "date", "available_count", "first_free_start",
+            "updated_at")
+
+
+def _sources(day: date, window: list, now: datetime) -> list:
+    """Un SELECT agrupado por tipo de entidad dueña del slot, para los slots de `day`."""
+    day = literal(day, LandingStat.date.type)
+    count = func.count(Timeslot.id)
+    first = func.min(Timeslot.start)
+    stamp = literal(now, LandingStat.updated_at.type)
+    by_field = (
+        select(literal("deportes"), literal("complex"), Complex.id, func.coalesce(Complex.city, ""), day, count, first, stamp)
+        .join(Field, Field.id == Timeslot.field_id)
+        .join(Complex, Complex.id == Field.complex_id)
+        .where(*window, Field.show_public_booking.is_(True), Complex.show_public_booking.is_(True))
+        .group_by(Complex.id, Complex.city)
+    )
+    # Un profesional que atiende en un centro suma al centro
+    by_center = (
+        select(Category.slug, literal("beauty_center"), BeautyCenter.id, func.coalesce(BeautyCenter.city, ""), day, count, first, stamp)
+        .join(BeautyCenter, BeautyCenter.id == Timeslot.beauty_center_id)
+        .join(Category, Category.id == BeautyCenter.category_id)
+        .where(*window, Timeslot.field_id.is_(None), BeautyCenter.show_public_booking.is_(True))
+        .group_by(Category.slug, BeautyCenter.id, BeautyCenter.city)
+    )
+    by_professional = (
+        select(Category.slug, literal("professional"), Professional.id, func.coalesce(Professional.city, ""), day, count, first, stamp)
+        .join(Professional, Professional.id == Timeslot.professional_id)
+        .join(Category, Category.id == Professional.category_id)
+        .where(*window, Timeslot.field_id.is_(None), Timeslot.beauty_center_id.is_(None),
+               Professional.show_public_booking.is_(True))
+        .group_by(Category.slug, Professional.id, Professional.city)
+    )
+    by_service = (
+        select(Category.slug, literal("service"), Service.id, literal(""), day, count, first, stamp)
+        .join(Service, Service.id == Timeslot.service_id)
+        .join(Category, Category.id == Service.category_id)
+        .where(*window, Timeslot.field_id.is_(None), Timeslot.beauty_center_id.is_(None),
+               Timeslot.professional_id.is_(None))
+        .group_by(Category.slug, Service.id)
+    )
+    return [by_field, by_center, by_professional, by_service]
+
+
+def _daily_sources(first_day: date, last_day: date, now: datetime) -> list:
+    """Los mismos SELECT que `_sources`, sobre el resumen diario de [first_day, last_day]."""
+    daily = AvailabilityDaily
+    count = func.sum(daily.available_count)
+    first = func.min(daily.first_free_start)
+    stamp = literal(now, LandingStat.updated_at.type)
+    window = [daily.date >= first_day, daily.date <= last_day, daily.available_count > 0]
+
+    def owned(entity_type: str):
+        return [*window, daily.entity_type == entity_type]
+
+    by_field = (
+        select(literal("deportes"), literal("complex"), Complex.id, func.coalesce(Complex.city, ""), daily.date, count, first, stamp)
+        .join(Field, Field.id == daily.entity_id)
+        .join(Complex, Complex.id == Field.complex_id)
+        .where(*owned("field"), Field.show_public_booking.is_(True), Complex.show_public_booking.is_(True))
+        .group_by(Complex.id, Complex.city, daily.date)
+    )
+    by_center = (
+        select(Category.slug, literal("beauty_center"), BeautyCenter.id, func.coalesce(BeautyCenter.city, ""), daily.date, count, first, stamp)
+        .join(BeautyCenter, BeautyCenter.id == daily.entity_id)
+        .join(Category, Category.id == BeautyCenter.category_id)
+        .where(*owned("beauty_center"), BeautyCenter.show_public_booking.is_(True))
+        .group_by(Category.slug, BeautyCenter.id, BeautyCenter.city, daily.date)
+    )
+    by_professional = (
+        select(Category.slug, literal("professional"), Professional.id, func.coalesce(Professional.city, ""), daily.date, count, first, stamp)
+        .join(Professional, Professional.id == daily.entity_id)
+        .join(Category, Category.id == Professional.category_id)
+        .where(*owned("professional"), Professional.show_public_booking.is_(True))
+        .group_by(Category.slug, Professional.id, Professional.city, daily.date)
+    )
+    by_service = (
+        select(Category.slug, literal("service"), Service.id, literal(""), daily.date, count, first, stamp)
+        .join(Service, Service.id == daily.entity_id)
+        .join(Category, Category.id == Service.category_id)
+        .where(*owned("service"))
+        .group_by(Category.slug, Service.id, daily.date)
+    )
+    return [by_field, by_center, by_professional, by_service]
+
+
+def refresh_landing_stats(days: int | None = None, now: datetime | None = None) -> int:
+    """Reconstruye el resumen desde `now` hasta el fin del día `days - 1`. Sin commit.
+
+    Devuelve la cantidad de filas escritas.
+    """
+    if days is None:
+        days = int(current_app.config.get("LANDING_STATS_DAYS", 7))
+    now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+
+    table = LandingStat.__table__
+    db.session.execute(delete(table))
+    today = now.date()
+    day_end = datetime.combine(today + timedelta(days=1), time.min).replace(tzinfo=timezone.utc)
+    window = [Timeslot.status == TimeslotStatus.AVAILABLE, Timeslot.start > now, Timeslot.start < day_end]
+    sources = _sources(today, window, now)
+    if days > 1:
+        sources += _daily_sources(today + timedelta(days=1), today + timedelta(days=days - 1), now)
+    for source in sources:
+        db.session.execute(insert(table).from_select(_COLUMNS, source))
+    return db.session.execute(select(func.count()).select_from(table)).scalar_one()
+
+
+def category_counts(day: date | None = None) -> dict[str, int]:
+    """Turnos libres por categoría en `day` (hoy por defecto): {slug: cantidad}."""
+    day = day or datetime.now(timezone.utc).date()
+    rows = db.session.execute(
+        select(LandingStat.category_slug, func.sum(LandingStat.available_count))
+        .where(LandingStat.date == day)
+        .group_by(LandingStat.category_slug)
+    )
+    return {slug: int(total or 0) for slug, total in rows}
+
+
+def landing_stats(category: str, city: str | None = None, entity_type: str | None = None,
+                  entity_id: int | None = None, days: int = 7, today: date | None = None) -> dict:
+    """Serie diaria de turnos libres de una categoría (opcionalmente por ciudad o entidad)."""
+    today = today or datetime.now(timezone.utc).date()
+    days = min(max(days, 1), int(current_app.config.get("LANDING_STATS_DAYS", 7)))
+    filters = [
+        LandingStat.category_slug == category,
+        LandingStat.date >= today,
+        LandingStat.date < today + timedelta(days=days),
+    ]
+    if city:
+        filters.append(LandingStat.city == city)
+    if entity_type:
+        filters.append(LandingStat.entity_type == entity_type)
+    if entity_id is not None:
+        filters.append(LandingStat.entity_id == entity_id)
+    rows = db.session.execute(
+        select(LandingStat.date, func.sum(LandingStat.available_count),
+               func.min(LandingStat.first_free_start), func.max(LandingStat.updated_at))
+        .where(*filters)
+        .group_by(LandingStat.date)
+    ).all()
+    by_day = {row[0]: row for row in rows}
+    updated = max((row[3] for row in rows if row[3] is not None), default=None)
+    series = []
+    for offset in range(days):
+        d = today + timedelta(days=offset)
+        row = by_day.get(d)
+        series.append({
+            "date": d.isoformat(),
+            "count": int(row[1] or 0) if row else 0,
+            "first_free_start": row[2].isoformat() if row and row[2] else None,
+        })
+    return {
+        "category": category,
+        "city": city,
+        "today": series[0]["count"],
+        "days": series,
+        "updated_at": updated.isoformat() if updated else None,
+    }
@@ -0,0 +1,76 @@
+"""Servicios de "Mis Servicios" resueltos en SQL según el alcance del admin.
+
+En lugar de recorrer `linked_services` de cada profesional/centro (y la
+categoría de cada servicio), se consulta `services` con un semi-join contra
+professional_services / beauty_center_services filtrado por los ids del
+alcance y por la categoría. Así cada servicio aparece una sola vez y la lista
+llega ordenada por nombre desde la base.
+"""
+from __future__ import annotations
+
+from sqlalchemy import and_, func, or_, select, union
+
+from app import db
+from app.models import Category, Service
+from app.models_catalog import BeautyCenter, beauty_center_services, professional_services
+from app.services.access_scope import AccessScope
+
+
+def _services_stmt(link_table, entity_column, ids, category_slug: str):
+    linked = select(link_table.c.service_id)
+    if ids is not None:
+        linked = linked.where(entity_column.in_(ids))
+    return (
+        select(Service)
+        .join(Category, Category.id == Service.category_id)
+        .where(Category.slug == category_slug, Service.id.in_(linked))
+        .order_by(func.lower(Service.name), Service.id)
+    )
+
+
+def _scope_ids(scope: AccessScope, kind: str):
+    """None = sin filtro (superadmin); si no, los ids vinculados."""
+    return None if scope.is_superadmin else sorted(scope.ids(kind))
+
+
+def professional_services_for(scope: AccessScope, active_only: bool = True) -> list[Service]:
+    """Servicios de categoría profesionales vinculados a los profesionales del alcance."""
+    ids = _scope_ids(scope, "professional")
+    if ids == []:
+        return []
+    stmt = _services_stmt(professional_services, professional_services.c.professional_id, ids, "profesionales")
+    if active_only:
+        stmt = stmt.where(Service.is_active.is_(True))
+    return list(db.session.execute(stmt).scalars())
+
+
+def beauty_services_for(scope: AccessScope) -> tuple[list[Service], set[int]]:
+    """(servicios visibles, ids permitidos) de los centros de estética del alcance.
+
+    Un centro en modo fijo permite solo su servicio fijo; el resto permite sus
+    servicios de estética vinculados. Se listan los servicios vinculados que
+    quedan dentro de lo permitido.
+    """
+    ids = _scope_ids(scope, "beauty_center")
+    if ids == []:
+        return [], set()
+
+    fixed = and_(BeautyCenter.booking_mode == "fixed", BeautyCenter.fixed_service_id.isnot(None))
+    fixed_ids = select(BeautyCenter.fixed_service_id.label("service_id")).where(fixed)
+    flexible_ids = (
+        select(beauty_center_services.c.service_id)
+        .join(BeautyCenter, BeautyCenter.id == beauty_center_services.c.beauty_center_id)
+        .join(Service, Service.id == beauty_center_services.c.service_id)
+        .join(Category, Category.id == Service.category_id)
+        .where(Category.slug == "estetica", or_(BeautyCenter.booking_mode != "fixed", BeautyCenter.fixed_service_id.is_(None)))
+    )
+    if ids is not None:
+        fixed_ids = fixed_ids.where(BeautyCenter.id.in_(ids))
+        flexible_ids = flexible_ids.where(BeautyCenter.id.in_(ids))
+    allowed = set(db.session.execute(union(fixed_ids, flexible_ids)).scalars())
+    if not allowed:
+        return [], allowed
+
+    stmt = _services_stmt(beauty_center_services, beauty_center_services.c.beauty_center_id, ids, "estetica")
+    services = list(db.session.execute(stmt.where(Service.id.in_(allowed))).scalars())
+    return services, allowed
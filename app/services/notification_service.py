@@ -1,12 +1,17 @@
 from flask import current_app
 from app.models import Subscription, Timeslot, SubscriptionStatus, TimeslotStatus
 from app import db
-from datetime import datetime
+from datetime import datetime, timezone
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from jinja2 import Template
 
+def _as_utc(dt):
+    """SQLite returns naive datetimes; treat them as UTC for comparisons"""
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
 class NotificationService:
     """Service for handling waitlist notifications"""
     
@@ -58,6 +63,62 @@ class NotificationService:
                 job_timeout='5m'
             )
     
+    @staticmethod
+    def notify_timeslots_available(timeslot_ids):
+        """Queue a single job that notifies subscribers of several freed timeslots"""
+        timeslot_ids = sorted(set(timeslot_ids or ()))
+        if not timeslot_ids:
+            return None
+        return current_app.task_queue.enqueue(
+            'app.workers.email_worker.send_release_notifications',
+            timeslot_ids,
+            job_timeout='15m'
+        )
+
+    @staticmethod
+    def subscriptions_for_timeslots(timeslot_ids):
+        """(subscription, timeslot) pairs to notify for the given available timeslots.
+
+        Resolves direct and criteria subscriptions for all timeslots with a
+        fixed number of queries instead of one round per timeslot.
+        """
+        timeslots = Timeslot.query.filter(
+            Timeslot.id.in_(timeslot_ids),
+            Timeslot.status == TimeslotStatus.AVAILABLE,
+        ).all()
+        if not timeslots:
+            return []
+        by_id = {ts.id: ts for ts in timeslots}
+        active = (
+            Subscription.status == SubscriptionStatus.ACTIVE,
+            Subscription.is_active.is_(True),
+        )
+
+        pairs = [
+            (sub, by_id[sub.timeslot_id])
+            for sub in Subscription.query.filter(Subscription.timeslot_id.in_(by_id), *active).all()
+        ]
+
+        field_ids = {ts.field_id for ts in timeslots if ts.field_id}
+        service_ids = {ts.service_id for ts in timeslots if ts.service_id and not ts.field_id}
+        if field_ids or service_ids:
+            criteria_subscriptions = Subscription.query.filter(
+                Subscription.timeslot_id.is_(None),
+                db.or_(Subscription.field_id.in_(field_ids), Subscription.service_id.in_(service_ids)),
+                *active,
+            ).all()
+            for ts in timeslots:
+                for sub in criteria_subscriptions:
+                    if ts.field_id:
+                        matches_target = sub.field_id == ts.field_id
+                    else:
+                        matches_target = sub.service_id is not None and sub.service_id == ts.service_id
+                    if not matches_target or not sub.start_window or not sub.end_window:
+                        continue
+                    if _as_utc(sub.start_window) <= _as_utc(ts.start) and _as_utc(sub.end_window) >= _as_utc(ts.end):
+                        pairs.append((sub, ts))
+        return pairs
+
     @staticmethod
     def create_timeslot_subscription(email, timeslot_id):
         """Create a subscription for a specific timeslot"""
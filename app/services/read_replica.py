@@ -0,0 +1,134 @@
+"""Ruteo opcional de lecturas a una réplica de PostgreSQL.
+
+Con SQLALCHEMY_REPLICA_URI (env DATABASE_REPLICA_URL) se crea un engine
+aparte para la réplica (no es un bind de Flask-SQLAlchemy: tiene el mismo
+esquema que el primario y no lleva metadata propia). Las vistas y funciones
+marcadas con `@read_only` consultan la réplica; todo lo demás sigue en el
+primario.
+
+Se vuelve al primario, aunque el código esté marcado como de solo lectura:
+- durante un flush y después de cualquier escritura de la misma sesión de
+  base (el resto del request lee lo que acaba de escribir);
+- durante REPLICA_LAG_SECONDS después de un commit con escrituras del mismo
+  visitante (marca en la sesión de Flask), para que tras un hold o una
+  reserva el listado no muestre el estado anterior que la réplica todavía no
+  recibió;
+- dentro de `primary()`: las cachés compartidas (disponibilidad, búsqueda)
+  calculan ahí sus fallos. Un resultado de la réplica atrasada guardado bajo
+  la generación nueva quedaría servido a todos los visitantes hasta el TTL.
+
+Sin réplica configurada `@read_only` no cambia nada.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, g, has_app_context, has_request_context, session as flask_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+
+REPLICA_BIND = "replica"
+
+_WROTE = "replica_wrote"
+_LAST_WRITE = "_db_write_at"
+
+
+def init_replica(app) -> None:
+    """Crea el engine de la réplica si está configurada (mismas opciones que el primario)."""
+    uri = app.config.get("SQLALCHEMY_REPLICA_URI")
+    if uri:
+        options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+        app.extensions[REPLICA_BIND] = create_engine(uri, **options)
+
+
+def replica_engine():
+    """Engine de la réplica de la app actual, o None sin réplica."""
+    return current_app.extensions.get(REPLICA_BIND)
+
+
+def read_only(func):
+    """Marca una vista o función de servicio como apta para leer de la réplica."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = g.get("_read_only", False)
+        g._read_only = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            g._read_only = previous
+    return wrapper
+
+
+@contextmanager
+def primary():
+    """Las lecturas del bloque van al primario aunque el código sea `@read_only`."""
+    if not has_app_context():
+        yield
+        return
+    previous = g.get("_read_only", False)
+    g._read_only = False
+    try:
+        yield
+    finally:
+        g._read_only = previous
+
+
+def _recent_write() -> bool:
+    if not has_request_context():
+        return False
+    lag = float(current_app.config.get("REPLICA_LAG_SECONDS", 5) or 0)
+    return flask_session.get(_LAST_WRITE, 0) > time.time() - lag
+
+
+class RoutingSession(Session):
+    """Sesión de Flask-SQLAlchemy que elige la réplica para lecturas de código `@read_only`."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and not self.info.get(_WROTE)
+            and has_app_context()
+            and g.get("_read_only", False)
+        ):
+            replica = replica_engine()
+            if replica is not None and not _recent_write():
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def mark_write(session) -> None:
+    """Registra una escritura hecha fuera del flush (SQL directo) para leer del primario."""
+    session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush(session, flush_context) -> None:
+    if session.new or session.dirty or session.deleted:
+        mark_write(session)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mark_write(orm_execute_state.session)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session) -> None:
+    if session.info.get(_WROTE) and has_request_context():
+        flask_session[_LAST_WRITE] = time.time()
+
+
+def use_primary() -> None:
+    """El resto del request lee y escribe en el primario (antes de leer para modificar)."""
+    from app import db
+    mark_write(db.session)
+
+
+def reset_request_state() -> None:
+    """Al iniciar cada request la sesión de base vuelve a poder leer de la réplica."""
+    from app import db
+    db.session.info.pop(_WROTE, None)
@@ -0,0 +1,234 @@
+"""Plantillas semanales de turnos (`Schedule`) y su materialización incremental.
+
+Una plantilla define días de la semana, franja horaria, duración, intervalo y
+precio para una cancha, profesional o centro de estética. En lugar de generar
+de una vez meses de turnos, el materializador extiende cada plantilla día a
+día hasta SCHEDULE_HORIZON_DAYS desde hoy y recuerda hasta dónde llegó
+(`materialized_until`); los días posteriores no existen en `timeslots` hasta
+que entran en el horizonte.
+
+La generación es por conjuntos: una consulta trae los slots existentes de la
+entidad en la ventana, los huecos libres salen de `availability.subtract`
+(regla de la plantilla menos slots guardados) y los candidatos que entran en
+un hueco se insertan en un único INSERT. Como no pasa por el flush del ORM, las
+claves insertadas se registran con `mark_changed`: al confirmar actualizan el
+resumen diario (services.availability_daily) e invalidan la caché de
+disponibilidad.
+
+Pensado para correr una vez por día (scripts/materialize_schedules.py). Las
+plantillas en modo `virtual` no se materializan: ver services.virtual_slots.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import insert, select
+
+from app import db
+from app.models import Schedule, Timeslot, TimeslotStatus
+from app.services.availability import subtract, to_minutes
+from app.services.availability_cache import mark_changed
+from app.services.timeslot_keys import ENTITY_COLUMNS, Key
+
+Interval = tuple[datetime, datetime]
+
+SCHEDULE_MODES = ("materialized", "virtual")
+
+# Entidad dueña de los slots (la que no puede solaparse): un profesional que
+# atiende en un centro se controla por profesional.
+_ENTITY_ORDER = ("field", "professional", "beauty_center")
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def schedule_entity(schedule: Schedule) -> tuple[str, int]:
+    """(entity_type, entity_id) de la plantilla."""
+    for entity_type in _ENTITY_ORDER:
+        entity_id = getattr(schedule, ENTITY_COLUMNS[entity_type])
+        if entity_id is not None:
+            return entity_type, entity_id
+    raise ValueError(f"Plantilla {schedule.id} sin cancha, profesional ni centro")
+
+
+def schedule_keys(schedule: Schedule, day: date) -> set[Key]:
+    """Claves (resumen diario y caché de disponibilidad) que toca un slot de la plantilla en `day`."""
+    return {
+        (entity_type, getattr(schedule, column), day)
+        for entity_type, column in ENTITY_COLUMNS.items()
+        if getattr(schedule, column) is not None
+    }
+
+
+def slot_values(schedule: Schedule) -> dict:
+    """Columnas comunes de los Timeslot que genera la plantilla."""
+    return {
+        **{column: getattr(schedule, column) for column in ENTITY_COLUMNS.values()},
+        "price": schedule.price,
+        "currency": schedule.currency or "ARS",
+        "status": TimeslotStatus.AVAILABLE,
+    }
+
+
+def day_slots(schedule: Schedule, day: date) -> list[Interval]:
+    """Slots (inicio, fin) UTC que la plantilla define para un día."""
+    if day.weekday() not in schedule.weekday_set:
+        return []
+    if day < schedule.valid_from or (schedule.valid_until and day > schedule.valid_until):
+        return []
+    duration = timedelta(minutes=int(schedule.duration_min))
+    step = timedelta(minutes=int(schedule.interval_min or schedule.duration_min))
+    if duration <= timedelta(0) or step <= timedelta(0):
+        return []
+    slot_start = datetime.combine(day, schedule.start_time).replace(tzinfo=timezone.utc)
+    day_end = datetime.combine(day, schedule.end_time).replace(tzinfo=timezone.utc)
+    slots = []
+    while slot_start + duration <= day_end:
+        slots.append((slot_start, slot_start + duration))
+        slot_start += step
+    return slots
+
+
+def schedule_slots(schedule: Schedule, first_day: date, last_day: date) -> list[Interval]:
+    """Slots de la plantilla en [first_day, last_day], ordenados por inicio."""
+    slots: list[Interval] = []
+    day = first_day
+    while day <= last_day:
+        slots.extend(day_slots(schedule, day))
+        day += timedelta(days=1)
+    return slots
+
+
+def existing_intervals(entity_type: str, entity_id: int, first_day: date, last_day: date) -> list[Interval]:
+    """Slots guardados de la entidad que pueden solaparse con la ventana, ordenados por inicio."""
+    column = getattr(Timeslot, ENTITY_COLUMNS[entity_type])
+    window_start = datetime.combine(first_day, datetime.min.time()).replace(tzinfo=timezone.utc)
+    window_end = datetime.combine(last_day + timedelta(days=1), datetime.min.time()).replace(tzinfo=timezone.utc)
+    rows = db.session.execute(
+        select(Timeslot.start, Timeslot.end)
+        .where(column == entity_id, Timeslot.start < window_end, Timeslot.end > window_start)
+        .order_by(Timeslot.start)
+    )
+    return [(_as_utc(start), _as_utc(end)) for start, end in rows]
+
+
+def _busy_minutes(start: datetime, end: datetime) -> tuple[int, int]:
+    """Intervalo en minutos que cubre el slot guardado completo (fin redondeado hacia arriba)."""
+    end_min = to_minutes(end)
+    return to_minutes(start), end_min + (1 if end.second or end.microsecond else 0)
+
+
+def free_candidates(candidates: list[Interval], existing: list[Interval]) -> tuple[list[Interval], int]:
+    """Candidatos que no se solapan con `existing` ni entre sí: (aceptados, omitidos).
+
+    Los huecos libres son la regla menos los slots guardados
+    (`availability.subtract`); un candidato se acepta si entra entero en un
+    hueco. Los candidatos deben venir ordenados por inicio y con igual duración.
+    """
+    free = subtract(
+        [(to_minutes(start), to_minutes(end)) for start, end in candidates],
+        [_busy_minutes(start, end) for start, end in existing],
+    )
+    accepted: list[Interval] = []
+    skipped = 0
+    window = 0
+    for start, end in candidates:
+        first, last = to_minutes(start), to_minutes(end)
+        # Los huecos son disjuntos y ordenados: el único que puede contenerlo es el primero que termina después
+        while window < len(free) and free[window][1] < last:
+            window += 1
+        fits = window < len(free) and free[window][0] <= first
+        if not fits or (accepted and accepted[-1][1] > start):
+            skipped += 1
+            continue
+        accepted.append((start, end))
+    return accepted, skipped
+
+
+def materialize_schedule(schedule: Schedule, until: date, today: date | None = None) -> tuple[int, int]:
+    """Extiende la plantilla hasta `until` (inclusive) desde donde quedó. Sin commit.
+
+    Devuelve (creados, omitidos por solape).
+    """
+    today = today or datetime.now(timezone.utc).date()
+    first_day = max(schedule.valid_from, today)
+    if schedule.materialized_until:
+        first_day = max(first_day, schedule.materialized_until + timedelta(days=1))
+    last_day = min(until, schedule.valid_until) if schedule.valid_until else until
+    if last_day < first_day:
+        return 0, 0
+
+    entity_type, entity_id = schedule_entity(schedule)
+    candidates = schedule_slots(schedule, first_day, last_day)
+    accepted, skipped = free_candidates(candidates, existing_intervals(entity_type, entity_id, first_day, last_day))
+
+    if accepted:
+        base = slot_values(schedule)
+        db.session.execute(insert(Timeslot), [{**base, "start": start, "end": end} for start, end in accepted])
+        keys: set[Key] = set()
+        for day in {start.date() for start, _ in accepted}:
+            keys |= schedule_keys(schedule, day)
+        mark_changed(db.session, keys)
+
+    schedule.materialized_until = last_day
+    return len(accepted), skipped
+
+
+def save_schedule(schedule: Schedule, today: date | None = None) -> tuple[int, int]:
+    """Agrega la plantilla a la sesión y la pone en marcha. Sin commit.
+
+    Materializada: vuelca los turnos hasta el horizonte. Virtual: no escribe
+    turnos, solo marca sus días dentro del horizonte para invalidar la caché de
+    disponibilidad al confirmar. Devuelve (creados, omitidos).
+    """
+    today = today or datetime.now(timezone.utc).date()
+    db.session.add(schedule)
+    if schedule.mode != "virtual":
+        return materialize_schedule(schedule, schedule_horizon(today=today), today=today)
+
+    db.session.flush()
+    last_day = schedule_horizon(today=today)
+    if schedule.valid_until:
+        last_day = min(last_day, schedule.valid_until)
+    keys: set[Key] = set()
+    day = max(schedule.valid_from, today)
+    while day <= last_day:
+        if day_slots(schedule, day):
+            keys |= schedule_keys(schedule, day)
+        day += timedelta(days=1)
+    mark_changed(db.session, keys)
+    return 0, 0
+
+
+def schedule_horizon(horizon_days: int | None = None, today: date | None = None) -> date:
+    """Último día a materializar: hoy + SCHEDULE_HORIZON_DAYS (o `horizon_days`)."""
+    if horizon_days is None:
+        horizon_days = int(current_app.config.get("SCHEDULE_HORIZON_DAYS", 60))
+    return (today or datetime.now(timezone.utc).date()) + timedelta(days=horizon_days)
+
+
+def materialize_schedules(horizon_days: int | None = None, today: date | None = None) -> dict:
+    """Extiende todas las plantillas activas hasta hoy + horizonte. Sin commit."""
+    today = today or datetime.now(timezone.utc).date()
+    until = schedule_horizon(horizon_days, today)
+
+    pending = (
+        Schedule.query
+        .filter(
+            Schedule.is_active.is_(True),
+            Schedule.mode == "materialized",
+            db.or_(Schedule.materialized_until.is_(None), Schedule.materialized_until < until),
+            db.or_(Schedule.valid_until.is_(None), Schedule.valid_until >= today),
+        )
+        .order_by(Schedule.id)
+        .all()
+    )
+    totals = {"schedules": 0, "created": 0, "skipped": 0}
+    for schedule in pending:
+        created, skipped = materialize_schedule(schedule, until, today=today)
+        totals["schedules"] += 1
+        totals["created"] += created
+        totals["skipped"] += skipped
+    return totals
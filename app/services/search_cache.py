@@ -0,0 +1,196 @@
+"""Caché de resultados de búsqueda de catálogo en Redis.
+
+- Clave normalizada por (kind, q, city, page, per_page, near) bajo una
+  "generación"; las páginas por cursor agregan (cursor, with_total) a la clave.
+- La generación se incrementa al confirmar cambios sobre Professional,
+  BeautyCenter o SportsComplex, invalidando todas las entradas de una vez.
+- Las entradas además expiran por TTL (SEARCH_CACHE_TTL, 0 desactiva).
+- Si Redis no responde se consulta la base directamente.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.models_catalog import Professional, BeautyCenter, SportsComplex
+from app.services.read_replica import primary
+from app.services.search_service import (
+    PAGE_SIZE_DEFAULT,
+    PAGE_SIZE_MAX,
+    search_professionals,
+    search_beauty_centers,
+    search_sports_complexes,
+    search_keyset,
+    estimate_total,
+    projection,
+    Near,
+)
+
+GENERATION_KEY = "search:gen"
+HITS_KEY = "search:cache:hits"
+MISSES_KEY = "search:cache:misses"
+
+# kind -> (modelo, función de búsqueda por offset, campo descriptivo propio de la entidad)
+SEARCH_KINDS = {
+    "professionals": (Professional, search_professionals, "specialties"),
+    "beauty_centers": (BeautyCenter, search_beauty_centers, "services"),
+    "sports_complexes": (SportsComplex, search_sports_complexes, "sports"),
+}
+
+_DIRTY_FLAG = "search_cache_dirty"
+
+
+def _normalize_text(value: str | None) -> str:
+    """Colapsa espacios y pasa a minúsculas (FTS 'simple' e ILIKE no distinguen)."""
+    return " ".join((value or "").split()).lower()
+
+
+def normalize_params(query: str | None, city: str | None, page: int | None, per_page: int | None) -> tuple[str, str, int, int]:
+    """Normaliza parámetros de búsqueda igual que los aplica `_paginate`."""
+    page = max(int(page or 1), 1)
+    per_page = min(max(int(per_page or PAGE_SIZE_DEFAULT), 1), PAGE_SIZE_MAX)
+    return _normalize_text(query), _normalize_text(city), page, per_page
+
+
+def search_columns(kind: str) -> list:
+    """Columnas que necesitan las vistas y el API de búsqueda para `kind`."""
+    model, _, extra = SEARCH_KINDS[kind]
+    return projection(model, extra)
+
+
+def serialize_results(kind: str, rows) -> list[dict]:
+    """Convierte entidades o filas proyectadas en dicts planos aptos para JSON y plantillas."""
+    extra = SEARCH_KINDS[kind][2]
+    results = []
+    for r in rows:
+        item = {"id": r.id, "name": r.name, "slug": r.slug, "city": r.city, extra: getattr(r, extra)}
+        distance_m = getattr(r, "distance_m", None)
+        if distance_m is not None:
+            item["distance_km"] = round(distance_m / 1000.0, 2)
+        results.append(item)
+    return results
+
+
+def _get_generation(conn) -> int:
+    return int(conn.get(GENERATION_KEY) or 0)
+
+
+def cache_key(kind: str, generation: int, *params) -> str:
+    """Arma la clave Redis para una búsqueda ya normalizada."""
+    raw = json.dumps(list(params), ensure_ascii=False)
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return f"search:v{generation}:{kind}:{digest}"
+
+
+def _cached(kind: str, params: tuple, loader):
+    """Devuelve `loader()` desde la caché o lo calcula y guarda con TTL."""
+    ttl = int(current_app.config.get("SEARCH_CACHE_TTL", 0) or 0)
+    if ttl <= 0:
+        return loader()
+
+    conn = current_app.redis
+    key = None
+    try:
+        key = cache_key(kind, _get_generation(conn), *params)
+        cached = conn.get(key)
+        if cached is not None:
+            conn.incr(HITS_KEY)
+            return json.loads(cached)
+        conn.incr(MISSES_KEY)
+    except Exception as _e:
+        current_app.logger.warning(f"Search cache read failed: {_e}")
+        key = None
+
+    if not key:
+        return loader()
+    # El resultado se comparte con todos: se calcula en el primario, nunca en la réplica atrasada
+    with primary():
+        result = loader()
+    try:
+        conn.setex(key, ttl, json.dumps(result, ensure_ascii=False))
+    except Exception as _e:
+        current_app.logger.warning(f"Search cache write failed: {_e}")
+    return result
+
+
+def cached_search(kind: str, query: str = "", city: str | None = None, page: int = 1, per_page: int = PAGE_SIZE_DEFAULT,
+                  near: Near | None = None) -> list[dict]:
+    """Devuelve resultados serializados de `kind`, usando la caché cuando es posible."""
+    search_fn = SEARCH_KINDS[kind][1]
+    query, city, page, per_page = normalize_params(query, city, page, per_page)
+    return _cached(
+        kind,
+        (query, city, page, per_page, near),
+        lambda: serialize_results(kind, search_fn(query, city or None, page, per_page, search_columns(kind), near)),
+    )
+
+
+def cached_search_page(kind: str, query: str = "", city: str | None = None, per_page: int = PAGE_SIZE_DEFAULT,
+                       cursor: str | None = None, with_total: bool = False, near: Near | None = None) -> dict:
+    """Página por cursor de `kind` como sobre JSON: items, next_cursor y total opcional.
+
+    Lanza InvalidCursor si el cursor no corresponde a la búsqueda.
+    """
+    model = SEARCH_KINDS[kind][0]
+    query, city, _, per_page = normalize_params(query, city, 1, per_page)
+    cursor = cursor or None
+
+    def _load() -> dict:
+        items, next_cursor = search_keyset(model, query, city or None, per_page, cursor, search_columns(kind), near)
+        envelope = {"items": serialize_results(kind, items), "next_cursor": next_cursor}
+        if with_total:
+            total, is_estimate = estimate_total(model, query, city or None, near=near)
+            envelope["total"] = total
+            envelope["total_is_estimate"] = is_estimate
+        return envelope
+
+    return _cached(kind, ("cursor", query, city, per_page, cursor, bool(with_total), near), _load)
+
+
+def bump_generation() -> None:
+    """Invalida todas las búsquedas cacheadas incrementando la generación."""
+    try:
+        current_app.redis.incr(GENERATION_KEY)
+    except Exception as _e:
+        current_app.logger.warning(f"Search cache invalidation failed: {_e}")
+
+
+def cache_stats() -> dict:
+    """Devuelve contadores de aciertos/fallos y la generación vigente."""
+    conn = current_app.redis
+    hits, misses, generation = conn.mget(HITS_KEY, MISSES_KEY, GENERATION_KEY)
+    hits, misses = int(hits or 0), int(misses or 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+        "generation": int(generation or 0),
+    }
+
+
+def _mark_dirty(mapper, connection, target) -> None:
+    """Marca la sesión para invalidar la caché al confirmar (no antes)."""
+    session = object_session(target)
+    if session is not None:
+        session.info[_DIRTY_FLAG] = True
+
+
+for _model in (Professional, BeautyCenter, SportsComplex):
+    for _evt in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _evt, _mark_dirty)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session) -> None:
+    if session.info.pop(_DIRTY_FLAG, False) and has_app_context():
+        bump_generation()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session) -> None:
+    session.info.pop(_DIRTY_FLAG, None)
@@ -1,13 +1,30 @@
-from sqlalchemy import select, func, text
+import base64
+import json
+import math
+from typing import NamedTuple
+
+from sqlalchemy import select, func, text, and_, or_, cast, Float, Boolean
 from app import db
 from app.models_catalog import Professional, BeautyCenter, SportsComplex
 
 PAGE_SIZE_DEFAULT = 20
 PAGE_SIZE_MAX = 50
+COUNT_CAP = 1000
+RADIUS_KM_DEFAULT = 10.0
+RADIUS_KM_MAX = 100.0
+_METERS_PER_DEGREE = 111195.0
+
+
+class InvalidCursor(ValueError):
+    """Cursor de paginación malformado o de otro tipo de búsqueda."""
+
+
+def _clamp_per_page(per_page: int | None) -> int:
+    return min(max(per_page or PAGE_SIZE_DEFAULT, 1), PAGE_SIZE_MAX)
 
 def _paginate(q, page: int, per_page: int):
     """Aplica paginación con límite y desplazamiento (offset)."""
-    per_page = min(max(per_page or PAGE_SIZE_DEFAULT, 1), PAGE_SIZE_MAX)
+    per_page = _clamp_per_page(per_page)
     offset = max(page - 1, 0) * per_page
     return q.limit(per_page).offset(offset)
 
@@ -15,52 +32,207 @@ def _fts_clause(table_name: str):
     """Genera cláusula FTS (plainto_tsquery + unaccent) para la tabla dada."""
     return text(f"{table_name}.search_vector @@ plainto_tsquery('simple', unaccent(:query))")
 
-def _order_fts(model, query: str):
-    """Ordena resultados por relevancia FTS y luego por nombre ascendente."""
-    return [
-        func.ts_rank_cd(model.search_vector, func.plainto_tsquery('simple', func.unaccent(query))).desc(),
-        model.name.asc(),
-    ]
+def _rank_expr(model, query: str):
+    """Expresión de relevancia FTS usada para ordenar y como clave del cursor.
 
-def search_professionals(query: str = "", city: str | None = None, page: int = 1, per_page: int = 20):
-    """Busca profesionales activos con FTS/LIKE, filtra por ciudad y pagina resultados."""
-    base = select(Professional).where(Professional.is_active.is_(True))
-    if city:
-        base = base.where(Professional.city.ilike(f"%{city}%"))
-    if query and len(query.strip()) >= 2:
-        base = base.where(_fts_clause("professionals")).params(query=query).order_by(*_order_fts(Professional, query))
-    elif query:
-        base = base.where(Professional.name.ilike(f"%{query}%")).order_by(Professional.name.asc())
+    ts_rank_cd devuelve real (float4); el cursor guarda el rank como float de
+    Python, que vuelve como float8. Sin el cast a double precision la igualdad
+    `rank = :cursor` nunca coincide y las filas empatadas en rank tras el
+    corte de página se pierden.
+    """
+    return cast(func.ts_rank_cd(model.search_vector, func.plainto_tsquery('simple', func.unaccent(query))), Float)
+
+def projection(model, *extra: str) -> list:
+    """Columnas mínimas para listados/JSON: id, name, slug, city y los extras pedidos."""
+    return [model.id, model.name, model.slug, model.city, *(getattr(model, name) for name in extra)]
+
+
+class Near(NamedTuple):
+    """Centro y radio de una búsqueda por cercanía."""
+    lat: float
+    lng: float
+    radius_km: float
+
+
+def parse_near(near: str | None, radius_km=None) -> Near | None:
+    """Parsea `near=lat,lng` y `radius_km`; None si no se pidió, ValueError si es inválido."""
+    if not near:
+        return None
+    lat_str, lng_str = near.split(",")
+    lat, lng = round(float(lat_str), 4), round(float(lng_str), 4)
+    radius = float(radius_km) if radius_km not in (None, "") else RADIUS_KM_DEFAULT
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180) or not (0 < radius <= RADIUS_KM_MAX):
+        raise ValueError("near/radius_km fuera de rango")
+    return Near(lat, lng, radius)
+
+
+class _Lead(NamedTuple):
+    """Clave principal de orden (rank FTS o distancia) antes de (name, id)."""
+    expr: object
+    label: str
+    descending: bool
+
+
+def _near_filter(model, near: Near):
+    """Devuelve (condiciones, distancia en metros) para filtrar y ordenar por cercanía.
+
+    En PostgreSQL usa earth_box() y el operador KNN <-> sobre el índice GiST de
+    ll_to_earth(); en otros motores una caja lat/lng y distancia equirectangular.
+    """
+    radius_m = near.radius_km * 1000.0
+    conds = [model.latitude.isnot(None), model.longitude.isnot(None)]
+    if db.engine.dialect.name == "postgresql":
+        origin = func.ll_to_earth(near.lat, near.lng)
+        point = func.ll_to_earth(model.latitude, model.longitude)
+        distance = point.op("<->", return_type=Float)(origin)
+        conds.append(func.earth_box(origin, radius_m).op("@>", return_type=Boolean)(point))
     else:
-        base = base.order_by(Professional.name.asc())
-    q = _paginate(base, page, per_page)
-    return db.session.execute(q).scalars().all()
+        dlat = (model.latitude - near.lat) * _METERS_PER_DEGREE
+        dlng = (model.longitude - near.lng) * (_METERS_PER_DEGREE * math.cos(math.radians(near.lat)))
+        distance = func.sqrt(dlat * dlat + dlng * dlng, type_=Float)
+        lat_span = radius_m / _METERS_PER_DEGREE
+        lng_span = lat_span / max(math.cos(math.radians(near.lat)), 0.01)
+        conds.append(model.latitude.between(near.lat - lat_span, near.lat + lat_span))
+        conds.append(model.longitude.between(near.lng - lng_span, near.lng + lng_span))
+    conds.append(distance <= radius_m)
+    return conds, distance
 
-def search_beauty_centers(query: str = "", city: str | None = None, page: int = 1, per_page: int = 20):
-    """Busca centros de estética activos con FTS/LIKE, filtra por ciudad y pagina."""
-    base = select(BeautyCenter).where(BeautyCenter.is_active.is_(True))
+def _base_search(model, query: str = "", city: str | None = None, columns=None, near: Near | None = None):
+    """Arma el select filtrado (activos, ciudad, FTS/LIKE, cercanía) sin orden ni paginación.
+
+    Con `columns` selecciona solo esas columnas (filas livianas, sin identity map);
+    sin ellas carga la entidad completa.
+    Devuelve (select, lead) donde lead es la clave principal de orden (distancia si
+    hay `near`, si no rank FTS) o None si es un listado por nombre.
+    """
+    base = select(*columns) if columns else select(model)
+    base = base.where(model.is_active.is_(True))
     if city:
-        base = base.where(BeautyCenter.city.ilike(f"%{city}%"))
+        base = base.where(model.city.ilike(f"%{city}%"))
+    lead = None
     if query and len(query.strip()) >= 2:
-        base = base.where(_fts_clause("beauty_centers")).params(query=query).order_by(*_order_fts(BeautyCenter, query))
+        base = base.where(_fts_clause(model.__tablename__)).params(query=query)
+        lead = _Lead(_rank_expr(model, query), "rank", True)
     elif query:
-        base = base.where(BeautyCenter.name.ilike(f"%{query}%")).order_by(BeautyCenter.name.asc())
-    else:
-        base = base.order_by(BeautyCenter.name.asc())
-    q = _paginate(base, page, per_page)
-    return db.session.execute(q).scalars().all()
+        base = base.where(model.name.ilike(f"%{query}%"))
+    if near is not None:
+        conds, distance = _near_filter(model, near)
+        base = base.where(*conds)
+        lead = _Lead(distance, "distance_m", False)
+    return base, lead
+
+def _ordered(model, base, lead):
+    """Agrega la columna de la clave principal (si hay) y el orden total (lead, name, id)."""
+    if lead is None:
+        return base.order_by(model.name.asc(), model.id.asc())
+    col = lead.expr.label(lead.label)
+    return base.add_columns(col).order_by(col.desc() if lead.descending else col.asc(), model.name.asc(), model.id.asc())
+
+def _search(model, query: str = "", city: str | None = None, page: int = 1, per_page: int = 20, columns=None,
+            near: Near | None = None):
+    """Búsqueda paginada por offset (usada por las vistas HTML)."""
+    base, lead = _base_search(model, query, city, columns, near)
+    q = _paginate(_ordered(model, base, lead), page, per_page)
+    result = db.session.execute(q)
+    return result.all() if columns else result.scalars().all()
 
-def search_sports_complexes(query: str = "", city: str | None = None, page: int = 1, per_page: int = 20):
+def search_professionals(query: str = "", city: str | None = None, page: int = 1, per_page: int = 20, columns=None,
+                         near: Near | None = None):
+    """Busca profesionales activos con FTS/LIKE, filtra por ciudad y pagina resultados."""
+    return _search(Professional, query, city, page, per_page, columns, near)
+
+def search_beauty_centers(query: str = "", city: str | None = None, page: int = 1, per_page: int = 20, columns=None,
+                          near: Near | None = None):
+    """Busca centros de estética activos con FTS/LIKE, filtra por ciudad y pagina."""
+    return _search(BeautyCenter, query, city, page, per_page, columns, near)
+
+def search_sports_complexes(query: str = "", city: str | None = None, page: int = 1, per_page: int = 20, columns=None,
+                            near: Near | None = None):
     """Busca complejos deportivos activos con FTS/LIKE, filtra por ciudad y pagina."""
-    base = select(SportsComplex).where(SportsComplex.is_active.is_(True))
-    if city:
-        base = base.where(SportsComplex.city.ilike(f"%{city}%"))
-    if query and len(query.strip()) >= 2:
-        base = base.where(_fts_clause("sports_complexes")).params(query=query).order_by(*_order_fts(SportsComplex, query))
-    elif query:
-        base = base.where(SportsComplex.name.ilike(f"%{query}%")).order_by(SportsComplex.name.asc())
-    else:
-        base = base.order_by(SportsComplex.name.asc())
-    q = _paginate(base, page, per_page)
-    return db.session.execute(q).scalars().all()
+    return _search(SportsComplex, query, city, page, per_page, columns, near)
+
+
+# --- Paginación por cursor (keyset) -------------------------------------------------
+
+def encode_cursor(key: list) -> str:
+    """Serializa la clave de orden de la última fila como token opaco url-safe."""
+    raw = json.dumps(key, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(token: str, size: int) -> list:
+    """Decodifica un cursor y valida que tenga `size` componentes."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(str(e)) from e
+    if not isinstance(key, list) or len(key) != size:
+        raise InvalidCursor("cursor de otro tipo de búsqueda")
+    if not isinstance(key[-1], int) or not isinstance(key[-2], str):
+        raise InvalidCursor("cursor con tipos inválidos")
+    if size == 3 and not isinstance(key[0], (int, float)):
+        raise InvalidCursor("cursor con clave de orden inválida")
+    return key
+
+def _after_key(model, lead, key: list):
+    """Predicado keyset: filas estrictamente posteriores a `key` en el orden de búsqueda."""
+    name, last_id = key[-2], key[-1]
+    after_name = or_(model.name > name, and_(model.name == name, model.id > last_id))
+    if lead is None:
+        return after_name
+    past_lead = lead.expr < key[0] if lead.descending else lead.expr > key[0]
+    return or_(past_lead, and_(lead.expr == key[0], after_name))
+
+def search_keyset(model, query: str = "", city: str | None = None, per_page: int = 20, cursor: str | None = None,
+                  columns=None, near: Near | None = None):
+    """Busca con paginación por cursor.
+
+    Orden: (rank desc, name, id) para FTS, (distancia, name, id) con `near` y
+    (name, id) para listados.
+    Devuelve (entidades o filas proyectadas, next_cursor) con next_cursor=None
+    en la última página.
+    """
+    per_page = _clamp_per_page(per_page)
+    base, lead = _base_search(model, query, city, columns, near)
+    stmt = _ordered(model, base, lead)
+    if cursor:
+        stmt = stmt.where(_after_key(model, lead, decode_cursor(cursor, 3 if lead is not None else 2)))
+    rows = db.session.execute(stmt.limit(per_page + 1)).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    items = rows if columns else [r[0] for r in rows]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        key = [items[-1].name, items[-1].id]
+        if lead is not None:
+            key.insert(0, float(getattr(last, lead.label)))
+        next_cursor = encode_cursor(key)
+    return items, next_cursor
+
+def _explain_rows(stmt) -> int | None:
+    """Estimación de filas del planner de PostgreSQL (EXPLAIN, sin ejecutar)."""
+    conn = db.session.connection()
+    if conn.dialect.name != "postgresql":
+        return None
+    compiled = stmt.compile(dialect=conn.dialect)
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def estimate_total(model, query: str = "", city: str | None = None, cap: int = COUNT_CAP,
+                   near: Near | None = None) -> tuple[int, bool]:
+    """Cuenta resultados hasta `cap`; por encima usa la estimación del planner.
 
+    Devuelve (total, es_estimado).
+    """
+    base, _ = _base_search(model, query, city, near=near)
+    ids = base.with_only_columns(model.id)
+    capped = select(func.count()).select_from(ids.limit(cap + 1).subquery())
+    count = db.session.execute(capped).scalar() or 0
+    if count <= cap:
+        return count, False
+    estimate = _explain_rows(ids)
+    return max(estimate or 0, count), True
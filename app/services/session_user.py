@@ -0,0 +1,124 @@
+"""Principal liviano del usuario de la sesión (Flask-Login).
+
+`load_user` ya no carga la fila completa de AppUser en cada request. La
+cookie de sesión guarda solo el id del usuario y su versión de permisos (ver
+access_scope.invalidate_user_scope): el alcance puede tener cientos de ids y
+la sesión de Flask viaja en una cookie de ~4 KB como máximo.
+
+En cada request se leen de Redis, en un solo MGET, la versión y los datos de
+identidad del principal (email, nombre, flag de superadmin, categoría;
+PRINCIPAL_MAX_AGE segundos de vida). Si la versión coincide con la de la
+sesión el principal se hidrata sin consultar la base y el alcance se
+reconstruye desde la caché de permisos (`user_scope`).
+
+Si Redis no responde (o PRINCIPAL_MAX_AGE es 0) se carga desde la base como
+antes. Los atributos que el principal no trae (relaciones, password_hash,
+etc.) se resuelven cargando la fila de AppUser bajo demanda.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+
+from flask import current_app, session
+from flask_login import UserMixin
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models import AppUser
+from app.services.access_scope import AccessScope, principal_key, user_scope, version_key
+
+PRINCIPAL_SESSION_KEY = "_principal"
+
+
+@dataclass(frozen=True)
+class CategoryRef:
+    id: int
+    slug: str
+    title: str
+
+
+class SessionUser(UserMixin):
+    """Usuario autenticado hidratado desde el principal de sesión."""
+
+    def __init__(self, data: dict, scope: AccessScope):
+        self.id = data["id"]
+        self.email = data["email"]
+        self.name = data.get("name")
+        self.is_superadmin = bool(data["superadmin"])
+        category = data.get("category")
+        self.category_id = category["id"] if category else None
+        self.category = CategoryRef(**category) if category else None
+        self.scope = scope
+
+    @property
+    def is_super_admin(self) -> bool:
+        return self.is_superadmin
+
+    def __getattr__(self, name):
+        # Solo se llama para atributos que el principal no trae
+        if name.startswith("_"):
+            raise AttributeError(name)
+        row = self.__dict__.get("_row")
+        if row is None:
+            row = db.session.get(AppUser, self.id)
+            if row is None:
+                raise AttributeError(name)
+            self.__dict__["_row"] = row
+        return getattr(row, name)
+
+    def __repr__(self):
+        return f"<SessionUser {self.email}>"
+
+
+def _cached(user_id: int) -> tuple[int | None, dict | None]:
+    """Versión de permisos y datos cacheados del principal; (None, None) si Redis no responde."""
+    try:
+        version, cached = current_app.redis.mget([version_key(user_id), principal_key(user_id)])
+        return int(version or 0), json.loads(cached) if cached else None
+    except Exception as _e:
+        current_app.logger.warning(f"User principal read failed: {_e}")
+        return None, None
+
+
+def _principal(user: AppUser) -> dict:
+    category = user.category
+    return {
+        "id": user.id,
+        "email": user.email,
+        "name": user.name,
+        "superadmin": bool(user.is_superadmin),
+        "category": {"id": category.id, "slug": category.slug, "title": category.title} if category else None,
+    }
+
+
+def load_principal(user_id: int) -> SessionUser | None:
+    """Principal del usuario desde Redis si la versión de la sesión sigue vigente; si no, desde la base."""
+    max_age = int(current_app.config.get("PRINCIPAL_MAX_AGE", 0) or 0)
+    version, data = _cached(user_id) if max_age > 0 else (None, None)
+    stored = session.get(PRINCIPAL_SESSION_KEY)
+    if (
+        version is not None
+        and data is not None
+        and stored == {"id": user_id, "v": version}
+        and data.get("id") == user_id
+    ):
+        return SessionUser(data, user_scope(user_id, bool(data["superadmin"])))
+
+    user = AppUser.query.options(joinedload(AppUser.category)).filter(AppUser.id == user_id).first()
+    if user is None:
+        session.pop(PRINCIPAL_SESSION_KEY, None)
+        return None
+    data = _principal(user)
+    if version is not None:
+        try:
+            current_app.redis.setex(principal_key(user_id), max_age, json.dumps(data))
+            session[PRINCIPAL_SESSION_KEY] = {"id": user_id, "v": version}
+        except Exception as _e:
+            current_app.logger.warning(f"User principal write failed: {_e}")
+    return SessionUser(data, user_scope(user.id, bool(user.is_superadmin)))
+
+
+def forget_principal() -> None:
+    """Quita el principal de la sesión (logout)."""
+    session.pop(PRINCIPAL_SESSION_KEY, None)
@@ -0,0 +1,162 @@
+"""Archivo de turnos pasados: los saca de `timeslots` hacia `timeslots_archive`.
+
+Las consultas públicas filtran siempre `start > now`, pero la tabla crecía sin
+límite con turnos vencidos (índices más grandes, más vacuum). Los turnos que
+empezaron antes de TIMESLOT_ARCHIVE_DAYS se mueven por lotes al histórico,
+junto con el borrado de sus suscripciones de espera (ya no pueden liberarse).
+
+En PostgreSQL el histórico está particionado por mes sobre `start`: las
+particiones se crean antes de cada lote y las más viejas pueden
+desengancharse (DETACH) para volcarlas y borrarlas fuera de línea. En otros
+motores (SQLite en tests) la tabla es única y la parte de particiones no hace
+nada.
+
+Cada lote no hace commit; scripts/archive_timeslots.py confirma lote a lote
+para no sostener locks largos.
+
+La tabla padre particionada y el primer volcado de los turnos ya vencidos los
+hace la migración tsarch_20261019.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, literal, select, text
+
+from app import db
+from app.models import Subscription, Timeslot, TimeslotArchive
+
+ARCHIVE_BATCH = 5000
+
+_COLUMNS = (
+    "id", "start", "end", "field_id", "service_id", "beauty_center_id", "professional_id",
+    "price", "currency", "status", "reservation_code", "created_at",
+)
+
+
+def _is_postgres() -> bool:
+    return db.session.get_bind().dialect.name == "postgresql"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def month_range(first: date, last: date) -> list[date]:
+    """Primer día de cada mes entre `first` y `last` (inclusive)."""
+    months = []
+    month = month_start(first)
+    while month <= last:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def partition_name(month: date) -> str:
+    return f"{TimeslotArchive.__tablename__}_{month:%Y_%m}"
+
+
+def partition_ddl(month: date) -> str:
+    """CREATE de la partición mensual (límites en UTC)."""
+    lower = datetime.combine(month, time.min).replace(tzinfo=timezone.utc)
+    upper = datetime.combine(next_month(month), time.min).replace(tzinfo=timezone.utc)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF {TimeslotArchive.__tablename__} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+
+
+def ensure_partitions(first: date, last: date) -> list[str]:
+    """Crea (si faltan) las particiones mensuales que cubren [first, last]. Solo PostgreSQL."""
+    if not _is_postgres():
+        return []
+    months = month_range(first, last)
+    for month in months:
+        db.session.execute(text(partition_ddl(month)))
+    return [partition_name(m) for m in months]
+
+
+def utc_day(dt: datetime) -> date:
+    """Día UTC de `dt`; un datetime naive (SQLite) ya está en UTC."""
+    if dt.tzinfo is None:
+        return dt.date()
+    return dt.astimezone(timezone.utc).date()
+
+
+def archive_cutoff(archive_days: int | None = None, now: datetime | None = None) -> datetime:
+    """Los turnos que empiezan antes de este instante se archivan."""
+    if archive_days is None:
+        archive_days = int(current_app.config.get("TIMESLOT_ARCHIVE_DAYS", 90))
+    return (now or datetime.now(timezone.utc)) - timedelta(days=archive_days)
+
+
+def archive_batch(before: datetime, batch_size: int = ARCHIVE_BATCH) -> int:
+    """Mueve hasta `batch_size` turnos con inicio anterior a `before`. Sin commit.
+
+    Devuelve cuántos movió (0 = no queda nada por archivar).
+    """
+    ids = list(db.session.execute(
+        select(Timeslot.id).where(Timeslot.start < before).order_by(Timeslot.id).limit(batch_size)
+    ).scalars())
+    if not ids:
+        return 0
+
+    first, last = db.session.execute(
+        select(func.min(Timeslot.start), func.max(Timeslot.start)).where(Timeslot.id.in_(ids))
+    ).one()
+    # La sesión puede devolver los timestamps en su zona horaria: el mes de la partición es el UTC
+    ensure_partitions(utc_day(first), utc_day(last))
+
+    source = select(
+        *(getattr(Timeslot, c) for c in _COLUMNS),
+        literal(datetime.now(timezone.utc), TimeslotArchive.archived_at.type),
+    ).where(Timeslot.id.in_(ids))
+    db.session.execute(insert(TimeslotArchive).from_select([*_COLUMNS, "archived_at"], source))
+    db.session.execute(delete(Subscription).where(Subscription.timeslot_id.in_(ids)))
+    db.session.execute(
+        delete(Timeslot).where(Timeslot.id.in_(ids)), execution_options={"synchronize_session": False}
+    )
+    return len(ids)
+
+
+def archive_partitions() -> list[tuple[str, date]]:
+    """Particiones mensuales enganchadas al histórico: [(nombre, mes)], de la más vieja a la más nueva."""
+    if not _is_postgres():
+        return []
+    rows = db.session.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": TimeslotArchive.__tablename__}).scalars()
+    prefix = f"{TimeslotArchive.__tablename__}_"
+    partitions = []
+    for name in rows:
+        try:
+            month = datetime.strptime(name[len(prefix):], "%Y_%m").date()
+        except ValueError:
+            continue
+        partitions.append((name, month))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def detach_partitions(keep_months: int, today: date | None = None) -> list[str]:
+    """Desengancha las particiones anteriores a los últimos `keep_months` meses. Sin commit.
+
+    Las tablas desenganchadas quedan sueltas para volcarlas (pg_dump) y borrarlas.
+    """
+    month = month_start(today or datetime.now(timezone.utc).date())
+    for _ in range(max(keep_months, 0)):
+        month = (month - timedelta(days=1)).replace(day=1)
+    detached = []
+    for name, partition_month in archive_partitions():
+        if partition_month < month:
+            db.session.execute(text(f"ALTER TABLE {TimeslotArchive.__tablename__} DETACH PARTITION {name}"))
+            detached.append(name)
+    return detached
@@ -0,0 +1,216 @@
+"""Acciones masivas de administración sobre turnos (confirmar, liberar, bloquear, borrar).
+
+Cada acción es un único UPDATE/DELETE ... RETURNING restringido por la
+selección (lista de ids o filtro), por los estados de origen válidos para la
+acción y por el alcance del admin (solo turnos de canchas de sus complejos;
+los turnos de servicios quedan para superadmin, como en las acciones
+individuales). Los turnos que no cumplen se omiten.
+
+Como no pasa por el ORM, las claves de las filas devueltas se registran a
+mano (ver timeslot_keys): al confirmar actualizan el resumen diario e
+invalidan la caché de disponibilidad. No hace commit; después del commit
+`clear_holds` borra de Redis los holds de los turnos que salieron de HOLDING.
+"""
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from flask import current_app
+from sqlalchemy import delete, exists, select, update
+
+from app import db
+from app.models import Field, Subscription, Timeslot, TimeslotStatus
+from app.services.access_scope import AccessScope
+from app.services.availability_cache import mark_changed
+from app.services.timeslot_keys import ENTITY_COLUMNS, Key
+
+BULK_MAX_IDS = 500
+
+# acción -> estados desde los que se aplica
+SOURCE_STATUSES = {
+    "confirm": (TimeslotStatus.HOLDING,),
+    "release": (TimeslotStatus.HOLDING, TimeslotStatus.RESERVED, TimeslotStatus.BLOCKED),
+    "block": (TimeslotStatus.AVAILABLE, TimeslotStatus.HOLDING),
+    "delete": (TimeslotStatus.AVAILABLE, TimeslotStatus.BLOCKED),
+}
+
+# columnas de filtro admitidas (además de ids y ventana de inicio)
+FILTER_COLUMNS = ("field_id", "service_id", "professional_id", "beauty_center_id")
+
+
+class BulkSelectionError(ValueError):
+    """Selección vacía o inválida para una acción masiva."""
+
+
+@dataclass(frozen=True)
+class BulkSelection:
+    ids: tuple[int, ...] = ()
+    complex_id: int | None = None
+    field_id: int | None = None
+    service_id: int | None = None
+    professional_id: int | None = None
+    beauty_center_id: int | None = None
+    start_from: datetime | None = None
+    start_to: datetime | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.ids and self.complex_id is None and all(
+            getattr(self, name) is None for name in (*FILTER_COLUMNS, "start_from", "start_to")
+        )
+
+
+@dataclass(frozen=True)
+class BulkResult:
+    action: str
+    ids: list[int]
+    # turnos que pasaron a disponibles (para avisar a suscriptos)
+    freed_ids: list[int]
+    # turnos que pudieron salir de HOLDING (su clave hold:timeslot:{id} sobra)
+    hold_ids: list[int]
+
+
+def _parse_datetime(value) -> datetime | None:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value))
+    except ValueError:
+        raise BulkSelectionError(f"Fecha inválida: {value}")
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _parse_int(value) -> int | None:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise BulkSelectionError(f"Id inválido: {value}")
+
+
+def parse_selection(data: dict, ids: list | None = None) -> BulkSelection:
+    """Arma la selección desde el payload (JSON o form); `ids` puede venir aparte (form)."""
+    raw_ids = ids if ids is not None else data.get("ids") or []
+    if isinstance(raw_ids, (str, int)):
+        raw_ids = str(raw_ids).split(",")
+    parsed = tuple(sorted({i for i in (_parse_int(v) for v in raw_ids) if i is not None}))
+    if len(parsed) > BULK_MAX_IDS:
+        raise BulkSelectionError(f"Máximo {BULK_MAX_IDS} turnos por operación")
+    selection = BulkSelection(
+        ids=parsed,
+        complex_id=_parse_int(data.get("complex_id")),
+        **{name: _parse_int(data.get(name)) for name in FILTER_COLUMNS},
+        start_from=_parse_datetime(data.get("start_from")),
+        start_to=_parse_datetime(data.get("start_to")),
+    )
+    if selection.is_empty:
+        raise BulkSelectionError("Indicá ids o al menos un filtro")
+    return selection
+
+
+def _selection_criteria(selection: BulkSelection) -> list:
+    criteria = []
+    if selection.ids:
+        criteria.append(Timeslot.id.in_(selection.ids))
+    if selection.complex_id is not None:
+        criteria.append(Timeslot.field_id.in_(select(Field.id).where(Field.complex_id == selection.complex_id)))
+    for name in FILTER_COLUMNS:
+        value = getattr(selection, name)
+        if value is not None:
+            criteria.append(getattr(Timeslot, name) == value)
+    if selection.start_from is not None:
+        criteria.append(Timeslot.start >= selection.start_from)
+    if selection.start_to is not None:
+        criteria.append(Timeslot.start < selection.start_to)
+    return criteria
+
+
+def _scope_criteria(scope: AccessScope) -> list:
+    if scope.is_superadmin:
+        return []
+    return [Timeslot.field_id.in_(select(Field.id).where(Field.complex_id.in_(scope.complex_ids)))]
+
+
+def out_of_scope_ids(selection: BulkSelection, scope: AccessScope) -> list[int]:
+    """Ids pedidos explícitamente que existen pero el usuario no puede gestionar."""
+    if scope.is_superadmin or not selection.ids:
+        return []
+    (in_scope,) = _scope_criteria(scope)
+    stmt = select(Timeslot.id).where(Timeslot.id.in_(selection.ids), ~in_scope)
+    return list(db.session.execute(stmt).scalars())
+
+
+def _reservation_code() -> str:
+    """Código de reserva de 8 caracteres, igual que en la confirmación individual."""
+    return str(uuid.uuid4())[:8].upper()
+
+
+def _returned_keys(rows) -> set[Key]:
+    keys: set[Key] = set()
+    for row in rows:
+        day = (row.start.astimezone(timezone.utc) if row.start.tzinfo else row.start).date()
+        for entity_type, column in ENTITY_COLUMNS.items():
+            entity_id = getattr(row, column)
+            if entity_id is not None:
+                keys.add((entity_type, entity_id, day))
+    return keys
+
+
+def apply_bulk(action: str, selection: BulkSelection, scope: AccessScope) -> BulkResult:
+    """Aplica `action` a los turnos seleccionados dentro del alcance (sin commit)."""
+    if action not in SOURCE_STATUSES:
+        raise BulkSelectionError(f"Acción inválida: {action}")
+    criteria = [
+        *_selection_criteria(selection),
+        *_scope_criteria(scope),
+        Timeslot.status.in_(SOURCE_STATUSES[action]),
+    ]
+    returning = (Timeslot.id, Timeslot.start, *(getattr(Timeslot, c) for c in ENTITY_COLUMNS.values()))
+
+    if action == "delete":
+        # Los turnos con suscripciones de espera no se borran
+        criteria.append(~exists().where(Subscription.timeslot_id == Timeslot.id))
+        stmt = delete(Timeslot).where(*criteria)
+    else:
+        values = {"reservation_code": None}
+        if action == "confirm":
+            # El código (distinto por turno) se escribe después, con las filas devueltas
+            values = {"status": TimeslotStatus.RESERVED}
+        elif action == "release":
+            values["status"] = TimeslotStatus.AVAILABLE
+        else:
+            values["status"] = TimeslotStatus.BLOCKED
+        stmt = update(Timeslot).where(*criteria).values(**values)
+
+    rows = db.session.execute(
+        stmt.returning(*returning), execution_options={"synchronize_session": False}
+    ).all()
+
+    if action == "confirm" and rows:
+        db.session.execute(
+            update(Timeslot),
+            [{"id": row.id, "reservation_code": _reservation_code()} for row in rows],
+            execution_options={"synchronize_session": False},
+        )
+
+    keys = _returned_keys(rows)
+    if keys:
+        mark_changed(db.session, keys)
+    ids = sorted(row.id for row in rows)
+    held = TimeslotStatus.HOLDING in SOURCE_STATUSES[action] and action != "delete"
+    return BulkResult(action=action, ids=ids, freed_ids=ids if action == "release" else [],
+                      hold_ids=ids if held else [])
+
+
+def clear_holds(ids: list[int]) -> None:
+    """Borra las claves de hold en Redis de turnos que ya no están en HOLDING (después del commit)."""
+    if not ids:
+        return
+    try:
+        for i in range(0, len(ids), BULK_MAX_IDS):
+            current_app.redis.delete(*(f"hold:timeslot:{tid}" for tid in ids[i:i + BULK_MAX_IDS]))
+    except Exception as _e:
+        current_app.logger.warning(f"Bulk hold cleanup failed: {_e}")
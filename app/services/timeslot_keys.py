@@ -0,0 +1,65 @@
+"""Claves (entity_type, entity_id, día UTC) afectadas por cambios de Timeslot.
+
+La caché de disponibilidad invalida por estas claves y el resumen diario
+(availability_daily) recalcula con ellas: en cada flush se toman las de los
+slots nuevos, modificados (valores nuevos y anteriores) y borrados. Las
+operaciones que no pasan por el ORM (acciones masivas, materializador de
+plantillas) arman sus claves con las filas que escriben y las registran con
+`availability_cache.mark_changed`.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+from sqlalchemy import inspect
+
+from app.models import Timeslot
+
+# entity_type -> columna de Timeslot que referencia a la entidad
+ENTITY_COLUMNS = {
+    "field": "field_id",
+    "beauty_center": "beauty_center_id",
+    "professional": "professional_id",
+    "service": "service_id",
+}
+
+Key = tuple[str, int, date]
+
+
+def _utc_date(dt: datetime) -> date:
+    return (dt.astimezone(timezone.utc) if dt.tzinfo else dt).date()
+
+
+def _values(ts: Timeslot, attr: str, previous: bool) -> list:
+    """Valor actual del atributo o, con `previous`, los valores reemplazados en este flush."""
+    if not previous:
+        return [getattr(ts, attr)]
+    return list(inspect(ts).attrs[attr].history.deleted or ())
+
+
+def timeslot_keys(ts: Timeslot, previous: bool = False) -> set[Key]:
+    """Claves (entity_type, entity_id, día UTC) de un slot; con `previous`, las de antes del cambio."""
+    keys: set[Key] = set()
+    starts = _values(ts, "start", previous) or ([ts.start] if previous else [])
+    for entity_type, column in ENTITY_COLUMNS.items():
+        ids = _values(ts, column, previous) or ([getattr(ts, column)] if previous else [])
+        for entity_id in ids:
+            for start in starts:
+                if entity_id is not None and start is not None:
+                    keys.add((entity_type, entity_id, _utc_date(start)))
+    return keys
+
+
+def flushed_timeslot_keys(session) -> set[Key]:
+    """Claves tocadas por los Timeslots nuevos, modificados o borrados del flush en curso."""
+    keys: set[Key] = set()
+    for obj in session.new:
+        if isinstance(obj, Timeslot):
+            keys |= timeslot_keys(obj)
+    for obj in session.dirty:
+        if isinstance(obj, Timeslot) and session.is_modified(obj, include_collections=False):
+            keys |= timeslot_keys(obj) | timeslot_keys(obj, previous=True)
+    for obj in session.deleted:
+        if isinstance(obj, Timeslot):
+            keys |= timeslot_keys(obj)
+    return keys
@@ -0,0 +1,228 @@
+"""Turnos virtuales: slots libres calculados al vuelo desde plantillas en modo `virtual`.
+
+Una plantilla virtual no escribe turnos libres en `timeslots`. Sus slots se
+calculan para la ventana pedida con la regla de la plantilla, y se descartan los
+que se solapan con filas guardadas de la misma entidad (reservas, holds,
+bloqueos o turnos cargados a mano). La fila recién se escribe cuando alguien
+pone el slot en espera (`materialize_virtual`).
+
+Un slot virtual se identifica con `v<schedule_id>-<epoch del inicio>`; las
+vistas públicas lo muestran mezclado con los turnos guardados y
+`api.hold_timeslot` acepta ese id.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models import Category, Field, Schedule, Service, Timeslot, TimeslotStatus
+from app.models_catalog import BeautyCenter
+from app.services.timeslot_keys import ENTITY_COLUMNS
+from app.services.schedules import (
+    day_slots,
+    free_candidates,
+    schedule_entity,
+    schedule_slots,
+    slot_values,
+)
+
+# Ventana por defecto de los listados sin fecha
+VIRTUAL_WINDOW_DAYS = 14
+
+_ID_RE = re.compile(r"^v(\d+)-(\d+)$")
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def virtual_id(schedule_id: int, start: datetime) -> str:
+    return f"v{schedule_id}-{int(start.timestamp())}"
+
+
+def parse_virtual_id(value) -> tuple[int, datetime] | None:
+    """(schedule_id, inicio UTC) de un id virtual; None si no lo es."""
+    match = _ID_RE.match(str(value or "").strip())
+    if not match:
+        return None
+    return int(match.group(1)), datetime.fromtimestamp(int(match.group(2)), tz=timezone.utc)
+
+
+@dataclass(frozen=True)
+class VirtualSlot:
+    """Slot libre no guardado; expone los atributos de Timeslot que usan las vistas."""
+    schedule: Schedule
+    start: datetime
+    end: datetime
+
+    status = TimeslotStatus.AVAILABLE
+    reservation_code = None
+    is_virtual = True
+
+    @property
+    def id(self) -> str:
+        return virtual_id(self.schedule.id, self.start)
+
+    def __getattr__(self, name):
+        # Entidad, servicio, precio y moneda vienen de la plantilla
+        if name in ("field", "service", "professional", "beauty_center", "price", "currency",
+                    "field_id", "service_id", "professional_id", "beauty_center_id"):
+            return getattr(self.schedule, name)
+        raise AttributeError(name)
+
+
+def virtual_schedules():
+    """Consulta de plantillas virtuales activas, con lo que muestran los listados."""
+    return (
+        Schedule.query
+        .options(
+            joinedload(Schedule.field).joinedload(Field.complex),
+            joinedload(Schedule.service).joinedload(Service.category),
+            joinedload(Schedule.professional),
+            joinedload(Schedule.beauty_center),
+        )
+        .filter(Schedule.mode == "virtual", Schedule.is_active.is_(True))
+    )
+
+
+def public_virtual_schedules(category: str = "", complex_slug: str = "", beauty_slug: str = "",
+                             sport_service: str = "") -> list[Schedule]:
+    """Plantillas virtuales visibles con los mismos filtros que los listados públicos."""
+    query = virtual_schedules()
+    if complex_slug and category not in ("", "deportes"):
+        # Las plantillas de servicios no pertenecen a un complejo
+        return []
+    if category == "deportes" or complex_slug:
+        query = query.join(Field, Field.id == Schedule.field_id).filter(Field.show_public_booking.is_(True))
+        if complex_slug:
+            query = query.filter(Field.complex.has(slug=complex_slug))
+        if sport_service:
+            query = query.filter(Field.sport.ilike(f"%{sport_service}%"))
+    elif category:
+        query = (
+            query.join(Service, Service.id == Schedule.service_id)
+            .join(Category, Category.id == Service.category_id)
+            .filter(Category.slug == category)
+        )
+        if beauty_slug and category == "estetica":
+            query = query.join(BeautyCenter, BeautyCenter.id == Schedule.beauty_center_id).filter(
+                BeautyCenter.slug == beauty_slug
+            )
+        if sport_service:
+            query = query.filter(Service.name.ilike(f"%{sport_service}%"))
+    elif sport_service:
+        return []
+    return query.order_by(Schedule.id).all()
+
+
+def _stored_intervals(schedules: list[Schedule], first: datetime, last: datetime) -> dict:
+    """Slots guardados (cualquier estado) de las entidades de las plantillas: una consulta por tipo."""
+    wanted: dict[str, set[int]] = {}
+    for schedule in schedules:
+        entity_type, entity_id = schedule_entity(schedule)
+        wanted.setdefault(entity_type, set()).add(entity_id)
+    stored: dict[tuple[str, int], list] = {}
+    for entity_type, ids in wanted.items():
+        column = getattr(Timeslot, ENTITY_COLUMNS[entity_type])
+        rows = db.session.execute(
+            select(column, Timeslot.start, Timeslot.end)
+            .where(column.in_(ids), Timeslot.start < last, Timeslot.end > first)
+            .order_by(Timeslot.start)
+        )
+        for entity_id, start, end in rows:
+            stored.setdefault((entity_type, entity_id), []).append((_as_utc(start), _as_utc(end)))
+    return stored
+
+
+def virtual_slots(schedules: list[Schedule], start: datetime, end: datetime,
+                  now: datetime | None = None) -> list[VirtualSlot]:
+    """Slots virtuales libres con inicio en [start, end) y posterior a `now`, ordenados por inicio."""
+    now = now or datetime.now(timezone.utc)
+    start = max(_as_utc(start), now)
+    end = _as_utc(end)
+    if not schedules or end <= start:
+        return []
+    first_day = start.date()
+    last_day = (end - timedelta(microseconds=1)).date()
+    day_start = datetime.combine(first_day, datetime.min.time()).replace(tzinfo=timezone.utc)
+    day_end = datetime.combine(last_day + timedelta(days=1), datetime.min.time()).replace(tzinfo=timezone.utc)
+    taken = _stored_intervals(schedules, day_start, day_end)
+
+    slots: list[VirtualSlot] = []
+    for schedule in schedules:
+        key = schedule_entity(schedule)
+        candidates = [c for c in schedule_slots(schedule, first_day, last_day) if start <= c[0] < end and c[0] > now]
+        busy = taken.setdefault(key, [])
+        accepted, _ = free_candidates(candidates, busy)
+        # Dos plantillas de la misma entidad no ofrecen el mismo horario
+        busy.extend(accepted)
+        busy.sort()
+        slots.extend(VirtualSlot(schedule, slot_start, slot_end) for slot_start, slot_end in accepted)
+    slots.sort(key=lambda s: (s.start, s.id))
+    return slots
+
+
+def entity_virtual_slots(column: str, entity_id: int, start: datetime, end: datetime,
+                         **extra_filters) -> list[VirtualSlot]:
+    """Slots virtuales de las plantillas con `column == entity_id` (y filtros extra por columna)."""
+    query = virtual_schedules().filter(getattr(Schedule, column) == entity_id)
+    for name, value in extra_filters.items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            query = query.filter(getattr(Schedule, name).in_(value))
+        else:
+            query = query.filter(getattr(Schedule, name) == value)
+    return virtual_slots(query.order_by(Schedule.id).all(), start, end)
+
+
+def find_virtual(value) -> VirtualSlot | None:
+    """Slot virtual del id si sigue libre y en el futuro; None si no."""
+    parsed = parse_virtual_id(value)
+    if parsed is None:
+        return None
+    schedule_id, start = parsed
+    schedule = virtual_schedules().filter(Schedule.id == schedule_id).first()
+    if schedule is None:
+        return None
+    found = virtual_slots([schedule], start, start + timedelta(seconds=1))
+    return found[0] if found and found[0].start == start else None
+
+
+def materialize_virtual(value) -> Timeslot | None:
+    """Escribe el slot virtual como Timeslot AVAILABLE (sin commit); None si ya no está libre.
+
+    La plantilla se bloquea (FOR UPDATE) para que dos holds simultáneos del
+    mismo slot no escriban dos filas.
+    """
+    parsed = parse_virtual_id(value)
+    if parsed is None:
+        return None
+    schedule_id, start = parsed
+    schedule = (
+        Schedule.query
+        .filter(Schedule.id == schedule_id, Schedule.mode == "virtual", Schedule.is_active.is_(True))
+        .with_for_update()
+        .first()
+    )
+    if schedule is None or start <= datetime.now(timezone.utc):
+        return None
+    slot = next(((s, e) for s, e in day_slots(schedule, start.date()) if s == start), None)
+    if slot is None:
+        return None
+
+    entity_type, entity_id = schedule_entity(schedule)
+    column = getattr(Timeslot, ENTITY_COLUMNS[entity_type])
+    clash = db.session.execute(
+        select(Timeslot.id).where(column == entity_id, Timeslot.start < slot[1], Timeslot.end > slot[0]).limit(1)
+    ).first()
+    if clash:
+        return None
+
+    ts = Timeslot(**slot_values(schedule), start=slot[0], end=slot[1])
+    db.session.add(ts)
+    db.session.flush()
+    return ts
@@ -4,11 +4,70 @@ from app.models import Timeslot, Field, Service, Complex, Category, Subscription
 from app.models_catalog import BeautyCenter, beauty_center_services
 from app.utils import validate_category, validate_span, validate_status, validate_date_format, validate_email, clean_text
 from app.services.notification_service import NotificationService
+from app.services.availability_cache import cached_availability, dump_starts, load_starts
+from app.services.day_booking import reserve_day
+from app.services.read_replica import read_only, use_primary
+from app.services.day_calendar import day_calendar, clamp_calendar_days
+from app.services.virtual_slots import VIRTUAL_WINDOW_DAYS, find_virtual, public_virtual_schedules, virtual_slots
+from app.services.availability_service import (
+    professional_starts,
+    beauty_center_range,
+    beauty_center_day,
+    day_bounds,
+    clamp_days,
+    day_summaries,
+    next_available,
+)
 from app import db, limiter
 from datetime import datetime, timedelta, timezone
+from heapq import merge
+from itertools import islice
 from sqlalchemy import and_, or_
 
+
+def _start_utc(timeslot):
+    start = timeslot.start
+    return start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+
+
+def _expire_stale_holds(timeslots):
+    """Libera los HOLDING listados cuya clave de hold en Redis ya no existe."""
+    try:
+        stale = [
+            t.id for t in timeslots
+            if getattr(t, 'status', None) == TimeslotStatus.HOLDING
+            and not current_app.redis.get(f"hold:timeslot:{t.id}")
+        ]
+        if not stale:
+            return
+        # El listado pudo leerse de la réplica: se confirma el estado en el primario
+        use_primary()
+        expired = Timeslot.query.filter(
+            Timeslot.id.in_(stale), Timeslot.status == TimeslotStatus.HOLDING
+        ).populate_existing().all()
+        for t in expired:
+            t.status = TimeslotStatus.AVAILABLE
+            t.reservation_code = None
+        if expired:
+            db.session.commit()
+    except Exception as _e:
+        current_app.logger.warning(f"Lazy expire holds failed: {_e}")
+
+
+def _public_virtual_slots(category, complex_slug, beauty_slug, sport_service, start, end, now):
+    """Slots virtuales libres de plantillas visibles con los filtros del listado."""
+    if category and not validate_category(category):
+        category = ''
+    schedules = public_virtual_schedules(
+        category=category,
+        complex_slug=clean_text(complex_slug, 200) if complex_slug else '',
+        beauty_slug=clean_text(beauty_slug, 200) if beauty_slug else '',
+        sport_service=clean_text(sport_service, 100) if sport_service else '',
+    )
+    return virtual_slots(schedules, start, end, now)
+
 @bp.route('/turnos_table')
+@read_only
 def turnos_table():
     """HTMX partial for day view turnos table"""
     # Get and validate parameters
@@ -54,6 +113,7 @@ def turnos_table():
 
     # Build query
     query = Timeslot.query
+    target_date = None
     
     # Date filter
     if date_str and validate_date_format(date_str):
@@ -127,28 +187,31 @@ def turnos_table():
 
     # Order and paginate
     query = query.order_by(Timeslot.start)
+
+    # Free slots of virtual schedules are computed for the window and merged in start order
+    virtual = []
+    if status_filter in (None, 'available'):
+        if target_date:
+            window_start = datetime.combine(target_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+            window_end = window_start + timedelta(days=1)
+        else:
+            window_start, window_end = now, now + timedelta(days=VIRTUAL_WINDOW_DAYS)
+        virtual = _public_virtual_slots(category, complex_slug, beauty_slug, sport_service,
+                                        window_start, window_end, now)
     
     # Get total count for pagination
-    total = query.count()
+    total = query.count() + len(virtual)
     
     # Apply pagination
     offset = (page - 1) * limit
-    timeslots = query.offset(offset).limit(limit).all()
+    if virtual:
+        stored = query.limit(offset + limit).all()
+        timeslots = list(islice(merge(stored, virtual, key=_start_utc), offset, offset + limit))
+    else:
+        timeslots = query.offset(offset).limit(limit).all()
 
     # Lazy-expire HOLDING timeslots if Redis TTL key is missing
-    changed = False
-    try:
-        for t in timeslots:
-            if getattr(t, 'status', None) == TimeslotStatus.HOLDING:
-                key = f"hold:timeslot:{t.id}"
-                if not current_app.redis.get(key):
-                    t.status = TimeslotStatus.AVAILABLE
-                    t.reservation_code = None
-                    changed = True
-        if changed:
-            db.session.commit()
-    except Exception as _e:
-        current_app.logger.warning(f"Lazy expire holds failed: {_e}")
+    _expire_stale_holds(timeslots)
     
     # Calculate pagination info
     has_next = total > (page * limit)
@@ -181,7 +244,27 @@ def reservation_modal(timeslot_id: int):
         message=None
     )
 
+@bp.get('/timeslots/virtual/<slot_id>/modal')
+def virtual_reservation_modal(slot_id: str):
+    """HTMX partial: confirmation modal for a slot computed from a virtual schedule."""
+    slot = find_virtual(slot_id)
+    if slot is None:
+        return render_template(
+            'partials/_reservation_modal.html',
+            timeslot=None,
+            message='El turno ya no está disponible.'
+        )
+    if slot.field and not getattr(slot.field, 'show_public_booking', True):
+        abort(403)
+
+    return render_template(
+        'partials/_reservation_modal.html',
+        timeslot=slot,
+        message=None
+    )
+
 @bp.route('/turnos_table_grouped')
+@read_only
 def turnos_table_grouped():
     """HTMX partial for week view turnos table grouped by day"""
     # Get and validate parameters
@@ -296,21 +379,14 @@ def turnos_table_grouped():
     
     # Get timeslots
     timeslots = query.order_by(Timeslot.start).all()
+    if status_filter in (None, 'available'):
+        window_start = datetime.combine(week_start, datetime.min.time()).replace(tzinfo=timezone.utc)
+        virtual = _public_virtual_slots(category, complex_slug, beauty_slug, sport_service,
+                                        window_start, window_start + timedelta(days=7), now)
+        timeslots = list(merge(timeslots, virtual, key=_start_utc))
 
     # Lazy-expire HOLDING timeslots if Redis TTL key is missing
-    changed = False
-    try:
-        for t in timeslots:
-            if getattr(t, 'status', None) == TimeslotStatus.HOLDING:
-                key = f"hold:timeslot:{t.id}"
-                if not current_app.redis.get(key):
-                    t.status = TimeslotStatus.AVAILABLE
-                    t.reservation_code = None
-                    changed = True
-        if changed:
-            db.session.commit()
-    except Exception as _e:
-        current_app.logger.warning(f"Lazy expire holds failed: {_e}")
+    _expire_stale_holds(timeslots)
 
     # Group by day and compute simple counters per status for headers
     grouped_timeslots = {}
@@ -330,6 +406,7 @@ def turnos_table_grouped():
         day_counts=day_counts,
         week_start=week_start,
         week_end=week_end,
+        week_last=week_end - timedelta(days=1),
     )
 
 @bp.route('/subscribe', methods=['POST'])
@@ -377,13 +454,70 @@ def subscribe():
                              message='Datos inválidos.')
 
 
+def _selected_services(service_ids_raw: list[str]) -> tuple[list[int], list, int]:
+    """Servicios seleccionados (soporta múltiples) y la suma de sus duraciones."""
+    try:
+        service_ids = [int(sid) for sid in service_ids_raw if sid]
+    except ValueError:
+        service_ids = []
+    services = Service.query.filter(Service.id.in_(service_ids)).all() if service_ids else []
+    total_duration_min = sum(int(getattr(s, 'duration_min', 0) or 0) for s in services)
+    return service_ids, services, total_duration_min
+
+
+def _range_window():
+    """Ventana pedida para las vistas por rango: (primer día, cantidad de días)."""
+    start_str = request.args.get('start', '')
+    first_day = datetime.now(timezone.utc).date()
+    if start_str and validate_date_format(start_str):
+        try:
+            first_day = datetime.strptime(start_str, '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    return first_day, clamp_days(request.args.get('days', type=int))
+
+
+def _window_days(first_day, days):
+    return [first_day + timedelta(days=i) for i in range(days)]
+
+
+def _range_response(starts, first_day, days, form_id, message=None, status=400):
+    """Heat-map HTMX de disponibilidad por día, o JSON con `format=json`.
+
+    En JSON `counts_only=1` omite los horarios y deja solo la cantidad por día;
+    con `message` responde error con `status` (el partial HTMX siempre es 200).
+    """
+    summaries = day_summaries(starts, first_day, days, include_starts=request.args.get('counts_only') != '1')
+    next_day = next_available(summaries)
+    if request.args.get('format') == 'json':
+        if message:
+            return jsonify({'error': message}), status
+        for entry in summaries:
+            entry['date'] = entry['date'].isoformat()
+            if 'starts' in entry:
+                entry['starts'] = [dt.isoformat() for dt in entry['starts']]
+        return jsonify({
+            'start': first_day.isoformat(),
+            'days': summaries,
+            'next_available': next_day.isoformat() if next_day else None,
+        })
+    max_count = max((s['count'] for s in summaries), default=0)
+    return render_template('partials/_availability_range.html',
+                           days=summaries if not message else [],
+                           max_count=max_count,
+                           next_available=next_day,
+                           form_id=form_id,
+                           message=message)
+
+
 @bp.get('/beauty/availability')
+@read_only
 def beauty_availability():
     """HTMX partial: available start times for a BeautyCenter given selected service(s) and date.
 
-    MVP: soporta un único servicio. Combos se agregarán en una iteración posterior.
+    - Combos: suma las duraciones de los servicios seleccionados.
     - Usa Timeslot como fuente de verdad (status AVAILABLE) para el centro.
-    - Granularidad derivada de los slots existentes (ideal 15 minutos cuando esté configurado).
+    - Granularidad: MCD de las duraciones de los slots (ver services.availability).
     """
     beauty_slug = clean_text(request.args.get('beauty_slug', ''), 200)
     service_ids_raw = request.args.getlist('service_id') or []
@@ -417,15 +551,7 @@ def beauty_availability():
                                services=[],
                                message='Fecha inválida.')
 
-    # Servicios seleccionados (soporta múltiples; suma duraciones)
-    try:
-        service_ids = [int(sid) for sid in service_ids_raw if sid]
-    except ValueError:
-        service_ids = []
-
-    services = []
-    if service_ids:
-        services = Service.query.filter(Service.id.in_(service_ids)).all()
+    service_ids, services, total_duration_min = _selected_services(service_ids_raw)
     if not services:
         return render_template('partials/_availability.html',
                                center=center,
@@ -433,10 +559,6 @@ def beauty_availability():
                                services=[],
                                message='Seleccioná al menos un servicio.')
 
-    # Duración total requerida
-    total_duration_min = 0
-    for s in services:
-        total_duration_min += int(getattr(s, 'duration_min', 0) or 0)
     if total_duration_min <= 0:
         return render_template('partials/_availability.html',
                                center=center,
@@ -444,123 +566,57 @@ def beauty_availability():
                                services=services,
                                message='Los servicios seleccionados no tienen duración configurada.')
 
-    # Ventana del día
-    day_start = datetime.combine(day, datetime.min.time()).replace(tzinfo=timezone.utc)
-    day_end = day_start + timedelta(days=1)
-
-    # Buscar profesionales del centro que puedan cubrir TODOS los servicios
-    # Nota: el admin define qué staff puede hacer cada servicio (professional_services)
-    pros = list(getattr(center, 'professionals', []) or [])
-    if pros:
-        service_id_set = set(service_ids)
-        capable_pros = []
-        for p in pros:
-            try:
-                p_services = {s.id for s in getattr(p, 'linked_services', []) or []}
-            except Exception:
-                p_services = set()
-            if service_id_set.issubset(p_services):
-                capable_pros.append(p)
-    else:
-        capable_pros = []
-
-    if capable_pros:
-        # Disponibilidad por profesional
-        grouped: dict[int, list[datetime]] = {}
-        for p in capable_pros:
-            q = (
-                Timeslot.query
-                .filter(
-                    Timeslot.start >= day_start,
-                    Timeslot.start < day_end,
-                    Timeslot.status == TimeslotStatus.AVAILABLE,
-                    Timeslot.beauty_center_id == center.id,
-                    Timeslot.professional_id == p.id,
-                )
-            )
-            # Acotar por servicios cuando el slot traiga service_id
-            if service_ids:
-                q = q.filter(
-                    or_(
-                        Timeslot.service_id.is_(None),
-                        Timeslot.service_id.in_(service_ids)
-                    )
-                )
-            slots = q.order_by(Timeslot.start).all()
-
-            starts_for_p: list[datetime] = []
-            if slots:
-                merged: list[tuple[datetime, datetime]] = []
-                cur_start = slots[0].start
-                cur_end = slots[0].end
-                for ts in slots[1:]:
-                    if ts.start <= cur_end:
-                        if ts.end > cur_end:
-                            cur_end = ts.end
-                    else:
-                        merged.append((cur_start, cur_end))
-                        cur_start, cur_end = ts.start, ts.end
-                merged.append((cur_start, cur_end))
-
-                for (w_start, w_end) in merged:
-                    cursor = w_start
-                    # inferir step desde el primer slot del profesional
-                    step = 15
-                    if slots:
-                        step = max(1, int((slots[0].end - slots[0].start).total_seconds() // 60))
-                    while cursor + timedelta(minutes=total_duration_min) <= w_end:
-                        starts_for_p.append(cursor)
-                        cursor += timedelta(minutes=step)
-
-            grouped[p.id] = starts_for_p
-
+    # Staff capaz y sus inicios del día (o los del centro sin staff), cacheado por centro+día
+    data = cached_availability(
+        'beauty_center', center.id, [day], ('day', sorted(service_ids), total_duration_min),
+        lambda: beauty_center_day(center.id, service_ids, total_duration_min, day),
+    )
+    if data['professionals']:
+        grouped = {int(pid): load_starts(starts) for pid, starts in data['starts'].items()}
         return render_template('partials/_availability_staff.html',
                                center=center,
                                services=services,
-                               professionals=capable_pros,
+                               professionals=data['professionals'],
                                grouped_starts=grouped)
 
     # Fallback sin profesionales configurados: mismo cálculo general del MVP
-    q = (
-        Timeslot.query
-        .filter(
-            Timeslot.start >= day_start,
-            Timeslot.start < day_end,
-            Timeslot.status == TimeslotStatus.AVAILABLE,
-            Timeslot.beauty_center_id == center.id,
-        )
-    )
-    slots = q.order_by(Timeslot.start).all()
-
-    available_starts: list[datetime] = []
-    if slots:
-        merged: list[tuple[datetime, datetime]] = []
-        cur_start = slots[0].start
-        cur_end = slots[0].end
-        for ts in slots[1:]:
-            if ts.start <= cur_end:
-                if ts.end > cur_end:
-                    cur_end = ts.end
-            else:
-                merged.append((cur_start, cur_end))
-                cur_start, cur_end = ts.start, ts.end
-        merged.append((cur_start, cur_end))
-
-        for (w_start, w_end) in merged:
-            cursor = w_start
-            step = 15
-            if slots:
-                step = max(1, int((slots[0].end - slots[0].start).total_seconds() // 60))
-            while cursor + timedelta(minutes=total_duration_min) <= w_end:
-                available_starts.append(cursor)
-                cursor += timedelta(minutes=step)
-
     return render_template('partials/_availability.html',
                            center=center,
-                           available_starts=available_starts,
+                           available_starts=load_starts(data['starts']),
                            services=services,
                            message=None)
 
+@bp.get('/beauty/availability_range')
+@read_only
+def beauty_availability_range():
+    """Disponibilidad de un BeautyCenter por día para una ventana (heat-map y "próximo disponible").
+
+    Inputs: beauty_slug, service_id (múltiple), start (YYYY-MM-DD, hoy por defecto),
+    days (14 por defecto); format=json y counts_only=1 opcionales.
+    Carga los slots de toda la ventana en una consulta.
+    """
+    beauty_slug = clean_text(request.args.get('beauty_slug', ''), 200)
+    first_day, days = _range_window()
+
+    center = BeautyCenter.query.filter_by(slug=beauty_slug).first()
+    if not center:
+        return _range_response([], first_day, days, 'service-first-form', 'Centro no encontrado.', 404)
+    if not getattr(center, 'show_public_booking', True):
+        abort(403)
+
+    service_ids, services, total_duration_min = _selected_services(request.args.getlist('service_id'))
+    if not services:
+        return _range_response([], first_day, days, 'service-first-form', 'Seleccioná al menos un servicio.')
+    if total_duration_min <= 0:
+        return _range_response([], first_day, days, 'service-first-form',
+                               'Los servicios seleccionados no tienen duración configurada.')
+
+    starts = load_starts(cached_availability(
+        'beauty_center', center.id, _window_days(first_day, days), ('range', sorted(service_ids), total_duration_min),
+        lambda: dump_starts(beauty_center_range(center.id, service_ids, total_duration_min, first_day, days)),
+    ))
+    return _range_response(starts, first_day, days, 'service-first-form')
+
 @bp.route('/subscribe_criteria', methods=['POST'])
 @limiter.limit("3 per minute")
 def subscribe_criteria():
@@ -623,54 +679,88 @@ def subscribe_criteria():
                              message='Datos inválidos.')
 
 
+def _calendar_window():
+    """Ventana del calendario por día: (primer día, cantidad de días); hoy y 14 por defecto."""
+    start_str = request.args.get('start')
+    base = datetime.now().date()
+    if start_str and validate_date_format(start_str):
+        try:
+            base = datetime.strptime(start_str, '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    return base, clamp_calendar_days(request.args.get('days', type=int))
+
+
 @bp.get('/prof/day_calendar')
+@read_only
 def prof_day_calendar():
     """HTMX partial for per-day booking calendar for a Professional.
 
-    Inputs: slug, start (YYYY-MM-DD) optional; shows next 14 days by default.
+    Inputs: slug, start (YYYY-MM-DD) optional, days (14 by default);
+    format=json returns the compact arrays instead of the partial.
     """
-    from app.models_catalog import Professional, DailyAvailability
+    from app.models_catalog import Professional
     slug = clean_text(request.args.get('slug', ''), 180)
-    start_str = request.args.get('start')
+    as_json = request.args.get('format') == 'json'
 
     prof = Professional.query.filter_by(slug=slug, is_active=True).first()
     if not prof:
+        if as_json:
+            return jsonify({'error': 'Profesional no encontrado.'}), 404
         return render_template('partials/_per_day_calendar.html', professional=None, days=[], message='Profesional no encontrado.')
 
     # Ensure mode and public visibility
     if getattr(prof, 'booking_mode', 'classic') != 'per_day':
+        if as_json:
+            return jsonify({'error': 'Este profesional no acepta reservas por día.'}), 400
         return render_template('partials/_per_day_calendar.html', professional=prof, days=[], message='Este profesional no acepta reservas por día.')
     if not getattr(prof, 'show_public_booking', True):
         abort(403)
 
-    # Range: next 14 days starting today or provided start
-    today = datetime.now().date()
-    if start_str and validate_date_format(start_str):
-        try:
-            base = datetime.strptime(start_str, '%Y-%m-%d').date()
-        except ValueError:
-            base = today
-    else:
-        base = today
-
-    window = [base + timedelta(days=i) for i in range(14)]
+    base, length = _calendar_window()
+    window = [base + timedelta(days=i) for i in range(length)]
 
-    # Load existing daily availabilities and default to daily_quota when present
-    avail_map = {d.date: d for d in DailyAvailability.query.filter(DailyAvailability.professional_id == prof.id, DailyAvailability.date >= window[0], DailyAvailability.date <= window[-1]).all()}
-    days = []
+    # Capacidad/reservas por día (una consulta; días sin registro usan daily_quota)
     default_quota = int(getattr(prof, 'daily_quota', 1) or 1)
-    for d in window:
-        rec = avail_map.get(d)
-        if rec:
-            days.append({'date': d, 'capacity': int(rec.capacity or 1), 'reserved': int(rec.reserved_count or 0)})
-        else:
-            # Default: show day with configured quota (0 -> unavailable)
-            cap = max(0, default_quota)
-            days.append({'date': d, 'capacity': cap, 'reserved': 0})
+    calendar = cached_availability(
+        'professional', prof.id, window, ('calendar', default_quota),
+        lambda: day_calendar([prof.id], base, length).get(prof.id, {'capacity': [], 'reserved': []}),
+    )
 
+    if as_json:
+        return jsonify({'start': base.isoformat(), 'days': length, **calendar})
+
+    days = [{'date': d, 'capacity': cap, 'reserved': res}
+            for d, cap, res in zip(window, calendar['capacity'], calendar['reserved'])]
     return render_template('partials/_per_day_calendar.html', professional=prof, days=days, message=None)
 
 
+@bp.get('/prof/day_calendars')
+@read_only
+def prof_day_calendars():
+    """JSON: calendarios por día de varios profesionales en una consulta.
+
+    Inputs: slug (repetible), start (YYYY-MM-DD) optional, days (14 by default).
+    Solo incluye profesionales activos, en modo per_day y con reservas públicas.
+    """
+    from app.models_catalog import Professional
+    slugs = [clean_text(s, 180) for s in request.args.getlist('slug') if s][:50]
+    base, length = _calendar_window()
+
+    pros = (Professional.query
+            .filter(Professional.slug.in_(slugs),
+                    Professional.is_active.is_(True),
+                    Professional.booking_mode == 'per_day',
+                    Professional.show_public_booking.is_(True))
+            .all()) if slugs else []
+    calendars = day_calendar([p.id for p in pros], base, length)
+    return jsonify({
+        'start': base.isoformat(),
+        'days': length,
+        'professionals': {p.slug: calendars.get(p.id, {'capacity': [], 'reserved': []}) for p in pros},
+    })
+
+
 @bp.post('/prof/book_day')
 @limiter.limit("5 per minute")
 def prof_book_day():
@@ -678,7 +768,7 @@ def prof_book_day():
 
     Creates a Subscription with criteria for auditing and increments reserved_count atomically.
     """
-    from app.models_catalog import Professional, DailyAvailability
+    from app.models_catalog import Professional
     from app.models import Subscription
 
     slug = clean_text(request.form.get('slug', ''), 180)
@@ -702,26 +792,11 @@ def prof_book_day():
     if not getattr(prof, 'show_public_booking', True):
         abort(403)
 
-    # Upsert or lock existing DailyAvailability, then increment reserved_count if capacity allows
-    from sqlalchemy import select
-    # Try to lock existing record
-    rec = (db.session.query(DailyAvailability)
-           .filter(DailyAvailability.professional_id == prof.id, DailyAvailability.date == target_date)
-           .with_for_update(nowait=False)
-           .first())
-
-    if not rec:
-        # Create with default capacity from professional.daily_quota
-        rec = DailyAvailability(professional_id=prof.id, date=target_date, capacity=int(getattr(prof, 'daily_quota', 1) or 1), reserved_count=0)
-        db.session.add(rec)
-        db.session.flush()
-
-    if int(rec.reserved_count or 0) >= int(rec.capacity or 0):
+    # Upsert condicional: toma el cupo en una sola sentencia (sin locks de fila)
+    if not reserve_day(prof, target_date):
         db.session.rollback()
         return render_template('partials/_subscription_result.html', success=False, message='No hay cupos disponibles para ese día.')
 
-    rec.reserved_count = int(rec.reserved_count or 0) + 1
-
     # Create a criteria subscription for audit/notification purposes
     criteria = {
         'kind': 'per_day',
@@ -735,6 +810,7 @@ def prof_book_day():
     return render_template('partials/_subscription_result.html', success=True, message='Reserva tomada. Te contactaremos para coordinar horario.')
 
 @bp.get('/prof/availability')
+@read_only
 def prof_availability():
     """HTMX partial: available start times for a Professional (classic mode).
 
@@ -755,22 +831,51 @@ def prof_availability():
         abort(403)
 
     now = datetime.now(timezone.utc)
-    q = Timeslot.query.filter(
-        Timeslot.status == TimeslotStatus.AVAILABLE,
-        Timeslot.professional_id == prof.id,
-        Timeslot.start > now,
-    )
+    day = day_start = day_end = None
 
     # Filtrar por día si se especifica
     if date_str and validate_date_format(date_str):
         try:
-            d = datetime.strptime(date_str, '%Y-%m-%d').date()
-            day_start = datetime.combine(d, datetime.min.time()).replace(tzinfo=timezone.utc)
-            day_end = day_start + timedelta(days=1)
-            q = q.filter(Timeslot.start >= day_start, Timeslot.start < day_end)
+            day = datetime.strptime(date_str, '%Y-%m-%d').date()
+            day_start, day_end = day_bounds(day)
         except ValueError:
             pass
 
-    slots = q.order_by(Timeslot.start).all()
-    starts = [s.start for s in slots]
+    starts = load_starts(cached_availability(
+        'professional', prof.id, [day] if day else None, ('times', prof.slot_duration_min),
+        lambda: dump_starts(professional_starts(prof, now, day_start, day_end)),
+    ))
+    # Las entradas cacheadas pueden incluir inicios que ya pasaron
+    starts = [dt for dt in starts if dt > now]
     return render_template('partials/_prof_times.html', professional=prof, starts=starts, message=None)
+
+
+@bp.get('/prof/availability_range')
+@read_only
+def prof_availability_range():
+    """Disponibilidad de un Professional (modo clásico) por día para una ventana.
+
+    Inputs: slug, start (YYYY-MM-DD, hoy por defecto), days (14 por defecto);
+    format=json y counts_only=1 opcionales.
+    """
+    from app.models_catalog import Professional
+
+    slug = clean_text(request.args.get('slug', ''), 180)
+    first_day, days = _range_window()
+
+    prof = Professional.query.filter_by(slug=slug, is_active=True).first()
+    if not prof:
+        return _range_response([], first_day, days, 'prof-classic-form', 'Profesional no encontrado.', 404)
+    if getattr(prof, 'booking_mode', 'classic') != 'classic':
+        return _range_response([], first_day, days, 'prof-classic-form', 'Este profesional no usa horarios fijos.')
+    if not getattr(prof, 'show_public_booking', True):
+        abort(403)
+
+    now = datetime.now(timezone.utc)
+    window_start, window_end = day_bounds(first_day, days)
+    starts = load_starts(cached_availability(
+        'professional', prof.id, _window_days(first_day, days), ('range', prof.slot_duration_min),
+        lambda: dump_starts(professional_starts(prof, now, window_start, window_end)),
+    ))
+    # Las entradas cacheadas pueden incluir inicios que ya pasaron
+    return _range_response([dt for dt in starts if dt > now], first_day, days, 'prof-classic-form')
@@ -1,6 +1,5 @@
 import re
 from flask import current_app
-from app.models import UserComplex
 
 def clean_text(text, max_length=None):
     """Clean and sanitize text input"""
@@ -17,27 +16,12 @@ def clean_text(text, max_length=None):
     return text
 
 def user_can_manage_complex(user_id, complex_id):
-    """Check if user can manage a specific complex"""
+    """Check if user can manage a specific complex (cached permission set)"""
     if not user_id or not complex_id:
         return False
-    
-    from app.models import AppUser
-    user = AppUser.query.get(user_id)
-    
-    if not user:
-        return False
-    
-    # Superadmin can manage all complexes
-    if user.is_superadmin:
-        return True
-    
-    # Check if user is linked to this complex
-    user_complex = UserComplex.query.filter_by(
-        user_id=user_id,
-        complex_id=complex_id
-    ).first()
-    
-    return user_complex is not None
+
+    from app.services.access_scope import user_scope
+    return user_scope(user_id).can_manage("complex", complex_id)
 
 def validate_date_format(date_str):
     """Validate date format YYYY-MM-DD"""
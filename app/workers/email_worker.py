@@ -4,6 +4,7 @@ from email.mime.multipart import MIMEMultipart
 from flask import current_app
 from app.models import Subscription, Timeslot
 from app import create_app, db
+from app.services.notification_service import NotificationService
 from jinja2 import Template
 import os
 
@@ -41,6 +42,25 @@ def send_notification_email(subscription_id, timeslot_id):
             app.logger.error(f"Error sending notification email: {str(e)}")
             return False
 
+def send_release_notifications(timeslot_ids):
+    """Background task to notify subscribers of several freed timeslots in one job"""
+    app = create_app()
+
+    with app.app_context():
+        sent = 0
+        for subscription, timeslot in NotificationService.subscriptions_for_timeslots(timeslot_ids):
+            try:
+                subject, body = _prepare_email_content(subscription, timeslot)
+                if _send_email(to_email=subscription.email, subject=subject, body=body):
+                    sent += 1
+                else:
+                    app.logger.error(f"Failed to send notification email to {subscription.email}")
+            except Exception as e:
+                app.logger.error(f"Error sending notification email: {str(e)}")
+
+        app.logger.info(f"Release notifications sent: {sent} for {len(timeslot_ids)} timeslots")
+        return sent
+
 def _prepare_email_content(subscription, timeslot):
     """Prepare email subject and body"""
     # Get complex/service info
@@ -0,0 +1,89 @@
+"""Resumen diario de disponibilidad por entidad dueña (availability_daily)
+
+Revision ID: avd_20261019
+Revises:
+Create Date: 2026-10-19 10:00:00
+
+Crea `availability_daily` si falta y la llena con los turnos desde hace 7
+días, igual que scripts/rebuild_availability_daily.py: cada turno cuenta una
+vez en su dueño (cancha, centro, profesional o servicio suelto, en ese
+orden) y día UTC. Si la tabla ya existe (la dejó una versión anterior con
+filas por cada entidad referenciada) se vacía antes de reconstruirla.
+
+Solo PostgreSQL; en una base nueva sin `timeslots` no hace nada
+(create_all/autogenerate crea ambas tablas).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'avd_20261019'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TABLE = 'availability_daily'
+
+# entity_type -> condición de dueño sobre timeslots, con la precedencia de ENTITY_COLUMNS
+OWNERS = {
+    'field': ('field_id', 'field_id IS NOT NULL'),
+    'beauty_center': ('beauty_center_id', 'field_id IS NULL AND beauty_center_id IS NOT NULL'),
+    'professional': ('professional_id',
+                     'field_id IS NULL AND beauty_center_id IS NULL AND professional_id IS NOT NULL'),
+    'service': ('service_id', 'field_id IS NULL AND beauty_center_id IS NULL AND professional_id IS NULL '
+                              'AND service_id IS NOT NULL'),
+}
+
+BACKFILL = """
+    INSERT INTO availability_daily (entity_type, entity_id, date, available_count, holding_count,
+                                    reserved_count, first_free_start, last_free_start, updated_at)
+    SELECT '{entity_type}', {column}, (start AT TIME ZONE 'UTC')::date,
+           count(*) FILTER (WHERE status = 'AVAILABLE'),
+           count(*) FILTER (WHERE status = 'HOLDING'),
+           count(*) FILTER (WHERE status = 'RESERVED'),
+           min(start) FILTER (WHERE status = 'AVAILABLE'),
+           max(start) FILTER (WHERE status = 'AVAILABLE'),
+           now()
+    FROM timeslots
+    WHERE {owner} AND start >= (date_trunc('day', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC') - interval '7 days'
+    GROUP BY {column}, (start AT TIME ZONE 'UTC')::date
+"""
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('timeslots'):
+        return
+
+    if inspector.has_table(TABLE):
+        op.execute(f'DELETE FROM {TABLE}')
+    else:
+        op.create_table(
+            TABLE,
+            sa.Column('entity_type', sa.String(length=20), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=False),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('available_count', sa.Integer(), nullable=False),
+            sa.Column('holding_count', sa.Integer(), nullable=False),
+            sa.Column('reserved_count', sa.Integer(), nullable=False),
+            sa.Column('first_free_start', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('last_free_start', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('entity_type', 'entity_id', 'date'),
+        )
+        op.create_index('ix_availability_daily_date_type', TABLE, ['date', 'entity_type'])
+
+    for entity_type, (column, owner) in OWNERS.items():
+        op.execute(BACKFILL.format(entity_type=entity_type, column=column, owner=owner))
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not sa.inspect(bind).has_table(TABLE):
+        return
+    op.drop_index('ix_availability_daily_date_type', table_name=TABLE)
+    op.drop_table(TABLE)
@@ -0,0 +1,130 @@
+"""Histórico de turnos particionado por mes (timeslots_archive) y volcado de los pasados
+
+Revision ID: tsarch_20261019
+Revises:
+Create Date: 2026-10-19 09:30:00
+
+Crea la tabla padre `timeslots_archive` particionada por RANGE (start) y
+mueve a ella los turnos que empezaron antes de TIMESLOT_ARCHIVE_DAYS (90 por
+defecto), igual que scripts/archive_timeslots.py: se crean las particiones
+mensuales (límites UTC) que cubren esos turnos y se mueven por lotes, cada
+lote en su propia transacción (borra sus suscripciones de espera, los saca de
+`timeslots` y los inserta en el histórico en una sola sentencia). Si se corta,
+volver a correrla continúa desde donde quedó.
+
+`timeslots` sigue sin particionar. Solo PostgreSQL; en una base nueva sin
+`timeslots` no hace nada (create_all/autogenerate crea ambas tablas).
+"""
+import os
+from datetime import date, datetime, time, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'tsarch_20261019'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ARCHIVE = 'timeslots_archive'
+BATCH = 5000
+
+COLUMNS = (
+    'id', 'start', 'end', 'field_id', 'service_id', 'beauty_center_id', 'professional_id',
+    'price', 'currency', 'status', 'reservation_code', 'created_at',
+)
+
+# Un lote: suscripciones, DELETE de timeslots e INSERT al histórico en una sentencia
+_COLUMN_LIST = ', '.join(f'"{c}"' for c in COLUMNS)
+MOVE_BATCH = sa.text(f"""
+    WITH batch AS (
+        SELECT id FROM timeslots WHERE start < :cutoff ORDER BY id LIMIT :batch FOR UPDATE
+    ), subs AS (
+        DELETE FROM subscriptions WHERE timeslot_id IN (SELECT id FROM batch)
+    ), moved AS (
+        DELETE FROM timeslots WHERE id IN (SELECT id FROM batch) RETURNING {_COLUMN_LIST}
+    )
+    INSERT INTO {ARCHIVE} ({_COLUMN_LIST}, archived_at)
+    SELECT {_COLUMN_LIST}, now() FROM moved
+""")
+
+
+def _utc_day(dt: datetime) -> date:
+    return (dt.astimezone(timezone.utc) if dt.tzinfo else dt).date()
+
+
+def _months(first: date, last: date):
+    month = first.replace(day=1)
+    while month <= last:
+        yield month
+        month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _create_partition(month: date) -> None:
+    upper = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+    lower_ts = datetime.combine(month, time.min).replace(tzinfo=timezone.utc)
+    upper_ts = datetime.combine(upper, time.min).replace(tzinfo=timezone.utc)
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS {ARCHIVE}_{month:%Y_%m} PARTITION OF {ARCHIVE} "
+        f"FOR VALUES FROM ('{lower_ts.isoformat()}') TO ('{upper_ts.isoformat()}')"
+    )
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('timeslots'):
+        return
+
+    if not inspector.has_table(ARCHIVE):
+        status = postgresql.ENUM('AVAILABLE', 'HOLDING', 'RESERVED', 'BLOCKED', name='timeslotstatus',
+                                 create_type=False)
+        op.create_table(
+            ARCHIVE,
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('start', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('end', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('field_id', sa.Integer(), nullable=True),
+            sa.Column('service_id', sa.Integer(), nullable=True),
+            sa.Column('beauty_center_id', sa.Integer(), nullable=True),
+            sa.Column('professional_id', sa.Integer(), nullable=True),
+            sa.Column('price', sa.Numeric(10, 2), nullable=True),
+            sa.Column('currency', sa.String(length=3), nullable=True),
+            sa.Column('status', status, nullable=False),
+            sa.Column('reservation_code', sa.String(length=50), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('archived_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('id', 'start'),
+            postgresql_partition_by='RANGE (start)',
+        )
+        op.create_index('ix_timeslots_archive_field_start', ARCHIVE, ['field_id', 'start'])
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=int(os.environ.get('TIMESLOT_ARCHIVE_DAYS', '90')))
+    first, last = bind.execute(
+        sa.text('SELECT min(start), max(start) FROM timeslots WHERE start < :cutoff'), {'cutoff': cutoff}
+    ).one()
+    if first is None:
+        return
+    for month in _months(_utc_day(first), _utc_day(last)):
+        _create_partition(month)
+
+    with op.get_context().autocommit_block():
+        while bind.execute(MOVE_BATCH, {'cutoff': cutoff, 'batch': BATCH}).rowcount == BATCH:
+            pass
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not sa.inspect(bind).has_table(ARCHIVE):
+        return
+    # Los turnos archivados vuelven a `timeslots` (sin sus suscripciones, que ya no existen)
+    op.execute(
+        f"INSERT INTO timeslots ({_COLUMN_LIST}) SELECT {_COLUMN_LIST} FROM {ARCHIVE} "
+        f"ON CONFLICT (id) DO NOTHING"
+    )
+    op.drop_table(ARCHIVE)
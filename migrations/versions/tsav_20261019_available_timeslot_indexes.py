@@ -0,0 +1,62 @@
+"""Índices parciales de turnos libres (status = AVAILABLE) con columnas INCLUDE
+
+Revision ID: tsav_20261019
+Revises:
+Create Date: 2026-10-19 09:00:00
+
+Mismos índices que declara Timeslot.__table_args__ (ix_timeslot_available_*).
+Se crean con CREATE INDEX CONCURRENTLY para no bloquear escrituras en
+`timeslots` mientras se construyen. Solo PostgreSQL; si la tabla todavía no
+existe (base nueva) la crea create_all/autogenerate junto con sus índices.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'tsav_20261019'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+AVAILABLE = sa.text("status = 'AVAILABLE'")
+
+# nombre -> (columnas, INCLUDE)
+INDEXES = {
+    'ix_timeslot_available_start': (['start'], ['end', 'price']),
+    'ix_timeslot_available_field_start': (['field_id', 'start'], ['end', 'price']),
+    'ix_timeslot_available_service_start': (['service_id', 'start'], ['end', 'price']),
+    'ix_timeslot_available_professional_start': (['professional_id', 'start'], ['end', 'service_id']),
+    'ix_timeslot_available_center_start': (['beauty_center_id', 'start'], ['end', 'professional_id', 'service_id']),
+}
+
+
+def _existing_indexes():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return None
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('timeslots'):
+        return None
+    return {index['name'] for index in inspector.get_indexes('timeslots')}
+
+
+def upgrade():
+    existing = _existing_indexes()
+    if existing is None:
+        return
+    with op.get_context().autocommit_block():
+        for name, (columns, include) in INDEXES.items():
+            if name not in existing:
+                op.create_index(name, 'timeslots', columns, postgresql_where=AVAILABLE,
+                                postgresql_include=include, postgresql_concurrently=True)
+
+
+def downgrade():
+    existing = _existing_indexes()
+    if existing is None:
+        return
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            if name in existing:
+                op.drop_index(name, table_name='timeslots', postgresql_concurrently=True)
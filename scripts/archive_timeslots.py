@@ -0,0 +1,34 @@
+import argparse
+
+from app import create_app, db
+from app.services.timeslot_archive import ARCHIVE_BATCH, archive_batch, archive_cutoff, detach_partitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mueve los turnos pasados al histórico particionado por mes")
+    parser.add_argument("--days", type=int, default=None, help="Antigüedad mínima en días (por defecto: TIMESLOT_ARCHIVE_DAYS)")
+    parser.add_argument("--batch", type=int, default=ARCHIVE_BATCH, help="Turnos por lote (un commit por lote)")
+    parser.add_argument("--keep-months", type=int, default=None,
+                        help="Desenganchar particiones del histórico anteriores a estos meses (solo PostgreSQL)")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        before = archive_cutoff(args.days)
+        total = 0
+        while True:
+            moved = archive_batch(before, args.batch)
+            db.session.commit()
+            total += moved
+            if moved < args.batch:
+                break
+        print(f"Turnos archivados (inicio anterior a {before:%Y-%m-%d}): {total}")
+
+        if args.keep_months is not None:
+            detached = detach_partitions(args.keep_months)
+            db.session.commit()
+            print(f"Particiones desenganchadas: {', '.join(detached) or 'ninguna'}")
+
+
+if __name__ == "__main__":
+    main()
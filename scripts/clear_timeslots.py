@@ -1,5 +1,5 @@
 from app import create_app, db
-from app.models import Timeslot, Subscription
+from app.models import Timeslot, Subscription, AvailabilityDaily
 
 
 def main():
@@ -9,6 +9,8 @@ def main():
         subs_deleted = db.session.query(Subscription).delete(synchronize_session=False)
         # Luego borra todos los turnos
         ts_deleted = db.session.query(Timeslot).delete(synchronize_session=False)
+        # El borrado masivo no dispara eventos: vaciar también el resumen diario
+        db.session.query(AvailabilityDaily).delete(synchronize_session=False)
         db.session.commit()
         print(f"Eliminados: subscriptions={subs_deleted}, timeslots={ts_deleted}")
 
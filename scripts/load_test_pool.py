@@ -0,0 +1,154 @@
+"""Prueba de carga del pool de conexiones bajo gevent (como los workers de producción).
+
+Lanza --clients greenlets que piden en bucle los listados públicos contra un
+PostgreSQL real, con las mismas opciones de engine que create_app (DB_POOL_*).
+Cada request además mantiene su conexión --db-sleep-ms con pg_sleep para
+simular consultas lentas. Se mide:
+
+- errores (un TimeoutError del pool = starvation);
+- latencia p50/p95/max de los requests;
+- conexiones en uso como máximo (nunca más de pool_size + max_overflow);
+- atraso máximo del loop de gevent: si psycopg2 no está parcheado, cada
+  consulta bloquea el worker y el atraso crece con --db-sleep-ms.
+
+Imprime un JSON con los resultados y sale con código 1 si hubo errores o el
+atraso del loop supera --max-lag-ms. Uso:
+
+    DATABASE_URL=postgresql+psycopg2://... python scripts/load_test_pool.py --clients 1000
+"""
+from gevent import monkey
+
+monkey.patch_all()
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import os  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+from sqlalchemy import event, text  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+
+URLS = [
+    "/ui/turnos_table?category=deportes",
+    "/ui/turnos_table?category=profesionales",
+    "/api/landing-stats/deportes",
+]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(database_url: str | None, clients: int, requests: int, db_sleep_ms: int) -> dict:
+    # Todos los greenlets salen de la misma IP: sin rate limit; sin caches para que cada request consulte
+    config = {
+        "TESTING": True,
+        "SECRET_KEY": "load-test",
+        "RATELIMIT_ENABLED": False,
+        "AVAILABILITY_CACHE_TTL": 0,
+        "SEARCH_CACHE_TTL": 0,
+    }
+    config["SQLALCHEMY_DATABASE_URI"] = database_url or os.environ["DATABASE_URL"]
+    app = create_app(config)
+    options = app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+
+    with app.app_context():
+        db.create_all()
+        engine = db.engine
+
+    in_use = {"now": 0, "max": 0}
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(*_):
+        in_use["now"] += 1
+        in_use["max"] = max(in_use["max"], in_use["now"])
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(*_):
+        in_use["now"] -= 1
+
+    lag = {"max": 0.0}
+    running = {"on": True}
+
+    def monitor():
+        tick = 0.01
+        while running["on"]:
+            started = time.perf_counter()
+            gevent.sleep(tick)
+            lag["max"] = max(lag["max"], time.perf_counter() - started - tick)
+
+    latencies: list[float] = []
+    errors: list[str] = []
+
+    def client_loop(n: int):
+        client = app.test_client()
+        for i in range(requests):
+            url = URLS[(n + i) % len(URLS)]
+            started = time.perf_counter()
+            try:
+                with app.app_context():
+                    if db_sleep_ms:
+                        db.session.execute(text("SELECT pg_sleep(:s)"), {"s": db_sleep_ms / 1000})
+                    response = client.get(url)
+                    if response.status_code >= 500:
+                        errors.append(f"{url}: HTTP {response.status_code}")
+            except Exception as e:
+                errors.append(f"{url}: {type(e).__name__}: {e}")
+            finally:
+                latencies.append(time.perf_counter() - started)
+
+    # Calentamiento: compilar plantillas no cuenta como atraso del loop
+    warmup = app.test_client()
+    for url in URLS:
+        warmup.get(url)
+
+    watcher = gevent.spawn(monitor)
+    started = time.perf_counter()
+    gevent.joinall([gevent.spawn(client_loop, n) for n in range(clients)])
+    elapsed = time.perf_counter() - started
+    running["on"] = False
+    watcher.join()
+
+    limit = None
+    if "poolclass" not in options:
+        limit = options.get("pool_size", 5) + options.get("max_overflow", 10)
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else 0.0,
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+        "max_ms": round(max(latencies, default=0) * 1000, 1),
+        "max_connections_in_use": in_use["max"],
+        "pool_limit": limit,
+        "max_loop_lag_ms": round(lag["max"] * 1000, 1),
+        "engine_options": {k: str(v) for k, v in options.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del pool de conexiones bajo gevent")
+    parser.add_argument("--database-url", default=None, help="Por defecto: DATABASE_URL")
+    parser.add_argument("--clients", type=int, default=1000, help="Greenlets concurrentes (worker-connections)")
+    parser.add_argument("--requests", type=int, default=5, help="Requests por greenlet")
+    parser.add_argument("--db-sleep-ms", type=int, default=20, help="pg_sleep por request (consulta lenta simulada)")
+    parser.add_argument("--max-lag-ms", type=float, default=250, help="Atraso máximo tolerado del loop de gevent")
+    args = parser.parse_args()
+
+    result = run(args.database_url, args.clients, args.requests, args.db_sleep_ms)
+    print(json.dumps(result, indent=2), flush=True)
+    if result["errors"] or result["max_loop_lag_ms"] > args.max_lag_ms:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
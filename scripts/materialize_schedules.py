@@ -0,0 +1,23 @@
+import argparse
+
+from app import create_app, db
+from app.services.schedules import materialize_schedules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extiende las plantillas semanales de turnos hasta el horizonte configurado")
+    parser.add_argument("--days", type=int, default=None, help="Horizonte en días (por defecto: SCHEDULE_HORIZON_DAYS)")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        totals = materialize_schedules(args.days)
+        db.session.commit()
+        print(
+            f"Plantillas procesadas: {totals['schedules']}, "
+            f"turnos creados: {totals['created']}, omitidos por solape: {totals['skipped']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
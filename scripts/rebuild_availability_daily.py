@@ -0,0 +1,32 @@
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from app import create_app, db
+from app.services.availability_daily import rebuild_availability_daily
+
+
+def parse_date(s: str):
+    try:
+        return datetime.strptime(s, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError("Formato de fecha inválido. Usa YYYY-MM-DD")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruye el resumen availability_daily desde timeslots")
+    parser.add_argument("--start", type=parse_date, default=None, help="Primer día (por defecto: hace 7 días)")
+    parser.add_argument("--days", type=int, default=120, help="Cantidad de días a reconstruir")
+    args = parser.parse_args()
+
+    start = args.start or (datetime.now(timezone.utc).date() - timedelta(days=7))
+    end = start + timedelta(days=max(args.days, 1) - 1)
+
+    app = create_app()
+    with app.app_context():
+        keys = rebuild_availability_daily(start, end)
+        db.session.commit()
+        print(f"Resumen reconstruido {start}..{end}: {keys} claves")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import time
+
+from app import create_app, db
+from app.services.landing_stats import refresh_landing_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruye los contadores de turnos libres de las landings")
+    parser.add_argument("--days", type=int, default=None, help="Días a contar desde hoy (por defecto: LANDING_STATS_DAYS)")
+    parser.add_argument("--every", type=int, default=0,
+                        help="Repetir cada N segundos (0 = una sola vez; el servicio landing-stats usa 60)")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        while True:
+            started = time.monotonic()
+            try:
+                rows = refresh_landing_stats(args.days)
+                db.session.commit()
+                print(f"Contadores de landings actualizados: {rows} filas", flush=True)
+            except Exception as e:
+                db.session.rollback()
+                if not args.every:
+                    raise
+                app.logger.warning(f"Landing stats refresh failed: {e}")
+            finally:
+                db.session.remove()
+            if not args.every:
+                break
+            time.sleep(max(args.every - (time.monotonic() - started), 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import argparse
+import random
 from datetime import datetime, timezone
 from sqlalchemy import text
 from flask import current_app
@@ -19,6 +20,8 @@ def seed_professionals() -> int:
             address="Av. Cabildo 1234",
             phone="+54 11 5555-1111",
             website="https://ejemplo-ana.com",
+            latitude=-34.5627,
+            longitude=-58.4566,
             is_active=True,
             created_at=datetime.now(timezone.utc),
             updated_at=datetime.now(timezone.utc),
@@ -32,6 +35,8 @@ def seed_professionals() -> int:
             address="Bv. San Juan 900",
             phone="+54 351 555-2222",
             website="https://ejemplo-martin.com",
+            latitude=-31.4135,
+            longitude=-64.1811,
             is_active=True,
             created_at=datetime.now(timezone.utc),
             updated_at=datetime.now(timezone.utc),
@@ -55,6 +60,8 @@ def seed_beauty_centers() -> int:
             address="Mitre 456",
             phone="+54 341 555-3333",
             website="https://glow-estetica.com",
+            latitude=-32.9468,
+            longitude=-60.6393,
             is_active=True,
             created_at=datetime.now(timezone.utc),
             updated_at=datetime.now(timezone.utc),
@@ -68,6 +75,8 @@ def seed_beauty_centers() -> int:
             address="Av. Colón 150",
             phone="+54 261 555-4444",
             website="https://bellezazen.com",
+            latitude=-32.8895,
+            longitude=-68.8458,
             is_active=True,
             created_at=datetime.now(timezone.utc),
             updated_at=datetime.now(timezone.utc),
@@ -91,6 +100,8 @@ def seed_sports_complexes() -> int:
             address="Crovara 1000",
             phone="+54 11 5555-5555",
             website="https://futbolpark.com",
+            latitude=-34.6118,
+            longitude=-58.4173,
             is_active=True,
             created_at=datetime.now(timezone.utc),
             updated_at=datetime.now(timezone.utc),
@@ -104,6 +115,8 @@ def seed_sports_complexes() -> int:
             address="7 y 50",
             phone="+54 221 555-6666",
             website="https://multisport.ar",
+            latitude=-34.9214,
+            longitude=-57.9545,
             is_active=True,
             created_at=datetime.now(timezone.utc),
             updated_at=datetime.now(timezone.utc),
@@ -115,6 +128,113 @@ def seed_sports_complexes() -> int:
     return len(rows)
 
 
+# --- Generadores sintéticos (volumen para pruebas de carga/benchmarks) ---------------
+
+FIRST_NAMES = [
+    "Ana", "María", "Lucía", "Sofía", "Valentina", "Camila", "Julieta", "Florencia",
+    "Martín", "Juan", "Santiago", "Matías", "Nicolás", "Tomás", "Joaquín", "Agustín",
+]
+LAST_NAMES = [
+    "González", "Rodríguez", "Fernández", "López", "Martínez", "García", "Pérez", "Sánchez",
+    "Romero", "Díaz", "Álvarez", "Torres", "Ruiz", "Ramírez", "Acosta", "Benítez",
+]
+TITLES = ["Dr.", "Dra.", "Lic.", "Prof.", ""]
+SPECIALTIES = [
+    "Kinesiología deportiva", "Nutrición clínica", "Psicología", "Odontología", "Fonoaudiología",
+    "Psicopedagogía", "Traumatología", "Dermatología", "Plomería", "Electricidad",
+]
+BEAUTY_SERVICES = [
+    "Limpieza facial", "Depilación", "Masajes", "Manicura", "Pedicura", "Peluquería",
+    "Radiofrecuencia", "Drenaje linfático", "Barbería", "Pestañas",
+]
+BEAUTY_PREFIXES = ["Estética", "Spa", "Salón", "Centro", "Studio", "Barbería"]
+BEAUTY_WORDS = ["Zen", "Glow", "Bella", "Armonía", "Esencia", "Luna", "Aurora", "Lirio"]
+SPORTS = ["Fútbol 5", "Fútbol 7", "Pádel", "Tenis", "Básquet", "Vóley", "Hockey"]
+SPORTS_PREFIXES = ["Complejo", "Club", "Polideportivo", "Arena", "Canchas"]
+SPORTS_WORDS = ["Norte", "Sur", "Del Parque", "La Loma", "El Golazo", "San Martín", "Belgrano"]
+# (ciudad, latitud, longitud)
+CITIES = [
+    ("Buenos Aires", -34.6037, -58.3816), ("Córdoba", -31.4201, -64.1888),
+    ("Rosario", -32.9442, -60.6505), ("Mendoza", -32.8895, -68.8458),
+    ("La Plata", -34.9214, -57.9545), ("Mar del Plata", -38.0055, -57.5426),
+    ("Salta", -24.7821, -65.4232), ("Neuquén", -38.9516, -68.0591),
+]
+
+
+def _pick_city(rng: random.Random) -> tuple[str, float, float]:
+    """Ciudad al azar con coordenadas dispersas unos km alrededor del centro."""
+    city, lat, lng = rng.choice(CITIES)
+    return city, round(lat + rng.uniform(-0.08, 0.08), 5), round(lng + rng.uniform(-0.08, 0.08), 5)
+
+
+def generate_professionals(n: int, category_id: int | None, seed: int = 0):
+    """Genera `n` profesionales con nombres y especialidades realistas (no los persiste)."""
+    rng = random.Random(seed)
+    for i in range(n):
+        city, lat, lng = _pick_city(rng)
+        name = " ".join(p for p in (rng.choice(TITLES), rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)) if p)
+        yield Professional(
+            name=name,
+            slug=f"prof-{seed}-{i}",
+            city=city,
+            specialties=", ".join(rng.sample(SPECIALTIES, 2)),
+            latitude=lat,
+            longitude=lng,
+            is_active=True,
+            category_id=category_id,
+        )
+
+
+def generate_beauty_centers(n: int, category_id: int | None, seed: int = 0):
+    """Genera `n` centros de estética con nombres y servicios realistas (no los persiste)."""
+    rng = random.Random(seed + 1)
+    for i in range(n):
+        city, lat, lng = _pick_city(rng)
+        yield BeautyCenter(
+            name=f"{rng.choice(BEAUTY_PREFIXES)} {rng.choice(BEAUTY_WORDS)}",
+            slug=f"centro-{seed}-{i}",
+            city=city,
+            services=", ".join(rng.sample(BEAUTY_SERVICES, 3)),
+            latitude=lat,
+            longitude=lng,
+            is_active=True,
+            category_id=category_id,
+        )
+
+
+def generate_sports_complexes(n: int, category_id: int | None, seed: int = 0):
+    """Genera `n` complejos deportivos con nombres y deportes realistas (no los persiste)."""
+    rng = random.Random(seed + 2)
+    for i in range(n):
+        city, lat, lng = _pick_city(rng)
+        yield SportsComplex(
+            name=f"{rng.choice(SPORTS_PREFIXES)} {rng.choice(SPORTS_WORDS)}",
+            slug=f"complejo-{seed}-{i}",
+            city=city,
+            sports=", ".join(rng.sample(SPORTS, 2)),
+            latitude=lat,
+            longitude=lng,
+            is_active=True,
+            category_id=category_id,
+        )
+
+
+def seed_synthetic(n: int, seed: int = 0) -> int:
+    """Inserta `n` entidades sintéticas de cada tipo y devuelve el total insertado."""
+    cats = {c.slug: c.id for c in Category.query.all()}
+    total = 0
+    for gen in (
+        generate_professionals(n, cats.get("profesionales"), seed),
+        generate_beauty_centers(n, cats.get("estetica"), seed),
+        generate_sports_complexes(n, cats.get("deportes"), seed),
+    ):
+        rows = list(gen)
+        db.session.bulk_save_objects(rows)
+        total += len(rows)
+    db.session.flush()
+    return total
+
+
 def reset_tables(engine) -> None:
     """Vacía las tablas del catálogo de forma segura e intenta reiniciar secuencias."""
     # Seguro e idempotente: si estás en Postgres, TRUNCATE es rapidísimo
@@ -147,6 +267,8 @@ def main() -> None:
     """CLI principal: parsea argumentos, resetea opcionalmente y ejecuta seeds."""
     parser = argparse.ArgumentParser(description="Seed de entidades de catálogo")
     parser.add_argument("--reset", action="store_true", help="Vacía tablas antes de insertar")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N",
+                        help="Además inserta N entidades sintéticas de cada tipo")
     args = parser.parse_args()
 
     app = create_app()
@@ -164,6 +286,10 @@ def main() -> None:
         print("- Insertando sports_complexes...")
         n3 = seed_sports_complexes()
 
+        if args.synthetic:
+            print(f"- Insertando {args.synthetic} entidades sintéticas por tipo...")
+            print(f"  sintéticas: {seed_synthetic(args.synthetic)}")
+
         db.session.commit()
         print(f"Listo. Insertados: professionals={n1}, beauty_centers={n2}, sports_complexes={n3}")
 
@@ -0,0 +1 @@
+# Benchmarks (opt-in, require PostgreSQL)
@@ -3,6 +3,7 @@ import tempfile
 import os
 from app import create_app, db
 from app.models import AppUser
+from app.services import day_booking
 from datetime import datetime, timedelta, timezone
 
 @pytest.fixture
@@ -78,3 +79,90 @@ def sample_data(app):
         ts = Timeslot(field_id=fld.id, start=now + timedelta(hours=2), end=now + timedelta(hours=3), status=TimeslotStatus.AVAILABLE)
         db.session.add(ts); db.session.commit()
         return {'category': cat, 'complex': cpx, 'field': fld, 'timeslot': ts}
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis commands used by the app caches."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def mget(self, keys, *args):
+        keys = list(keys) if isinstance(keys, (list, tuple)) else [keys]
+        return [self.store.get(k) for k in keys + list(args)]
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value if isinstance(value, bytes) else str(value).encode()
+        return True
+
+    def setex(self, key, ttl, value):
+        return self.set(key, value)
+
+    def incr(self, key, amount=1):
+        value = int(self.store.get(key) or 0) + amount
+        self.store[key] = str(value).encode()
+        return value
+
+    def delete(self, *keys):
+        return sum(1 for k in keys if self.store.pop(k, None) is not None)
+
+    def expire(self, key, ttl):
+        return key in self.store
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def eval(self, script, numkeys, *args):
+        """Run one of the app's Lua scripts through its Python stand-in in LUA_SCRIPTS."""
+        keys, argv = [str(k) for k in args[:numkeys]], [str(a) for a in args[numkeys:]]
+        return LUA_SCRIPTS[script](self, keys, argv)
+
+
+def _generation(redis, key):
+    return (redis.get(key) or b'0').decode()
+
+
+def _lua_is_sold_out(redis, keys, argv):
+    return int(f"{argv[0]}:{_generation(redis, keys[0])}" in redis.store)
+
+
+def _lua_mark_sold_out(redis, keys, argv):
+    redis.setex(f"{argv[0]}:{_generation(redis, keys[0])}", int(argv[1]), '1')
+    return 1
+
+
+# No Lua interpreter here: each script the app sends to EVAL maps to an equivalent
+LUA_SCRIPTS = {
+    day_booking._IS_SOLD_OUT_LUA: _lua_is_sold_out,
+    day_booking._MARK_SOLD_OUT_LUA: _lua_mark_sold_out,
+}
+
+
+class FakePipeline:
+    """Queues commands and runs them against the FakeRedis on execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        calls, self.calls = self.calls, []
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in calls]
+
+
+@pytest.fixture
+def fake_redis(app):
+    """Replace app.redis with an in-memory fake for cache tests"""
+    original = app.redis
+    app.redis = FakeRedis()
+    yield app.redis
+    app.redis = original
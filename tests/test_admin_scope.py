@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app import db
+from app.models import Category, Complex, Field, Timeslot, TimeslotStatus, UserComplex, user_professionals
+from app.models_catalog import Professional
+
+
+def _link_queries(fn):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if 'user_professionals' in statement or 'user_complexes' in statement:
+            statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+    return result, statements
+
+
+def test_professional_scope_resolved_once_per_request(app, client, admin_user):
+    with app.app_context():
+        cat = Category(slug='profesionales', title='Profesionales')
+        db.session.add(cat)
+        db.session.flush()
+        admin_user.category_id = cat.id
+        db.session.add(admin_user)
+        mine = Professional(name='Ana', slug='ana', city='X', category_id=cat.id)
+        other = Professional(name='Beto', slug='beto', city='X', category_id=cat.id)
+        db.session.add_all([mine, other])
+        db.session.flush()
+        db.session.execute(user_professionals.insert().values(user_id=admin_user.id, professional_id=mine.id))
+        db.session.commit()
+
+        client.post('/admin/login', data={'email': 'admin@test.com', 'password': 'testpass123'})
+
+        html = client.get('/admin/professional_settings').get_data(as_text=True)
+        assert 'Ana' in html and 'Beto' not in html
+
+        # Chequeo de alcance + re-render: una sola consulta a las tablas de vínculo
+        resp, statements = _link_queries(lambda: client.post('/admin/professional_settings/update', data={
+            'professional_id': mine.id, 'booking_mode': 'per_day', 'daily_quota': 3,
+        }))
+        assert resp.status_code == 200
+        assert 'Ana' in resp.get_data(as_text=True)
+        assert len(statements) == 1
+
+        resp = client.post('/admin/professional_settings/update', data={'professional_id': other.id})
+        assert resp.status_code == 403
+        db.session.refresh(other)
+        assert other.booking_mode != 'per_day'
+
+
+def test_complex_scope_uses_links(app, client, admin_user):
+    with app.app_context():
+        cat = Category(slug='deportes', title='Deportes')
+        db.session.add(cat)
+        db.session.flush()
+        admin_user.category_id = cat.id
+        db.session.add(admin_user)
+        mine = Complex(name='Club A', slug='club-a', address='Calle 1')
+        other = Complex(name='Club B', slug='club-b', address='Calle 2')
+        db.session.add_all([mine, other])
+        db.session.flush()
+        db.session.add(UserComplex(user_id=admin_user.id, complex_id=mine.id))
+        db.session.commit()
+
+        client.post('/admin/login', data={'email': 'admin@test.com', 'password': 'testpass123'})
+
+        html = client.get('/admin/complex_settings').get_data(as_text=True)
+        assert 'Club A' in html and 'Club B' not in html
+        assert client.post('/admin/complex_settings/update', data={'complex_id': mine.id}).status_code == 200
+        assert client.post('/admin/complex_settings/update', data={'complex_id': other.id}).status_code == 403
+
+
+def test_permission_set_cached_until_superadmin_links(app, client, admin_user, super_admin_user, fake_redis):
+    with app.app_context():
+        cpx = Complex(name='Club', slug='club', address='Calle 1')
+        db.session.add(cpx)
+        db.session.flush()
+        field = Field(complex_id=cpx.id, name='Cancha 1')
+        db.session.add(field)
+        db.session.flush()
+        start = datetime.now(timezone.utc) + timedelta(days=1)
+        ts = Timeslot(field_id=field.id, start=start, end=start + timedelta(hours=1), status=TimeslotStatus.AVAILABLE)
+        db.session.add(ts)
+        db.session.commit()
+
+        client.post('/admin/login', data={'email': 'admin@test.com', 'password': 'testpass123'})
+        assert client.post(f'/api/admin/turnos/{ts.id}/release').status_code == 403
+        assert f'perm:user:{admin_user.id}' in fake_redis.store
+
+        # Vínculo directo en la base: la caché sigue vigente
+        db.session.add(UserComplex(user_id=admin_user.id, complex_id=cpx.id))
+        db.session.commit()
+        assert client.post(f'/api/admin/turnos/{ts.id}/release').status_code == 403
+        db.session.execute(UserComplex.__table__.delete())
+        db.session.commit()
+
+        # Vínculo desde el panel: invalida el permiso cacheado
+        client.post('/admin/logout')
+        client.post('/admin/login', data={'email': 'superadmin@test.com', 'password': 'testpass123'})
+        client.post('/admin/users/link', data={'user_id': admin_user.id, 'kind': 'complex', 'entity_id': cpx.id})
+        client.post('/admin/logout')
+        client.post('/admin/login', data={'email': 'admin@test.com', 'password': 'testpass123'})
+        assert client.post(f'/api/admin/turnos/{ts.id}/release').status_code == 200
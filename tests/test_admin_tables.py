@@ -0,0 +1,64 @@
+from app import db
+from app.models import Category
+from app.models_catalog import Professional
+from app.services.admin_tables import admin_page, entity_options
+
+
+def _professionals(n):
+    cat = Category(slug='profesionales', title='Profesionales')
+    db.session.add(cat)
+    db.session.flush()
+    db.session.add_all([
+        Professional(name=f'Pro {i:02d}', slug=f'pro-{i:02d}', city='Rosario' if i % 2 else 'Córdoba',
+                     category_id=cat.id)
+        for i in range(n)
+    ])
+    db.session.commit()
+
+
+def test_admin_page_keyset_and_search(app):
+    with app.app_context():
+        _professionals(7)
+
+        rows, cursor = admin_page('professionals', per_page=3)
+        assert [p.name for p in rows] == ['Pro 00', 'Pro 01', 'Pro 02']
+        rows, cursor = admin_page('professionals', cursor=cursor, per_page=3)
+        assert [p.name for p in rows] == ['Pro 03', 'Pro 04', 'Pro 05']
+        rows, cursor = admin_page('professionals', cursor=cursor, per_page=3)
+        assert [p.name for p in rows] == ['Pro 06'] and cursor is None
+
+        rows, _ = admin_page('professionals', q='rosario')
+        assert {p.name for p in rows} == {'Pro 01', 'Pro 03', 'Pro 05'}
+
+        # Cursor inválido: primera página
+        rows, _ = admin_page('professionals', cursor='basura', per_page=2)
+        assert [p.name for p in rows] == ['Pro 00', 'Pro 01']
+
+
+def test_entity_options_limited_and_keep_selected(app):
+    with app.app_context():
+        _professionals(5)
+        last = Professional.query.filter_by(slug='pro-04').one()
+
+        items = entity_options('professional', limit=2)
+        assert [p.name for p in items] == ['Pro 00', 'Pro 01']
+        items = entity_options('professional', selected_id=last.id, limit=2)
+        assert items[0].id == last.id and len(items) == 3
+        assert [p.name for p in entity_options('professional', q='03')] == ['Pro 03']
+
+
+def test_superadmin_tables_paginate_and_search(app, client, super_admin_user):
+    with app.app_context():
+        _professionals(30)
+        client.post('/admin/login', data={'email': 'superadmin@test.com', 'password': 'testpass123'})
+
+        html = client.get('/admin/professionals_table').get_data(as_text=True)
+        assert 'Pro 24' in html and 'Pro 25' not in html
+        assert 'Siguiente' in html
+
+        html = client.get('/admin/professionals_table?q=pro-29').get_data(as_text=True)
+        assert 'Pro 29' in html and 'Pro 00' not in html and 'Siguiente' not in html
+
+        html = client.get('/admin/users/entity_search?kind=professional&q=Pro 1').get_data(as_text=True)
+        assert html.count('<option') == 10
+        assert client.get('/admin/users/entity_search?kind=otro').status_code == 400
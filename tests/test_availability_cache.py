@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+
+from app import db
+from app.models import Category, Timeslot, TimeslotStatus
+from app.models_catalog import Professional
+import app.ui.routes as ui_routes
+
+
+def test_prof_availability_cached_until_slot_changes(app, client, fake_redis, monkeypatch):
+    app.config['AVAILABILITY_CACHE_TTL'] = 60
+    loads = []
+    original = ui_routes.professional_starts
+
+    def counting(prof, now, start=None, end=None):
+        loads.append(start.date() if start else None)
+        return original(prof, now, start, end)
+
+    monkeypatch.setattr(ui_routes, 'professional_starts', counting)
+
+    with app.app_context():
+        cat = Category(slug='estetica', title='Estética')
+        db.session.add(cat)
+        db.session.flush()
+        prof = Professional(name='Ana', slug='ana', city='Z', category_id=cat.id)
+        db.session.add(prof)
+        db.session.flush()
+        day = (datetime.now(timezone.utc) + timedelta(days=3)).replace(hour=10, minute=0, second=0, microsecond=0)
+        other_day = day + timedelta(days=1)
+        slots = [Timeslot(professional_id=prof.id, start=s, end=s + timedelta(minutes=30))
+                 for s in (day, day + timedelta(minutes=30), other_day)]
+        db.session.add_all(slots)
+        db.session.commit()
+
+        url = f"/ui/prof/availability?slug=ana&date={day.date().isoformat()}"
+        other_url = f"/ui/prof/availability?slug=ana&date={other_day.date().isoformat()}"
+        assert client.get(url).get_data(as_text=True).count('10:30') == 2
+        client.get(url)
+        client.get(other_url)
+        assert loads == [day.date(), other_day.date()]
+
+        # Hold de un slot del día: invalida solo ese día
+        slots[1].status = TimeslotStatus.HOLDING
+        db.session.commit()
+        assert '10:30' not in client.get(url).get_data(as_text=True)
+        client.get(other_url)
+        assert loads == [day.date(), other_day.date(), day.date()]
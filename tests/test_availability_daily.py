@@ -0,0 +1,99 @@
+from datetime import date, datetime, timedelta, timezone
+
+from app import db
+from app.models import AvailabilityDaily, Category, Service, Timeslot, TimeslotStatus
+from app.models_catalog import BeautyCenter, Professional
+from app.services.availability_daily import free_days, rebuild_availability_daily
+
+
+def _summary(entity_type, entity_id, day):
+    row = db.session.get(AvailabilityDaily, (entity_type, entity_id, day))
+    if row is None:
+        return None
+    return (row.available_count, row.holding_count, row.reserved_count,
+            row.first_free_start and row.first_free_start.strftime('%H:%M'),
+            row.last_free_start and row.last_free_start.strftime('%H:%M'))
+
+
+def test_summary_follows_timeslot_changes(app):
+    with app.app_context():
+        cat = Category(slug='estetica', title='Estética')
+        db.session.add(cat)
+        db.session.flush()
+        prof = Professional(name='Ana', slug='ana', city='Z', category_id=cat.id)
+        db.session.add(prof)
+        db.session.flush()
+
+        base = datetime(2030, 1, 7, 10, 0, tzinfo=timezone.utc)
+        slots = [Timeslot(professional_id=prof.id, start=base + timedelta(minutes=30 * i),
+                          end=base + timedelta(minutes=30 * (i + 1)), status=TimeslotStatus.AVAILABLE)
+                 for i in range(3)]
+        db.session.add_all(slots)
+        db.session.commit()
+        day = date(2030, 1, 7)
+        assert _summary('professional', prof.id, day) == (3, 0, 0, '10:00', '11:00')
+
+        # Hold y reserva
+        slots[0].status = TimeslotStatus.HOLDING
+        slots[2].status = TimeslotStatus.RESERVED
+        db.session.commit()
+        assert _summary('professional', prof.id, day) == (1, 1, 1, '10:30', '10:30')
+
+        # Mover un slot a otro día actualiza ambos días
+        slots[1].start = slots[1].start + timedelta(days=1)
+        slots[1].end = slots[1].end + timedelta(days=1)
+        db.session.commit()
+        assert _summary('professional', prof.id, day) == (0, 1, 1, None, None)
+        assert _summary('professional', prof.id, date(2030, 1, 8)) == (1, 0, 0, '10:30', '10:30')
+        assert free_days([('professional', prof.id)], day, date(2030, 1, 10)) == [date(2030, 1, 8)]
+
+        # Borrar el último slot del día elimina la fila
+        db.session.delete(slots[1])
+        db.session.commit()
+        assert _summary('professional', prof.id, date(2030, 1, 8)) is None
+
+        # Un rollback no deja cambios en el resumen
+        slots[0].status = TimeslotStatus.AVAILABLE
+        db.session.flush()
+        db.session.rollback()
+        assert _summary('professional', prof.id, day) == (0, 1, 1, None, None)
+
+        # Reconstrucción completa coincide con el mantenimiento incremental
+        assert rebuild_availability_daily(day, date(2030, 1, 10)) == 1
+        db.session.commit()
+        assert _summary('professional', prof.id, day) == (0, 1, 1, None, None)
+
+
+def test_each_slot_counts_once_in_its_owner(app):
+    """Cancha > centro > profesional > servicio suelto, como en las landings."""
+    with app.app_context():
+        cat = Category(slug='estetica', title='Estética')
+        db.session.add(cat)
+        db.session.flush()
+        corte = Service(category_id=cat.id, name='Corte', slug='corte', duration_min=30)
+        center = BeautyCenter(name='Centro Z', slug='centro-z', city='Z', category_id=cat.id)
+        prof = Professional(name='Ana', slug='ana', city='Z', category_id=cat.id)
+        db.session.add_all([corte, center, prof])
+        db.session.flush()
+
+        base = datetime(2030, 1, 7, 10, 0, tzinfo=timezone.utc)
+        at_center = Timeslot(beauty_center_id=center.id, professional_id=prof.id, service_id=corte.id,
+                             start=base, end=base + timedelta(minutes=30), status=TimeslotStatus.AVAILABLE)
+        db.session.add_all([
+            at_center,
+            Timeslot(professional_id=prof.id, service_id=corte.id, start=base + timedelta(hours=1),
+                     end=base + timedelta(hours=1, minutes=30), status=TimeslotStatus.AVAILABLE),
+            Timeslot(service_id=corte.id, start=base + timedelta(hours=2),
+                     end=base + timedelta(hours=2, minutes=30), status=TimeslotStatus.AVAILABLE),
+        ])
+        db.session.commit()
+        day = base.date()
+        assert _summary('beauty_center', center.id, day) == (1, 0, 0, '10:00', '10:00')
+        assert _summary('professional', prof.id, day) == (1, 0, 0, '11:00', '11:00')
+        assert _summary('service', corte.id, day) == (1, 0, 0, '12:00', '12:00')
+
+        # El slot sale del centro: pasa a contar en el profesional
+        at_center.beauty_center_id = None
+        db.session.commit()
+        assert _summary('beauty_center', center.id, day) is None
+        assert _summary('professional', prof.id, day) == (2, 0, 0, '10:00', '11:00')
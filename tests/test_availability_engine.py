@@ -0,0 +1,74 @@
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import availability
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        if availability.np is None:
+            pytest.skip("NumPy no instalado")
+    else:
+        monkeypatch.setattr(availability, "np", None)
+    return request.param
+
+
+def _random_intervals(rng, n, horizon=600):
+    out = []
+    for _ in range(n):
+        start = rng.randrange(horizon)
+        out.append((start, start + rng.randrange(0, 90)))
+    return out
+
+
+def _minutes(intervals):
+    return {m for start, end in intervals for m in range(start, end)}
+
+
+def _is_canonical(intervals):
+    """Ordenados, no vacíos y separados por al menos un minuto libre."""
+    return all(s < e for s, e in intervals) and all(a[1] < b[0] for a, b in zip(intervals, intervals[1:]))
+
+
+def test_operations_match_minute_sets(backend):
+    rng = random.Random(20240131)
+    for _ in range(300):
+        a = _random_intervals(rng, rng.randrange(0, 8))
+        b = _random_intervals(rng, rng.randrange(0, 8))
+
+        merged = availability.merge(a)
+        assert _is_canonical(merged)
+        assert _minutes(merged) == _minutes(a)
+
+        diff = availability.subtract(a, b)
+        assert _is_canonical(diff)
+        assert _minutes(diff) == _minutes(a) - _minutes(b)
+
+
+def test_fit_starts_matches_brute_force(backend):
+    rng = random.Random(7)
+    for _ in range(300):
+        a = _random_intervals(rng, rng.randrange(0, 8))
+        duration = rng.choice([15, 30, 45, 60, 90])
+        step = rng.choice([5, 15, 30])
+        free = _minutes(a)
+        expected = []
+        for start, end in availability.merge(a):
+            expected.extend(s for s in range(start, end, step) if all(m in free for m in range(s, s + duration)))
+        assert availability.fit_starts(a, duration, step) == expected
+
+
+def test_available_starts_infers_grid_from_slots(backend):
+    def slot(h, m, minutes):
+        start = datetime(2030, 1, 7, h, m)
+        return SimpleNamespace(start=start, end=start + timedelta(minutes=minutes))
+
+    slots = [slot(10, 0, 30), slot(10, 30, 15), slot(10, 45, 15), slot(12, 0, 30)]
+    starts = availability.available_starts(slots, 45)
+    assert [dt.strftime("%H:%M") for dt in starts] == ["10:00", "10:15"]
+    assert all(dt.tzinfo is timezone.utc for dt in starts)
+    assert availability.infer_step(availability.slot_intervals(slots)) == 15
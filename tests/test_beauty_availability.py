@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta, timezone
+
+from flask import template_rendered
+
+from app import db
+from app.models import Category, Service, Timeslot, TimeslotStatus
+from app.models_catalog import BeautyCenter, Professional
+
+
+def _setup_center():
+    cat = Category(slug='estetica', title='Estética')
+    db.session.add(cat)
+    db.session.flush()
+    corte = Service(category_id=cat.id, name='Corte', slug='corte', duration_min=60)
+    color = Service(category_id=cat.id, name='Color', slug='color', duration_min=30)
+    db.session.add_all([corte, color])
+    db.session.flush()
+
+    center = BeautyCenter(name='Centro Z', slug='centro-z', city='Z', category_id=cat.id)
+    center.show_public_booking = True
+    ana = Professional(name='Ana', slug='ana', city='Z', category_id=cat.id)
+    beto = Professional(name='Beto', slug='beto', city='Z', category_id=cat.id)
+    caro = Professional(name='Caro', slug='caro', city='Z', category_id=cat.id)
+    ana.linked_services = [corte]
+    beto.linked_services = [corte, color]
+    caro.linked_services = [color]
+    center.professionals = [ana, beto, caro]
+    db.session.add(center)
+    db.session.flush()
+    return center, corte, ana, beto, caro
+
+
+def _slots(center, pro, start, count, step=30, **kw):
+    for i in range(count):
+        s = start + timedelta(minutes=i * step)
+        db.session.add(Timeslot(beauty_center_id=center.id, professional_id=pro.id, start=s,
+                                end=s + timedelta(minutes=step), status=kw.get('status', TimeslotStatus.AVAILABLE),
+                                service_id=kw.get('service_id')))
+
+
+def test_staff_availability_groups_starts_per_capable_professional(app, client, fake_redis):
+    with app.app_context():
+        center, corte, ana, beto, caro = _setup_center()
+        base = datetime(2030, 1, 7, 10, 0, tzinfo=timezone.utc)
+        # Ana: 10:00-11:30 contiguo -> inicios 10:00 y 10:30 para 60'
+        _slots(center, ana, base, 3)
+        # Beto: 10:00-10:30 suelto y 14:00-15:00 -> solo 14:00
+        _slots(center, beto, base, 1)
+        _slots(center, beto, base.replace(hour=14), 2)
+        # Slot reservado de Beto no cuenta
+        _slots(center, beto, base.replace(hour=16), 2, status=TimeslotStatus.RESERVED)
+        # Caro no hace "Corte": no debe aparecer
+        _slots(center, caro, base, 4)
+        db.session.commit()
+
+        rendered = []
+
+        def _capture(sender, template, context, **kw):
+            rendered.append(context)
+
+        template_rendered.connect(_capture, app)
+        r = client.get(f"/ui/beauty/availability?beauty_slug={center.slug}&service_id={corte.id}&date=2030-01-07")
+        assert r.status_code == 200
+
+        ctx = rendered[-1]
+        assert [p['name'] for p in ctx['professionals']] == ['Ana', 'Beto']
+        hours = {pid: [dt.strftime('%H:%M') for dt in starts] for pid, starts in ctx['grouped_starts'].items()}
+        assert hours == {ana.id: ['10:00', '10:30'], beto.id: ['14:00']}
+
+
+def test_availability_range_counts_days_and_next_available(app, client, fake_redis):
+    with app.app_context():
+        center, corte, ana, beto, caro = _setup_center()
+        base = datetime(2030, 1, 7, 10, 0, tzinfo=timezone.utc)
+        _slots(center, ana, base + timedelta(days=2), 3)
+        _slots(center, beto, base + timedelta(days=2), 2)
+        _slots(center, beto, base + timedelta(days=3, hours=4), 2)
+        db.session.commit()
+
+        url = f"/ui/beauty/availability_range?beauty_slug={center.slug}&service_id={corte.id}&start=2030-01-07&days=5"
+        data = client.get(url + "&format=json").get_json()
+        assert [d['count'] for d in data['days']] == [0, 0, 2, 1, 0]
+        assert data['next_available'] == '2030-01-09'
+        assert [s[11:16] for s in data['days'][2]['starts']] == ['10:00', '10:30']
+
+        counts = client.get(url + "&format=json&counts_only=1").get_json()
+        assert 'starts' not in counts['days'][0]
+
+        html = client.get(url).get_data(as_text=True)
+        assert 'Próximo disponible: 09/01' in html
+
+
+def test_prof_availability_range_requires_known_professional(app, client):
+    r = client.get("/ui/prof/availability_range?slug=nadie&format=json")
+    assert r.status_code == 404
+
+
+def test_availability_range_skips_slot_query_without_free_days(app, client, fake_redis):
+    """El resumen diario no marca días libres: la vista no consulta `timeslots`."""
+    from sqlalchemy import event
+
+    with app.app_context():
+        center, corte, ana, beto, caro = _setup_center()
+        base = datetime(2030, 1, 7, 10, 0, tzinfo=timezone.utc)
+        _slots(center, ana, base, 3, status=TimeslotStatus.RESERVED)
+        db.session.commit()
+
+        reads = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT') and 'FROM timeslots' in statement:
+                reads.append(statement)
+
+        url = f"/ui/beauty/availability_range?beauty_slug={center.slug}&service_id={corte.id}&start=2030-01-07&days=5"
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            data = client.get(url + "&format=json").get_json()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+        assert [d['count'] for d in data['days']] == [0, 0, 0, 0, 0]
+        assert reads == []
@@ -0,0 +1,34 @@
+from sqlalchemy.pool import NullPool
+
+from app.services.db_engine import engine_options, patch_for_gevent
+
+PG_URL = 'postgresql+psycopg2://postgres:postgres@db:5432/turnos'
+
+
+def test_engine_options_from_environment():
+    assert engine_options('sqlite:///test.db', {'DB_POOL_SIZE': '50'}) == {}
+    assert engine_options(PG_URL, {}) == {
+        'pool_size': 10,
+        'max_overflow': 10,
+        'pool_timeout': 10.0,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True,
+    }
+    options = engine_options(PG_URL, {
+        'DB_POOL_SIZE': '20',
+        'DB_MAX_OVERFLOW': '0',
+        'DB_POOL_TIMEOUT': '2.5',
+        'DB_POOL_PRE_PING': 'false',
+        'DB_STATEMENT_TIMEOUT_MS': '5000',
+    })
+    assert (options['pool_size'], options['max_overflow'], options['pool_timeout']) == (20, 0, 2.5)
+    assert options['pool_pre_ping'] is False
+    assert options['connect_args'] == {'options': '-c statement_timeout=5000'}
+
+    # Detrás de PgBouncer la app no mantiene pool ni manda parámetros de arranque
+    assert engine_options(PG_URL, {'DB_PGBOUNCER': '1', 'DB_STATEMENT_TIMEOUT_MS': '5000'}) == {'poolclass': NullPool}
+
+
+def test_app_uses_engine_options_and_skips_gevent_patch_without_gevent(app):
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS'] == {}
+    assert patch_for_gevent() is False
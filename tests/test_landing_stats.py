@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+from app import db
+from app.models import AvailabilityDaily, Category, Complex, Field, LandingStat, Timeslot, TimeslotStatus
+from app.models_catalog import Professional
+from app.services.landing_stats import category_counts, refresh_landing_stats
+
+
+def _seed():
+    sports = Category(slug='deportes', title='Deportes')
+    pros = Category(slug='profesionales', title='Profesionales')
+    db.session.add_all([sports, pros])
+    db.session.flush()
+    cpx = Complex(name='Club', slug='club', city='Rosario')
+    db.session.add(cpx)
+    db.session.flush()
+    field = Field(complex_id=cpx.id, name='Cancha 1')
+    prof = Professional(name='Ana', slug='ana', city='Córdoba', category_id=pros.id)
+    db.session.add_all([field, prof])
+    db.session.flush()
+    return cpx, field, prof
+
+
+def _slot(now, hours, status=TimeslotStatus.AVAILABLE, **owner):
+    start = now + timedelta(hours=hours)
+    return Timeslot(start=start, end=start + timedelta(hours=1), status=status, **owner)
+
+
+def test_refresh_counts_future_free_slots_per_entity_and_day(app):
+    with app.app_context():
+        cpx, field, prof = _seed()
+        now = datetime.now(timezone.utc).replace(hour=6, minute=0, second=0, microsecond=0)
+        db.session.add_all([
+            _slot(now, -2, field_id=field.id),  # ya empezó
+            _slot(now, 2, field_id=field.id),
+            _slot(now, 3, field_id=field.id),
+            _slot(now, 4, TimeslotStatus.RESERVED, field_id=field.id),
+            _slot(now, 26, field_id=field.id),  # mañana
+            _slot(now, 5, professional_id=prof.id),
+            _slot(now, 24 * 30, professional_id=prof.id),  # fuera de la ventana
+        ])
+        db.session.commit()
+
+        assert refresh_landing_stats(days=7, now=now) == 3
+        db.session.commit()
+        today = now.date()
+        assert category_counts(today) == {'deportes': 2, 'profesionales': 1}
+        row = LandingStat.query.filter_by(entity_type='complex', entity_id=cpx.id, date=today).one()
+        assert (row.city, row.available_count) == ('Rosario', 2)
+
+        # La reconstrucción reemplaza todo el resumen
+        Timeslot.query.filter_by(professional_id=prof.id).delete()
+        db.session.commit()
+        refresh_landing_stats(days=7, now=now)
+        db.session.commit()
+        assert category_counts(today) == {'deportes': 2}
+
+
+def test_future_days_come_from_daily_summary(app):
+    """Hoy se cuenta sobre `timeslots`; los días siguientes, sobre availability_daily."""
+    with app.app_context():
+        cpx, field, prof = _seed()
+        now = datetime.now(timezone.utc).replace(hour=6, minute=0, second=0, microsecond=0)
+        db.session.add_all([
+            _slot(now, 2, field_id=field.id),
+            _slot(now, 26, field_id=field.id),
+            _slot(now, 27, field_id=field.id),
+            _slot(now, 50, professional_id=prof.id),
+        ])
+        db.session.commit()
+
+        refresh_landing_stats(days=3, now=now)
+        db.session.commit()
+        today = now.date()
+        rows = {(r.entity_type, r.date): r.available_count for r in LandingStat.query.all()}
+        assert rows == {('complex', today): 1, ('complex', today + timedelta(days=1)): 2,
+                        ('professional', today + timedelta(days=2)): 1}
+        row = LandingStat.query.filter_by(entity_type='complex', date=today + timedelta(days=1)).one()
+        assert row.first_free_start.strftime('%H:%M') == '08:00'
+
+        # Sin resumen, los días siguientes quedan en cero; hoy sigue saliendo de los slots
+        AvailabilityDaily.query.delete()
+        db.session.commit()
+        refresh_landing_stats(days=3, now=now)
+        db.session.commit()
+        assert [(r.date, r.available_count) for r in LandingStat.query.all()] == [(today, 1)]
+
+
+
+def test_refresh_buckets_by_utc_day_without_engine_date_functions(app):
+    """El día sale de los límites UTC calculados en Python, aunque `now` venga en otra zona."""
+    with app.app_context():
+        cpx, field, _ = _seed()
+        now = datetime.now(timezone.utc).replace(hour=22, minute=0, second=0, microsecond=0)
+        db.session.add_all([_slot(now, 1, field_id=field.id), _slot(now, 3, field_id=field.id)])
+        db.session.commit()
+
+        local = now.astimezone(timezone(timedelta(hours=-3)))
+        refresh_landing_stats(days=2, now=local)
+        db.session.commit()
+        rows = LandingStat.query.filter_by(entity_type='complex', entity_id=cpx.id).order_by(LandingStat.date).all()
+        assert [(r.date, r.available_count) for r in rows] == [
+            (now.date(), 1), (now.date() + timedelta(days=1), 1)]
+
+def test_landing_stats_api(app, client):
+    with app.app_context():
+        _, field, _ = _seed()
+        now = datetime.now(timezone.utc)
+        db.session.add(_slot(now, 24, field_id=field.id))
+        db.session.commit()
+        refresh_landing_stats(days=7)
+        db.session.commit()
+
+        data = client.get('/api/landing-stats/deportes?city=Rosario&days=3').get_json()
+        assert [d['count'] for d in data['days']] == [0, 1, 0]
+        assert data['updated_at'] is not None
+        assert client.get('/api/landing-stats/inexistente').status_code == 404
+        assert client.get('/api/landing-stats/deportes?entity_type=x').status_code == 400
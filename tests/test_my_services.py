@@ -0,0 +1,75 @@
+from sqlalchemy import event
+
+from app import db
+from app.models import Category, Service
+from app.models_catalog import BeautyCenter, Professional, beauty_center_services, professional_services
+from app.services.access_scope import AccessScope
+from app.services.my_services import beauty_services_for, professional_services_for
+
+
+def _service(cat, name, active=True):
+    srv = Service(category_id=cat.id, name=name, slug=name.lower(), duration_min=30, is_active=active)
+    db.session.add(srv)
+    db.session.flush()
+    return srv
+
+
+def test_professional_services_distinct_sorted_in_one_query(app):
+    with app.app_context():
+        pros = Category(slug='profesionales', title='Profesionales')
+        other = Category(slug='deportes', title='Deportes')
+        db.session.add_all([pros, other])
+        db.session.flush()
+        a, b = (Professional(name=n, slug=n.lower(), city='X', category_id=pros.id) for n in ('Ana', 'Beto'))
+        db.session.add_all([a, b])
+        db.session.flush()
+        masaje, consulta = _service(pros, 'masaje'), _service(pros, 'Consulta')
+        inactive, foreign = _service(pros, 'Baja', active=False), _service(other, 'Fútbol')
+        rows = [(a.id, masaje.id), (b.id, masaje.id), (a.id, consulta.id), (b.id, inactive.id), (b.id, foreign.id)]
+        db.session.execute(professional_services.insert(), [
+            {'professional_id': p, 'service_id': s} for p, s in rows
+        ])
+        db.session.commit()
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            services = professional_services_for(AccessScope(1, False, professional_ids=frozenset({a.id, b.id})))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+        assert [s.name for s in services] == ['Consulta', 'masaje']
+        assert len(statements) == 1
+
+        only_b = AccessScope(1, False, professional_ids=frozenset({b.id}))
+        assert [s.name for s in professional_services_for(only_b, active_only=False)] == ['Baja', 'masaje']
+        assert professional_services_for(AccessScope(1, False)) == []
+        assert len(professional_services_for(AccessScope(1, True))) == 2
+
+
+def test_beauty_services_respect_fixed_centers(app):
+    with app.app_context():
+        est = Category(slug='estetica', title='Estética')
+        db.session.add(est)
+        db.session.flush()
+        corte, color, unas = _service(est, 'Corte'), _service(est, 'Color'), _service(est, 'Uñas')
+        flexible = BeautyCenter(name='Flex', slug='flex', city='X', category_id=est.id)
+        fixed = BeautyCenter(name='Fijo', slug='fijo', city='X', category_id=est.id,
+                             booking_mode='fixed', fixed_service_id=unas.id)
+        db.session.add_all([flexible, fixed])
+        db.session.flush()
+        db.session.execute(beauty_center_services.insert(), [
+            {'beauty_center_id': flexible.id, 'service_id': corte.id},
+            {'beauty_center_id': fixed.id, 'service_id': color.id},
+            {'beauty_center_id': fixed.id, 'service_id': unas.id},
+        ])
+        db.session.commit()
+
+        services, allowed = beauty_services_for(AccessScope(1, False, beauty_center_ids=frozenset({fixed.id})))
+        assert [s.name for s in services] == ['Uñas'] and allowed == {unas.id}
+
+        services, allowed = beauty_services_for(AccessScope(1, True))
+        assert [s.name for s in services] == ['Corte', 'Uñas'] and allowed == {corte.id, unas.id}
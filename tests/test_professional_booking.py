@@ -103,3 +103,98 @@ def test_prof_availability_classic_smoke(app, client):
         # Should include times like dd/mm hh:mm
         assert b'Horarios' in r.data or b'No hay horarios' in r.data
 
+
+
+def test_prof_book_day_stops_at_capacity(app, client):
+    with app.app_context():
+        cat = create_category('profesionales')
+        prof = Professional(name='Gasista Z', slug='gasista-z', city='Y', category_id=cat.id, booking_mode='per_day', daily_quota=2)
+        db.session.add(prof)
+        db.session.commit()
+
+        day = date.today() + timedelta(days=2)
+        results = []
+        for i in range(3):
+            r = client.post('/ui/prof/book_day', data={'slug': prof.slug, 'date': day.isoformat(), 'email': f'u{i}@example.com'})
+            results.append(b'Reserva tomada' in r.data)
+        assert results == [True, True, False]
+
+        rec = DailyAvailability.query.filter_by(professional_id=prof.id, date=day).one()
+        db.session.refresh(rec)
+        assert (rec.capacity, rec.reserved_count) == (2, 2)
+        assert Subscription.query.count() == 2
+
+
+def test_reserve_day_without_upsert_support(app, monkeypatch):
+    from app.services import day_booking
+    monkeypatch.setattr(day_booking, '_UPSERT_DIALECTS', ())
+    with app.app_context():
+        cat = create_category('profesionales')
+        prof = Professional(name='Electricista', slug='electricista', city='Y', category_id=cat.id,
+                            booking_mode='per_day', daily_quota=2)
+        db.session.add(prof)
+        db.session.commit()
+
+        day = date.today() + timedelta(days=3)
+        assert [day_booking.reserve_day(prof, day) for _ in range(3)] == [True, True, False]
+        db.session.commit()
+        rec = DailyAvailability.query.filter_by(professional_id=prof.id, date=day).one()
+        db.session.refresh(rec)
+        assert (rec.capacity, rec.reserved_count) == (2, 2)
+
+
+def test_day_calendars_json_for_many_professionals(app, client):
+    with app.app_context():
+        cat = create_category('profesionales')
+        a = Professional(name='A', slug='pro-a', city='Y', category_id=cat.id, booking_mode='per_day', daily_quota=3)
+        b = Professional(name='B', slug='pro-b', city='Y', category_id=cat.id, booking_mode='per_day', daily_quota=None)
+        c = Professional(name='C', slug='pro-c', city='Y', category_id=cat.id, booking_mode='classic')
+        db.session.add_all([a, b, c])
+        db.session.flush()
+        start = date(2030, 3, 1)
+        db.session.add(DailyAvailability(professional_id=a.id, date=start + timedelta(days=1), capacity=5, reserved_count=2))
+        db.session.commit()
+
+        data = client.get('/ui/prof/day_calendars?slug=pro-a&slug=pro-b&slug=pro-c&start=2030-03-01&days=3').get_json()
+        assert data['start'] == '2030-03-01' and data['days'] == 3
+        assert data['professionals'] == {
+            'pro-a': {'capacity': [3, 5, 3], 'reserved': [0, 2, 0]},
+            'pro-b': {'capacity': [1, 1, 1], 'reserved': [0, 0, 0]},
+        }
+
+        single = client.get('/ui/prof/day_calendar?slug=pro-a&start=2030-03-01&days=40&format=json').get_json()
+        assert len(single['capacity']) == 40 and single['reserved'][1] == 2
+
+
+def test_sold_out_day_is_rejected_from_redis_until_its_generation_changes(app, fake_redis):
+    from sqlalchemy import event
+
+    from app.services import day_booking
+    with app.app_context():
+        cat = create_category('profesionales')
+        prof = Professional(name='Plomero', slug='plomero', city='Y', category_id=cat.id,
+                            booking_mode='per_day', daily_quota=1)
+        db.session.add(prof)
+        db.session.commit()
+
+        day = date.today() + timedelta(days=4)
+        assert day_booking.reserve_day(prof, day)
+        db.session.commit()
+        assert not day_booking.reserve_day(prof, day)
+        assert day_booking.is_sold_out(prof.id, day)
+
+        statements = []
+        capture = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            assert not day_booking.reserve_day(prof, day)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+        assert statements == []
+
+        # Cambia el día (p. ej. el admin sube la capacidad): la generación nueva deja la marca sin efecto
+        rec = DailyAvailability.query.filter_by(professional_id=prof.id, date=day).one()
+        rec.capacity = 2
+        db.session.commit()
+        assert not day_booking.is_sold_out(prof.id, day)
+        assert day_booking.reserve_day(prof, day)
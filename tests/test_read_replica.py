@@ -0,0 +1,104 @@
+import os
+import tempfile
+import time
+
+import pytest
+from flask import session as flask_session
+from sqlalchemy import insert, select
+
+from app import create_app, db
+from app.models import Category
+from app.models_catalog import Professional
+from app.services.availability_cache import cached_availability
+from app.services.read_replica import read_only, replica_engine, reset_request_state
+from app.services.search_cache import cached_search_page
+from tests.conftest import FakeRedis
+
+
+@pytest.fixture
+def replica_app():
+    """App con un segundo SQLite como réplica (datos distintos al primario)."""
+    primary_fd, primary_path = tempfile.mkstemp()
+    replica_fd, replica_path = tempfile.mkstemp()
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{primary_path}',
+        'SQLALCHEMY_REPLICA_URI': f'sqlite:///{replica_path}',
+        'WTF_CSRF_ENABLED': False,
+        'SECRET_KEY': 'test-secret-key',
+    })
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(replica_engine())
+        with replica_engine().begin() as conn:
+            conn.execute(insert(Category), [{'slug': 'en-replica', 'title': 'Réplica'}])
+        db.session.add(Category(slug='en-primario', title='Primario'))
+        db.session.commit()
+        db.session.remove()
+        yield app
+        db.session.remove()
+        db.drop_all()
+        replica_engine().dispose()
+    for fd, path in ((primary_fd, primary_path), (replica_fd, replica_path)):
+        os.close(fd)
+        os.unlink(path)
+
+
+def _slugs():
+    return set(db.session.execute(select(Category.slug)).scalars())
+
+
+@read_only
+def _read_only_slugs():
+    return _slugs()
+
+
+def test_read_only_code_reads_replica_until_it_writes(replica_app):
+    with replica_app.test_request_context('/'):
+        reset_request_state()
+        assert _slugs() == {'en-primario'}
+        assert _read_only_slugs() == {'en-replica'}
+
+        db.session.add(Category(slug='nueva', title='Nueva'))
+        db.session.flush()
+        # Después de escribir, el mismo request lee lo que escribió
+        assert _read_only_slugs() == {'en-primario', 'nueva'}
+        db.session.commit()
+        assert flask_session['_db_write_at'] <= time.time()
+
+
+def test_recent_write_in_visitor_session_falls_back_to_primary(replica_app):
+    with replica_app.test_request_context('/'):
+        db.session.remove()
+        reset_request_state()
+        flask_session['_db_write_at'] = time.time()
+        assert _read_only_slugs() == {'en-primario'}
+
+        replica_app.config['REPLICA_LAG_SECONDS'] = 0
+        assert _read_only_slugs() == {'en-replica'}
+
+
+def test_shared_cache_misses_are_computed_on_primary(replica_app):
+    """Otro visitante no debe cachear (bajo la generación nueva) lo que dice la réplica atrasada."""
+    replica_app.redis = FakeRedis()
+    with replica_app.test_request_context('/'):
+        reset_request_state()
+        cat_id = db.session.execute(select(Category.id).where(Category.slug == 'en-primario')).scalar_one()
+        db.session.add(Professional(name='Ana', slug='ana', city='Salta', category_id=cat_id))
+        db.session.commit()
+        db.session.remove()
+
+    with replica_app.test_request_context('/'):
+        reset_request_state()
+        search = read_only(lambda: cached_search_page('professionals', '', None, 20))
+        avail = read_only(lambda: cached_availability('professional', 1, None, ('slugs',), lambda: sorted(_slugs())))
+        assert [item['name'] for item in search()['items']] == ['Ana']
+        assert avail() == ['en-primario']
+        # Los aciertos posteriores devuelven lo guardado, no lo de la réplica
+        assert [item['name'] for item in search()['items']] == ['Ana']
+        assert _read_only_slugs() == {'en-replica'}
+
+
+def test_without_replica_read_only_uses_primary(app, sample_data):
+    with app.test_request_context('/'):
+        assert _read_only_slugs() == {'deportes'}
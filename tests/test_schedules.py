@@ -0,0 +1,87 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+from app import db
+from app.models import AvailabilityDaily, Complex, Field, Schedule, Timeslot, TimeslotStatus
+from app.services.schedules import free_candidates, materialize_schedules
+
+MONDAY = date(2030, 1, 7)
+
+
+def _field():
+    cpx = Complex(name='Club', slug='club', address='Calle 1')
+    db.session.add(cpx)
+    db.session.flush()
+    field = Field(complex_id=cpx.id, name='Cancha 1')
+    db.session.add(field)
+    db.session.flush()
+    return field
+
+
+def _at(day, hour):
+    return datetime.combine(day, time(hour)).replace(tzinfo=timezone.utc)
+
+
+def test_free_candidates_skips_overlaps():
+    existing = [(_at(MONDAY, 9), _at(MONDAY, 11)), (_at(MONDAY, 9), _at(MONDAY, 10))]
+    candidates = [(_at(MONDAY, h), _at(MONDAY, h + 1)) for h in (9, 10, 11)]
+    accepted, skipped = free_candidates(candidates, existing)
+    assert accepted == [(_at(MONDAY, 11), _at(MONDAY, 12))] and skipped == 2
+
+
+
+def test_free_candidates_fit_in_gaps_left_by_existing_slots():
+    # Grilla de 30 min con turnos de 60: candidatos solapados entre sí
+    candidates = [(_at(MONDAY, 9) + timedelta(minutes=m), _at(MONDAY, 10) + timedelta(minutes=m))
+                  for m in range(0, 180, 30)]
+    existing = [(_at(MONDAY, 10) + timedelta(minutes=30), _at(MONDAY, 11) + timedelta(seconds=30))]
+    accepted, skipped = free_candidates(candidates, existing)
+    assert accepted == [(_at(MONDAY, 9), _at(MONDAY, 10)), (_at(MONDAY, 11) + timedelta(minutes=30),
+                                                             _at(MONDAY, 12) + timedelta(minutes=30))]
+    assert skipped == 4
+
+def test_materializer_extends_schedule_day_by_day(app):
+    with app.app_context():
+        field = _field()
+        db.session.add(Timeslot(field_id=field.id, start=_at(MONDAY, 9), end=_at(MONDAY, 10),
+                                status=TimeslotStatus.RESERVED))
+        schedule = Schedule(field_id=field.id, weekdays='0,1,2,3,4', start_time=time(9), end_time=time(12),
+                            duration_min=60, price=1000, valid_from=MONDAY)
+        db.session.add(schedule)
+        db.session.commit()
+
+        # Lunes a miércoles: 3 slots por día, menos el ya reservado
+        totals = materialize_schedules(horizon_days=2, today=MONDAY)
+        db.session.commit()
+        assert totals == {'schedules': 1, 'created': 8, 'skipped': 1}
+        assert schedule.materialized_until == MONDAY + timedelta(days=2)
+        monday = AvailabilityDaily.query.filter_by(entity_type='field', entity_id=field.id, date=MONDAY).one()
+        assert (monday.available_count, monday.reserved_count) == (2, 1)
+
+        # Al día siguiente solo se agrega el día que entra en el horizonte (jueves)
+        totals = materialize_schedules(horizon_days=2, today=MONDAY + timedelta(days=1))
+        db.session.commit()
+        assert totals['created'] == 3
+        assert Timeslot.query.count() == 12
+
+        # Viernes a domingo: el fin de semana no está en la plantilla
+        totals = materialize_schedules(horizon_days=2, today=MONDAY + timedelta(days=4))
+        assert totals['created'] == 3
+
+
+def test_bulk_form_saves_recurring_schedule(app, client, super_admin_user):
+    with app.app_context():
+        field = _field()
+        db.session.commit()
+        client.post('/admin/login', data={'email': 'superadmin@test.com', 'password': 'testpass123'})
+
+        today = datetime.now(timezone.utc).date()
+        resp = client.post('/admin/timeslots/bulk_create', data={
+            'field_id': field.id, 'start_date': today.isoformat(), 'end_date': '',
+            'start_time': '10:00', 'end_time': '12:00', 'duration_min': 60,
+            'weekdays': [str(d) for d in range(7)], 'recurring': '1',
+        })
+        assert 'Plantilla guardada' in resp.get_data(as_text=True)
+        schedule = Schedule.query.one()
+        assert schedule.valid_until is None
+        assert schedule.materialized_until == today + timedelta(days=app.config['SCHEDULE_HORIZON_DAYS'])
+        assert Timeslot.query.filter_by(field_id=field.id).count() > 0
@@ -0,0 +1,61 @@
+import json
+
+from app import db
+from app.models import Category
+from app.models_catalog import Professional
+from app.services.search_cache import cached_search, cache_stats
+
+
+def _create_professional(name='Ana Kinesio', slug='ana-kinesio', city='Rosario'):
+    cat = Category.query.filter_by(slug='profesionales').first()
+    if not cat:
+        cat = Category(slug='profesionales', title='Profesionales')
+        db.session.add(cat)
+        db.session.flush()
+    prof = Professional(name=name, slug=slug, city=city, specialties='kinesiologia', category_id=cat.id)
+    db.session.add(prof)
+    db.session.commit()
+    return prof
+
+
+def test_cached_search_hits_after_first_miss(app, fake_redis):
+    with app.app_context():
+        _create_professional()
+
+        first = cached_search('professionals', 'A', 'rosario')
+        second = cached_search('professionals', '  a ', 'ROSARIO')
+
+        assert first == second
+        assert first[0]['slug'] == 'ana-kinesio'
+        stats = cache_stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+
+
+def test_catalog_commit_invalidates_cached_search(app, fake_redis):
+    with app.app_context():
+        prof = _create_professional()
+        assert len(cached_search('professionals', '', 'rosario')) == 1
+        generation = cache_stats()['generation']
+
+        _create_professional(name='Bruno Nutri', slug='bruno-nutri')
+        assert cache_stats()['generation'] > generation
+
+        prof.city = 'Cordoba'
+        db.session.commit()
+        results = cached_search('professionals', '', 'rosario')
+        assert [r['slug'] for r in results] == ['bruno-nutri']
+
+
+def test_api_search_uses_cache_and_exposes_stats(app, client, fake_redis):
+    with app.app_context():
+        _create_professional()
+
+        r1 = client.get('/api/v1/search/professionals?city=Rosario')
+        r2 = client.get('/api/v1/search/professionals?city=rosario')
+        assert json.loads(r1.data) == json.loads(r2.data)
+        assert json.loads(r1.data)['items'][0]['specialties'] == 'kinesiologia'
+
+        stats = json.loads(client.get('/api/v1/search/cache-stats').data)
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
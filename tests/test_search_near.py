@@ -0,0 +1,60 @@
+import json
+
+from app import db
+from app.models import Category
+from app.models_catalog import SportsComplex
+from app.services.search_service import Near, parse_near, search_sports_complexes, projection
+
+
+def _seed_complexes():
+    cat = Category(slug='deportes', title='Deportes')
+    db.session.add(cat)
+    db.session.flush()
+    rows = [
+        ('Lejos Park', -34.90, -57.95),      # La Plata (~55 km)
+        ('Cerca Fútbol', -34.61, -58.39),    # ~1 km
+        ('Centro Arena', -34.6037, -58.3816),  # origen
+        ('Sin Ubicación', None, None),
+    ]
+    for i, (name, lat, lng) in enumerate(rows):
+        db.session.add(SportsComplex(name=name, slug=f'cx-{i}', city='Buenos Aires', category_id=cat.id,
+                                     latitude=lat, longitude=lng))
+    db.session.commit()
+
+
+def test_parse_near_validates_input():
+    assert parse_near('') is None
+    assert parse_near('-34.60371,-58.38159', '5') == Near(-34.6037, -58.3816, 5.0)
+    for bad in [('100,0', None), ('abc', None), ('1,2,3', None), ('1,2', '0'), ('1,2', '1000')]:
+        try:
+            parse_near(*bad)
+        except ValueError:
+            continue
+        raise AssertionError(f'expected ValueError for {bad}')
+
+
+def test_near_orders_by_distance_within_radius(app):
+    with app.app_context():
+        _seed_complexes()
+        near = Near(-34.6037, -58.3816, 10.0)
+
+        rows = search_sports_complexes('', None, columns=projection(SportsComplex, 'sports'), near=near)
+        assert [r.name for r in rows] == ['Centro Arena', 'Cerca Fútbol']
+        assert rows[0].distance_m < 1 < rows[1].distance_m < 2000
+
+        far = search_sports_complexes('', None, near=Near(-34.6037, -58.3816, 100.0))
+        assert [c.name for c in far] == ['Centro Arena', 'Cerca Fútbol', 'Lejos Park']
+
+
+def test_api_near_includes_distance(client, app):
+    with app.app_context():
+        _seed_complexes()
+        r = client.get('/api/v1/search/sports-complexes?near=-34.6037,-58.3816&radius_km=5&per_page=1')
+        payload = json.loads(r.data)
+        assert payload['items'][0]['name'] == 'Centro Arena'
+        assert payload['items'][0]['distance_km'] == 0.0
+
+        r2 = client.get(f"/api/v1/search/sports-complexes?near=-34.6037,-58.3816&radius_km=5&per_page=1&cursor={payload['next_cursor']}")
+        assert [i['name'] for i in json.loads(r2.data)['items']] == ['Cerca Fútbol']
+
+        assert client.get('/api/v1/search/sports-complexes?near=foo').status_code == 400
@@ -0,0 +1,110 @@
+import json
+
+from app import db
+from app.models import Category
+from app.models_catalog import Professional
+from app.services.search_service import encode_cursor, decode_cursor, search_keyset, estimate_total, InvalidCursor
+
+
+def _seed_professionals(names):
+    cat = Category(slug='profesionales', title='Profesionales')
+    db.session.add(cat)
+    db.session.flush()
+    for i, name in enumerate(names):
+        db.session.add(Professional(name=name, slug=f'prof-{i}', city='Rosario', category_id=cat.id))
+    db.session.commit()
+
+
+def test_keyset_pages_cover_all_rows_once(app):
+    with app.app_context():
+        _seed_professionals(['Carla', 'Ana', 'Bruno', 'Ana', 'Diego'])
+
+        seen, cursor = [], None
+        while True:
+            items, cursor = search_keyset(Professional, '', 'rosario', per_page=2, cursor=cursor)
+            seen.extend((p.name, p.id) for p in items)
+            if cursor is None:
+                break
+
+        assert seen == sorted(seen)
+        assert len(seen) == 5
+
+
+def test_decode_cursor_rejects_foreign_shape():
+    token = encode_cursor([0.5, 'Ana', 3])
+    assert decode_cursor(token, 3) == [0.5, 'Ana', 3]
+    try:
+        decode_cursor(token, 2)
+    except InvalidCursor:
+        pass
+    else:
+        raise AssertionError('expected InvalidCursor')
+
+
+def test_estimate_total_is_exact_under_cap(app):
+    with app.app_context():
+        _seed_professionals(['Ana', 'Bruno', 'Carla'])
+        assert estimate_total(Professional, '', None) == (3, False)
+        assert estimate_total(Professional, '', None, cap=2) == (3, True)
+
+
+def test_api_envelope_with_cursor_and_total(client, app):
+    with app.app_context():
+        _seed_professionals(['Ana', 'Bruno', 'Carla'])
+
+        r = client.get('/api/v1/search/professionals?per_page=2&with_total=1')
+        page1 = json.loads(r.data)
+        assert [i['name'] for i in page1['items']] == ['Ana', 'Bruno']
+        assert page1['total'] == 3 and page1['total_is_estimate'] is False
+
+        r = client.get(f"/api/v1/search/professionals?per_page=2&cursor={page1['next_cursor']}")
+        page2 = json.loads(r.data)
+        assert [i['name'] for i in page2['items']] == ['Carla']
+        assert page2['next_cursor'] is None
+
+        assert client.get('/api/v1/search/professionals?cursor=%%%').status_code == 400
+
+
+def test_projection_returns_light_rows(app):
+    from app.services.search_service import projection, search_professionals
+    with app.app_context():
+        _seed_professionals(['Ana', 'Bruno'])
+        cols = projection(Professional, 'specialties')
+
+        rows = search_professionals('', 'rosario', columns=cols)
+        assert [r.name for r in rows] == ['Ana', 'Bruno']
+        assert not isinstance(rows[0], Professional)
+        assert set(rows[0]._mapping) == {'id', 'name', 'slug', 'city', 'specialties'}
+
+        items, cursor = search_keyset(Professional, '', None, per_page=1, columns=cols)
+        assert items[0].name == 'Ana' and cursor is not None
+
+
+def test_rank_is_compared_as_double_precision(app):
+    from sqlalchemy.dialects import postgresql
+    from app.services.search_service import _after_key, _base_search, _ordered
+    with app.app_context():
+        base, lead = _base_search(Professional, 'kinesiologia')
+        stmt = _ordered(Professional, base, lead).where(_after_key(Professional, lead, [0.1, 'Ana', 1]))
+        sql = str(stmt.compile(dialect=postgresql.psycopg2.dialect()))
+        # Orden, columna del cursor y comparación usan el mismo tipo (float8)
+        assert sql.count('CAST(ts_rank_cd(') == 3
+        assert 'AS FLOAT) AS rank' in sql
+
+
+def test_keyset_keeps_rows_tied_on_lead_across_pages(app):
+    from app.services.search_service import Near
+    with app.app_context():
+        _seed_professionals(['Eva', 'Ana', 'Dora', 'Bea', 'Cora'])
+        Professional.query.update({'latitude': -34.6037, 'longitude': -58.3816})
+        db.session.commit()
+        near = Near(-34.6037, -58.3816, 5.0)
+
+        seen, cursor = [], None
+        while True:
+            items, cursor = search_keyset(Professional, '', None, per_page=2, cursor=cursor, near=near)
+            seen.extend(p.name for p in items)
+            if cursor is None:
+                break
+
+        assert seen == ['Ana', 'Bea', 'Cora', 'Dora', 'Eva']
@@ -0,0 +1,83 @@
+from flask import session
+from sqlalchemy import event
+
+from app import db
+from app.models import Category, Complex, UserComplex
+from app.services.access_scope import invalidate_user_scope
+from app.services.session_user import PRINCIPAL_SESSION_KEY, SessionUser, load_principal
+
+
+def _count_queries(fn):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        result = fn()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    return result, len(statements)
+
+
+def test_principal_reused_until_permissions_change(app, admin_user, fake_redis):
+    with app.app_context():
+        cat = Category(slug='deportes', title='Deportes')
+        db.session.add(cat)
+        cpx = Complex(name='Club', slug='club', address='Calle 1')
+        db.session.add(cpx)
+        db.session.flush()
+        admin_user.category_id = cat.id
+        db.session.add(admin_user)
+        db.session.add(UserComplex(user_id=admin_user.id, complex_id=cpx.id))
+        db.session.commit()
+        user_id = admin_user.id
+
+    with app.test_request_context('/admin/panel'):
+        principal, queries = _count_queries(lambda: load_principal(user_id))
+        assert isinstance(principal, SessionUser)
+        assert queries > 0
+        assert principal.category.slug == 'deportes'
+        assert principal.scope.complex_ids == {cpx.id}
+        # La cookie de sesión no lleva el alcance: solo id y versión
+        assert session[PRINCIPAL_SESSION_KEY] == {'id': user_id, 'v': 0}
+
+        # Misma versión: se hidrata desde la sesión sin tocar la base
+        principal, queries = _count_queries(lambda: load_principal(user_id))
+        assert queries == 0
+        assert principal.email == 'admin@test.com'
+        assert principal.scope.can_manage('complex', cpx.id)
+
+        # Cambio de permisos: la versión sube y el principal se recarga
+        db.session.execute(UserComplex.__table__.delete())
+        db.session.commit()
+        invalidate_user_scope(user_id)
+        principal, queries = _count_queries(lambda: load_principal(user_id))
+        assert queries > 0
+        assert principal.scope.complex_ids == frozenset()
+        assert session[PRINCIPAL_SESSION_KEY] == {'id': user_id, 'v': 1}
+
+        # Atributos fuera del principal se cargan desde la fila
+        assert principal.check_password('testpass123')
+
+
+def test_principal_falls_back_to_database_without_redis(app, admin_user):
+    with app.app_context():
+        user_id = admin_user.id
+    with app.test_request_context('/admin/panel'):
+        principal, queries = _count_queries(lambda: load_principal(user_id))
+        assert principal.id == user_id and not principal.is_superadmin
+        _, queries = _count_queries(lambda: load_principal(user_id))
+        assert queries > 0
+
+
+def test_principal_without_cached_identity_reloads_from_database(app, admin_user, fake_redis):
+    with app.app_context():
+        user_id = admin_user.id
+    with app.test_request_context('/admin/panel'):
+        load_principal(user_id)
+        fake_redis.store.clear()
+        principal, queries = _count_queries(lambda: load_principal(user_id))
+        assert principal.email == 'admin@test.com'
+        assert queries > 0
@@ -0,0 +1,52 @@
+from datetime import date, datetime, timedelta, timezone
+
+from app import db
+from app.models import Complex, Field, Subscription, Timeslot, TimeslotArchive, TimeslotStatus
+from app.services.timeslot_archive import archive_batch, archive_cutoff, month_range, partition_ddl, utc_day
+
+
+def test_monthly_partition_bounds():
+    assert month_range(date(2030, 11, 15), date(2031, 1, 2)) == [date(2030, 11, 1), date(2030, 12, 1), date(2031, 1, 1)]
+    ddl = partition_ddl(date(2030, 12, 1))
+    assert ddl.startswith('CREATE TABLE IF NOT EXISTS timeslots_archive_2030_12 PARTITION OF timeslots_archive')
+    assert "FROM ('2030-12-01T00:00:00+00:00') TO ('2031-01-01T00:00:00+00:00')" in ddl
+
+
+
+def test_partition_month_uses_utc_day():
+    # 31/01 22:00 en Argentina ya es febrero en UTC
+    local = datetime(2026, 1, 31, 22, 0, tzinfo=timezone(timedelta(hours=-3)))
+    assert utc_day(local) == date(2026, 2, 1)
+    assert month_range(utc_day(local), utc_day(local)) == [date(2026, 2, 1)]
+    assert utc_day(datetime(2026, 1, 31, 22, 0)) == date(2026, 1, 31)
+
+def test_archive_moves_old_slots_in_batches(app):
+    with app.app_context():
+        cpx = Complex(name='Club', slug='club', address='Calle 1')
+        db.session.add(cpx)
+        db.session.flush()
+        field = Field(complex_id=cpx.id, name='Cancha 1')
+        db.session.add(field)
+        db.session.flush()
+        now = datetime.now(timezone.utc)
+        old = [Timeslot(field_id=field.id, start=now - timedelta(days=200 + i), end=now - timedelta(days=200 + i) + timedelta(hours=1),
+                        status=TimeslotStatus.RESERVED, reservation_code=f'R{i}') for i in range(3)]
+        recent = Timeslot(field_id=field.id, start=now - timedelta(days=1), end=now - timedelta(hours=23),
+                          status=TimeslotStatus.AVAILABLE)
+        db.session.add_all([*old, recent])
+        db.session.flush()
+        db.session.add(Subscription(email='a@test.com', timeslot_id=old[0].id))
+        db.session.commit()
+        old_ids = sorted(t.id for t in old)
+
+        before = archive_cutoff(90, now)
+        assert archive_batch(before, batch_size=2) == 2
+        assert archive_batch(before, batch_size=2) == 1
+        assert archive_batch(before, batch_size=2) == 0
+        db.session.commit()
+
+        assert [t.id for t in Timeslot.query.all()] == [recent.id]
+        assert Subscription.query.count() == 0
+        archived = TimeslotArchive.query.order_by(TimeslotArchive.id).all()
+        assert [a.id for a in archived] == old_ids
+        assert archived[0].status == TimeslotStatus.RESERVED and archived[0].field_id == field.id
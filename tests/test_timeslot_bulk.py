@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app import db
+from app.models import AvailabilityDaily, Complex, Field, Subscription, Timeslot, TimeslotStatus, UserComplex
+from app.services.notification_service import NotificationService
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.jobs = []
+
+    def enqueue(self, func, *args, **kwargs):
+        self.jobs.append((func, args))
+
+
+def _afternoon(field, statuses):
+    start = datetime.now(timezone.utc).replace(hour=14, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    slots = [
+        Timeslot(field_id=field.id, start=start + timedelta(hours=i), end=start + timedelta(hours=i + 1), status=status)
+        for i, status in enumerate(statuses)
+    ]
+    db.session.add_all(slots)
+    db.session.commit()
+    return slots
+
+
+def test_bulk_release_single_update_and_one_notification_job(app, client, admin_user, monkeypatch):
+    queue = RecordingQueue()
+    monkeypatch.setattr(app, 'task_queue', queue)
+    with app.app_context():
+        cpx = Complex(name='Club', slug='club', address='Calle 1')
+        db.session.add(cpx)
+        db.session.flush()
+        field = Field(complex_id=cpx.id, name='Cancha 1')
+        db.session.add(field)
+        db.session.flush()
+        db.session.add(UserComplex(user_id=admin_user.id, complex_id=cpx.id))
+        slots = _afternoon(field, [TimeslotStatus.RESERVED, TimeslotStatus.HOLDING, TimeslotStatus.AVAILABLE])
+        ids = [ts.id for ts in slots]
+
+        client.post('/admin/login', data={'email': 'admin@test.com', 'password': 'testpass123'})
+
+        writes = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('UPDATE TIMESLOTS'):
+                writes.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            resp = client.post('/api/admin/turnos/bulk/release', json={'ids': ids})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+        body = resp.get_json()
+        assert resp.status_code == 200
+        assert body['ids'] == ids[:2] and body['skipped'] == [ids[2]]
+        assert len(writes) == 1
+        assert queue.jobs == [('app.workers.email_worker.send_release_notifications', (ids[:2],))]
+
+        statuses = db.session.execute(db.select(Timeslot.status).where(Timeslot.id.in_(ids))).scalars().all()
+        assert set(statuses) == {TimeslotStatus.AVAILABLE}
+        summary = AvailabilityDaily.query.filter_by(entity_type='field', entity_id=field.id).one()
+        assert summary.available_count == 3
+
+        # Por filtro: bloquear la tarde del complejo y luego borrar lo bloqueado
+        day = slots[0].start.date().isoformat()
+        resp = client.post('/api/admin/turnos/bulk/block', json={'complex_id': cpx.id, 'start_from': day})
+        assert resp.get_json()['count'] == 3
+        resp = client.post('/api/admin/turnos/bulk/delete', data={'field_id': field.id})
+        assert resp.get_json()['count'] == 3
+        assert Timeslot.query.count() == 0
+        assert AvailabilityDaily.query.count() == 0
+
+
+def test_bulk_rejects_out_of_scope_and_empty_selection(app, client, admin_user):
+    with app.app_context():
+        cpx = Complex(name='Ajeno', slug='ajeno', address='Calle 2')
+        db.session.add(cpx)
+        db.session.flush()
+        field = Field(complex_id=cpx.id, name='Cancha 1')
+        db.session.add(field)
+        db.session.flush()
+        (slot,) = _afternoon(field, [TimeslotStatus.HOLDING])
+
+        client.post('/admin/login', data={'email': 'admin@test.com', 'password': 'testpass123'})
+        assert client.post('/api/admin/turnos/bulk/confirm', json={'ids': [slot.id]}).status_code == 403
+        assert client.post('/api/admin/turnos/bulk/confirm', json={'complex_id': cpx.id}).status_code == 403
+        assert client.post('/api/admin/turnos/bulk/confirm', json={}).status_code == 400
+        assert client.post('/api/admin/turnos/bulk/explode', json={'ids': [slot.id]}).status_code == 404
+        db.session.refresh(slot)
+        assert slot.status == TimeslotStatus.HOLDING
+
+
+def test_bulk_confirm_sets_codes_and_clears_holds(app, client, super_admin_user, fake_redis):
+    with app.app_context():
+        cpx = Complex(name='Club', slug='club', address='Calle 1')
+        db.session.add(cpx)
+        db.session.flush()
+        field = Field(complex_id=cpx.id, name='Cancha 1')
+        db.session.add(field)
+        db.session.flush()
+        slots = _afternoon(field, [TimeslotStatus.HOLDING, TimeslotStatus.HOLDING])
+        for ts in slots:
+            fake_redis.set(f'hold:timeslot:{ts.id}', '1')
+        fake_redis.set('hold:timeslot:999', '1')
+
+        client.post('/admin/login', data={'email': 'superadmin@test.com', 'password': 'testpass123'})
+        resp = client.post('/api/admin/turnos/bulk/confirm', json={'field_id': field.id})
+        assert resp.get_json()['count'] == 2
+        codes = db.session.execute(db.select(Timeslot.reservation_code)).scalars().all()
+        assert all(code and len(code) == 8 for code in codes) and len(set(codes)) == 2
+        # Los holds de los confirmados se borran; los de otros turnos quedan
+        assert [k for k in fake_redis.store if k.startswith('hold:')] == ['hold:timeslot:999']
+
+
+def test_subscriptions_for_timeslots_matches_direct_and_criteria(app):
+    with app.app_context():
+        cpx = Complex(name='Club', slug='club', address='Calle 1')
+        db.session.add(cpx)
+        db.session.flush()
+        field = Field(complex_id=cpx.id, name='Cancha 1')
+        db.session.add(field)
+        db.session.flush()
+        first, second = _afternoon(field, [TimeslotStatus.AVAILABLE, TimeslotStatus.AVAILABLE])
+        db.session.add_all([
+            Subscription(email='uno@test.com', timeslot_id=first.id),
+            Subscription(email='tarde@test.com', field_id=field.id,
+                         start_window=second.start - timedelta(minutes=30), end_window=second.end),
+        ])
+        db.session.commit()
+
+        pairs = NotificationService.subscriptions_for_timeslots([first.id, second.id])
+        assert sorted((sub.email, ts.id) for sub, ts in pairs) == [
+            ('tarde@test.com', second.id), ('uno@test.com', first.id),
+        ]
@@ -0,0 +1,114 @@
+from datetime import datetime, time, timedelta, timezone
+
+from app import db
+from app.models import Category, Complex, Field, Schedule, Timeslot, TimeslotStatus
+from app.models_catalog import Professional
+from app.services.availability_service import professional_starts
+from app.services.virtual_slots import virtual_id, virtual_slots
+
+
+def _tomorrow():
+    return datetime.now(timezone.utc).date() + timedelta(days=1)
+
+
+def _at(day, hour):
+    return datetime.combine(day, time(hour)).replace(tzinfo=timezone.utc)
+
+
+def _field_schedule(day):
+    cpx = Complex(name='Club', slug='club', address='Calle 1')
+    db.session.add(cpx)
+    db.session.flush()
+    field = Field(complex_id=cpx.id, name='Cancha 1')
+    db.session.add(field)
+    db.session.flush()
+    schedule = Schedule(field_id=field.id, weekdays=','.join(str(d) for d in range(7)), start_time=time(9),
+                        end_time=time(13), duration_min=60, price=1000, valid_from=day, mode='virtual')
+    db.session.add(schedule)
+    db.session.flush()
+    return field, schedule
+
+
+def test_virtual_slots_exclude_stored_exceptions(app):
+    with app.app_context():
+        day = _tomorrow()
+        field, schedule = _field_schedule(day)
+        db.session.add_all([
+            Timeslot(field_id=field.id, start=_at(day, 10), end=_at(day, 11), status=TimeslotStatus.RESERVED),
+            Timeslot(field_id=field.id, start=_at(day, 11), end=_at(day, 12), status=TimeslotStatus.BLOCKED),
+        ])
+        db.session.commit()
+
+        slots = virtual_slots([schedule], _at(day, 0), _at(day + timedelta(days=1), 0))
+        assert [s.start.hour for s in slots] == [9, 12]
+        assert slots[0].id == virtual_id(schedule.id, _at(day, 9))
+        assert slots[0].status == TimeslotStatus.AVAILABLE and slots[0].field.id == field.id
+        # Nada se escribió para los slots libres
+        assert Timeslot.query.count() == 2
+
+
+def test_turnos_table_merges_virtual_and_stored(app, client):
+    with app.app_context():
+        day = _tomorrow()
+        field, schedule = _field_schedule(day)
+        schedule.start_time = time(10)
+        db.session.add(Timeslot(field_id=field.id, start=_at(day, 8), end=_at(day, 9),
+                                status=TimeslotStatus.AVAILABLE))
+        db.session.commit()
+
+        resp = client.get(f'/ui/turnos_table?date={day.isoformat()}&category=deportes&limit=2')
+        html = resp.get_data(as_text=True)
+        assert '4 turnos encontrados' in html
+        # Primera página: el guardado de las 8 y el virtual de las 10, en orden
+        assert html.index(f'{day:%d/%m/%Y} 08:00') < html.index(f'{day:%d/%m/%Y} 10:00')
+        assert f'/timeslots/virtual/{virtual_id(schedule.id, _at(day, 10))}/modal' in html
+
+        resp = client.get(f'/ui/turnos_table?date={day.isoformat()}&category=deportes&limit=2&page=2')
+        html = resp.get_data(as_text=True)
+        assert f'{day:%d/%m/%Y} 11:00' in html and f'{day:%d/%m/%Y} 12:00' in html
+
+        resp = client.get(f'/ui/timeslots/virtual/{virtual_id(schedule.id, _at(day, 10))}/modal')
+        assert 'Confirmar y contactar' in resp.get_data(as_text=True)
+        resp = client.get(f'/ui/turnos_table_grouped?date={day.isoformat()}&category=deportes')
+        assert resp.get_data(as_text=True).count('/timeslots/virtual/') >= 3
+
+
+def test_hold_virtual_slot_writes_one_row(app, client):
+    with app.app_context():
+        day = _tomorrow()
+        field, schedule = _field_schedule(day)
+        db.session.commit()
+        token = virtual_id(schedule.id, _at(day, 9))
+
+        resp = client.post('/api/hold', data={'timeslot_id': token})
+        assert resp.status_code == 200
+        ts = Timeslot.query.one()
+        assert resp.get_json()['timeslot_id'] == ts.id
+        assert ts.status == TimeslotStatus.HOLDING and ts.field_id == field.id
+
+        # El slot ya no es virtual: un segundo hold con el mismo id falla
+        resp = client.post('/api/hold', data={'timeslot_id': token})
+        assert resp.status_code == 400
+        assert Timeslot.query.count() == 1
+        assert [s.start.hour for s in virtual_slots([schedule], _at(day, 0), _at(day, 23))] == [10, 11, 12]
+
+
+def test_professional_starts_include_virtual_slots(app):
+    with app.app_context():
+        day = _tomorrow()
+        cat = Category(slug='profesionales', title='Profesionales')
+        db.session.add(cat)
+        db.session.flush()
+        prof = Professional(name='Ana', slug='ana', city='X', category_id=cat.id)
+        db.session.add(prof)
+        db.session.flush()
+        db.session.add_all([
+            Schedule(professional_id=prof.id, weekdays=str(day.weekday()), start_time=time(9), end_time=time(11),
+                     duration_min=60, valid_from=day, mode='virtual'),
+            Timeslot(professional_id=prof.id, start=_at(day, 14), end=_at(day, 15), status=TimeslotStatus.AVAILABLE),
+        ])
+        db.session.commit()
+
+        now = datetime.now(timezone.utc)
+        starts = professional_starts(prof, now, _at(day, 0), _at(day + timedelta(days=1), 0))
+        assert [(s if s.tzinfo else s.replace(tzinfo=timezone.utc)).hour for s in starts] == [9, 10, 14]